@@ -0,0 +1,87 @@
+"""Helpers shared by the client benchmarks."""
+from configparser import ConfigParser
+from contextlib import contextmanager
+import socket
+import time
+import tracemalloc
+
+
+class CountingSocket:
+    """Socket wrapper which counts the calls to the read/write methods."""
+
+    COUNTED = {'recv', 'recv_into', 'send', 'sendall', 'sendmsg'}
+
+    def __init__(self, sock):
+        """Constructor.
+
+        :param sock: The wrapped socket
+        :type sock: :class:`socket.socket`
+        """
+        self._sock = sock
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._sock, name)
+        if name in self.COUNTED:
+            def counted(*args, **kwargs):
+                self.calls += 1
+                return attr(*args, **kwargs)
+            return counted
+        return attr
+
+
+def tcp_socketpair():
+    """Returns a pair of connected TCP sockets over the loopback interface.
+
+    NOTE: `socket.socketpair` creates unix sockets, which do not support the
+    TCP options used by the network layer.
+
+    :returns: The pair of connected sockets
+    :rtype: tuple
+    """
+    with socket.socket() as srv:
+        srv.bind(('127.0.0.1', 0))
+        srv.listen(1)
+        client = socket.create_connection(srv.getsockname())
+        server, _ = srv.accept()
+    return client, server
+
+
+def network_config(**options):
+    """Builds a network configuration section.
+
+    :param options: Options of the section
+    :type options: mapping
+
+    :returns: The network configuration section
+    :rtype: :class:`configparser.SectionProxy`
+    """
+    config = ConfigParser()
+    config['Network'] = {k: str(v) for k, v in options.items()}
+    return config['Network']
+
+
+@contextmanager
+def measure(trace=False):
+    """Contextmanager: measures elapsed time and, optionally, peak memory.
+
+    Yields a dictionary which is filled with the `elapsed` (seconds) and `peak`
+    (bytes, only when tracing) keys on exit.
+
+    NOTE: tracing memory allocations heavily slows down the execution, do not
+    trust the elapsed time of traced runs.
+
+    :param trace: Trace memory allocations
+    :type trace: bool
+    """
+    result = {}
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result['elapsed'] = time.perf_counter() - start
+        if trace:
+            _, result['peak'] = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
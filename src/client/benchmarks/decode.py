@@ -0,0 +1,145 @@
+"""Message decoding benchmark.
+
+Compares the streaming `network.decoder.MessageDecoder` with the previous
+decoding path, which copied every payload into a `bytes` object and decoded it
+with a fresh `msgpack.unpackb` call.
+
+Gamestates are read from a recorded stream (the raw data sent by the server,
+headers included) or generated with the same layout used by the server.
+
+Usage (from the client directory):
+
+    python -m benchmarks.decode --entities 1000
+    python -m benchmarks.decode --input gamestates.bin
+"""
+from benchmarks.common import measure
+from benchmarks.common import network_config
+from collections import deque
+from network.connection import HEADER
+from network.connection import HEADER_LENGTH
+from network.decoder import MessageDecoder
+from network.message import MessageType
+import click
+import msgpack
+import random
+
+
+def generate(count, entities):
+    """Generates encoded gamestates.
+
+    :param count: The number of gamestates
+    :type count: int
+
+    :param entities: The number of mobile entities of each gamestate
+    :type entities: int
+
+    :returns: The encoded payloads
+    :rtype: list
+    """
+    payloads = []
+    for tstamp in range(count):
+        gamestate = {
+            b'Tstamp': tstamp,
+            b'Time': tstamp // 60,
+            b'Entities': {
+                i: {
+                    b'Type': random.randint(0, 3),
+                    b'Xpos': random.uniform(0, 100),
+                    b'Ypos': random.uniform(0, 100),
+                    b'CurHitPoints': random.randint(0, 100),
+                    b'ActionType': 1,
+                    b'Action': {b'Speed': 3.0},
+                }
+                for i in range(entities)
+            },
+            b'Buildings': {},
+            b'Objects': {},
+        }
+        # NOTE: the server encodes strings with the raw type
+        payloads.append(msgpack.packb(gamestate, use_bin_type=False))
+    return payloads
+
+
+def load(stream):
+    """Reads the gamestate payloads of a recorded stream.
+
+    :param stream: The recorded stream
+    :type stream: file
+
+    :returns: The encoded payloads
+    :rtype: list
+    """
+    data = stream.read()
+    payloads = []
+    offset = 0
+    while offset + HEADER_LENGTH <= len(data):
+        msgtype, size = HEADER.unpack_from(data, offset)
+        offset += HEADER_LENGTH
+        if msgtype == MessageType.gamestate:
+            payloads.append(data[offset:offset + size])
+        offset += size
+    return payloads
+
+
+def legacy_decode(payload):
+    """The previous decoding path, kept as benchmark baseline."""
+    options = {}
+    if msgpack.version >= (0, 5, 2):
+        options['raw'] = True
+    if msgpack.version >= (1, 0, 0):
+        options['strict_map_key'] = False
+    return msgpack.unpackb(bytes(payload), **options)
+
+
+def run(decode, payloads, rounds, trace):
+    """Decodes all the payloads the given number of rounds.
+
+    The last two gamestates are kept alive, as the gamestate manager does.
+
+    :param decode: The decoding function
+    :type decode: callable
+
+    :returns: The measurements
+    :rtype: dict
+    """
+    views = [memoryview(p) for p in payloads]
+    kept = deque(maxlen=2)
+    with measure(trace) as result:
+        for _ in range(rounds):
+            for view in views:
+                kept.append(decode(view))
+    return result
+
+
+@click.command()
+@click.option('--input', 'stream', type=click.File('rb'),
+              help='Recorded server stream.')
+@click.option('--gamestates', default=100, help='Gamestates to generate.')
+@click.option('--entities', default=1000, help='Entities per gamestate.')
+@click.option('--rounds', default=10, help='Decoding rounds.')
+def bench(stream, gamestates, entities, rounds):
+    payloads = load(stream) if stream else generate(gamestates, entities)
+    if not payloads:
+        raise click.ClickException('No gamestates found')
+
+    implementations = [
+        ('unpackb', legacy_decode),
+        ('streaming', MessageDecoder(network_config()).decode),
+        ('interned', MessageDecoder(network_config(InternKeys=True)).decode),
+    ]
+
+    size = sum(len(p) for p in payloads) / len(payloads)
+    click.echo('{} gamestates of {:.0f} bytes on average'.format(
+        len(payloads), size))
+    click.echo('{:<10} {:>14} {:>14}'.format('impl', 'us/gamestate', 'peak KiB'))
+    for name, decode in implementations:
+        timed = run(decode, payloads, rounds, trace=False)
+        traced = run(decode, payloads, 1, trace=True)
+        click.echo('{:<10} {:>14.1f} {:>14.1f}'.format(
+            name,
+            timed['elapsed'] / rounds / len(payloads) * 1e6,
+            traced['peak'] / 1024))
+
+
+if __name__ == '__main__':
+    bench()
@@ -0,0 +1,112 @@
+"""Gamestate diff benchmark.
+
+Compares the gamestate diff backends on generated gamestates, where every tick
+a few entities spawn, disappear, change action or get hit, while the others
+keep moving or standing.
+
+Events are counted instead of being sent, so that only the diff and the
+processors are measured.
+
+Usage (from the client directory):
+
+    python -m benchmarks.gamestate --entities 100 --entities 1000
+"""
+from benchmarks.common import measure
+from collections import Counter
+from game.entities.actor import ActionType
+from game.gamestate import DIFF_BACKENDS
+from game.gamestate import process_gamestate
+from game.gamestate import set_diff_backend
+from game.snapshot import EntityRecord
+from game.snapshot import Snapshot
+import click
+import game.gamestate
+import random
+
+
+def generate(ticks, entities, churn):
+    """Generates a sequence of gamestates.
+
+    :param ticks: The number of gamestates
+    :type ticks: int
+
+    :param entities: The number of entities
+    :type entities: int
+
+    :param churn: The fraction of entities changing at each tick
+    :type churn: float
+
+    :returns: The gamestates
+    :rtype: list
+    """
+    actions = [ActionType.idle, ActionType.move, ActionType.attack]
+    current = {
+        i: (random.uniform(0, 100), random.uniform(0, 100), 100,
+            random.choice(actions))
+        for i in range(entities)
+    }
+    next_id = entities
+    changes = max(1, int(entities * churn))
+
+    gamestates = []
+    for tick in range(ticks):
+        for srv_id in random.sample(list(current), changes):
+            x, y, hp, action = current.pop(srv_id)
+            event = random.random()
+            if event < 0.25:
+                # disappeared, replaced by a new entity
+                srv_id, next_id = next_id, next_id + 1
+            elif event < 0.5:
+                action = random.choice(actions)
+            else:
+                hp -= 1
+            current[srv_id] = x, y, hp, action
+
+        for srv_id, (x, y, hp, action) in current.items():
+            if action == ActionType.move:
+                current[srv_id] = x + 0.1, y + 0.1, hp, action
+
+        gamestates.append(Snapshot(tick, tick, {
+            srv_id: EntityRecord(srv_id, 3, x, y, hp, action, {b'Speed': 1.0})
+            for srv_id, (x, y, hp, action) in current.items()
+        }, {}, {}))
+    return gamestates
+
+
+@click.command()
+@click.option('--entities', default=[100, 1000, 10000], multiple=True,
+              help='Number of entities.')
+@click.option('--ticks', default=50, help='Number of gamestates.')
+@click.option('--churn', default=0.01, help='Fraction of changing entities.')
+def bench(entities, ticks, churn):
+    events = Counter()
+    game.gamestate.send_event = lambda evt: events.update([type(evt)])
+
+    click.echo('{:>8} {:<8} {:>12} {:>12} {:>12}'.format(
+        'entities', 'backend', 'diff ms', 'tick ms', 'events/tick'))
+    for count in entities:
+        gamestates = generate(ticks, count, churn)
+        for name, changeset in sorted(DIFF_BACKENDS.items()):
+            prev = None
+            cache = {}
+            with measure() as diff:
+                for gamestate in gamestates:
+                    changeset.diff(gamestate, prev, cache)
+                    prev = gamestate
+
+            set_diff_backend(name)
+            events.clear()
+            with measure() as tick:
+                for gamestate in gamestates:
+                    process_gamestate(gamestate)
+
+            click.echo('{:>8} {:<8} {:>12.3f} {:>12.3f} {:>12.0f}'.format(
+                count,
+                name,
+                diff['elapsed'] / ticks * 1e3,
+                tick['elapsed'] / ticks * 1e3,
+                sum(events.values()) / ticks))
+
+
+if __name__ == '__main__':
+    bench()
@@ -0,0 +1,166 @@
+"""Server load test.
+
+Runs many headless clients in a single process on top of the asyncio network
+layer: every bot joins the game, periodically pings the server and wanders
+around the map, while gamestates are received and decoded.
+
+Usage (from the client directory):
+
+    python -m benchmarks.loadtest --bots 50 --duration 60
+"""
+from benchmarks.common import network_config
+from network import AsyncMessageProxy
+from network import Message
+from network import MessageField as MF
+from network import MessageType as MT
+import asyncio
+import click
+import random
+import time
+
+#: Character types bots can join with (see `game.entities.actor.ActorType`)
+CHARACTER_TYPES = (0, 1, 2)
+
+
+class Bot:
+    """Headless client."""
+
+    def __init__(self, name, proxy):
+        """Constructor.
+
+        :param name: The character name
+        :type name: str
+
+        :param proxy: The message proxy
+        :type proxy: :class:`network.aio.AsyncMessageProxy`
+        """
+        self.name = name
+        self.proxy = proxy
+        self.srv_id = None
+        self.position = None
+        self.received = 0
+        self.gamestates = 0
+        self.max_gap = 0.0
+        self.last_gamestate = None
+
+    def process(self, msg):
+        """Processes a message received from the server.
+
+        :param msg: the message to be processed
+        :type msg: :class:`message.Message`
+        """
+        self.received += 1
+        if msg.msgtype == MT.stay:
+            self.srv_id = msg.data[MF.id]
+        elif msg.msgtype == MT.gamestate:
+            now = time.perf_counter()
+            if self.last_gamestate is not None:
+                self.max_gap = max(self.max_gap, now - self.last_gamestate)
+            self.last_gamestate = now
+            self.gamestates += 1
+
+            entity = msg.data.get(MF.entities, {}).get(self.srv_id)
+            if entity:
+                self.position = entity[MF.x_pos], entity[MF.y_pos]
+
+    def move(self, radius):
+        """Starts a move action towards a random point around the bot.
+
+        :param radius: The maximum distance on each axis
+        :type radius: float
+        """
+        if self.position:
+            x, y = self.position
+            self.proxy.enqueue(Message(MT.move, {
+                MF.x_pos: x + random.uniform(-radius, radius),
+                MF.y_pos: y + random.uniform(-radius, radius),
+            }))
+
+    async def run(self, duration, move_period, ping_period, frame_time):
+        """Coroutine: bot main loop.
+
+        :param duration: The duration of the run in seconds
+        :type duration: float
+        """
+        proxy = self.proxy
+        proxy.enqueue(Message(MT.join, {
+            MF.name: self.name,
+            MF.entity_type: random.choice(CHARACTER_TYPES),
+        }))
+
+        start = last_move = last_ping = time.perf_counter()
+        while proxy.connected:
+            now = time.perf_counter()
+            if now - start >= duration:
+                break
+            if now - last_ping >= ping_period:
+                last_ping = now
+                # NOTE: same value of `utils.tstamp`, which can not be
+                # imported without the renderer.
+                proxy.enqueue(Message(MT.ping, {
+                    MF.id: 0,
+                    MF.timestamp: int(time.time() * 1000),
+                }))
+            if now - last_move >= move_period:
+                last_move = now
+                self.move(5.0)
+
+            for msg in proxy.poll():
+                self.process(msg)
+            proxy.push()
+            await proxy.drain()
+            await asyncio.sleep(frame_time)
+
+        await proxy.close()
+
+
+async def load_test(config, bots, duration, move_period, ping_period, fps):
+    """Coroutine: connects the bots and runs them concurrently.
+
+    :returns: The bots
+    :rtype: list
+    """
+    running = []
+    for i in range(bots):
+        proxy = await AsyncMessageProxy.connect(config)
+        running.append(Bot('bot{}'.format(i), proxy))
+
+    await asyncio.gather(*[
+        bot.run(duration, move_period, ping_period, 1.0 / fps)
+        for bot in running
+    ])
+    return running
+
+
+@click.command()
+@click.option('--host', default='127.0.0.1', help='Server address.')
+@click.option('--port', default=1234, help='Server port.')
+@click.option('--bots', default=10, help='Number of headless clients.')
+@click.option('--duration', default=30.0, help='Duration in seconds.')
+@click.option('--move-period', default=2.0, help='Seconds between moves.')
+@click.option('--ping-period', default=10.0, help='Seconds between pings.')
+@click.option('--fps', default=60, help='Iterations per second of each bot.')
+def bench(host, port, bots, duration, move_period, ping_period, fps):
+    config = network_config(ServerIPAddress=host, ServerPort=port)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    start = time.perf_counter()
+    result = loop.run_until_complete(load_test(
+        config, bots, duration, move_period, ping_period, fps))
+    elapsed = time.perf_counter() - start
+    loop.close()
+
+    received = sum(bot.received for bot in result)
+    gamestates = sum(bot.gamestates for bot in result)
+    click.echo('{} bots, {:.1f}s'.format(bots, elapsed))
+    click.echo('messages received: {} ({:.1f}/s)'.format(
+        received, received / elapsed))
+    click.echo('gamestates per bot: {:.1f}/s'.format(
+        gamestates / elapsed / bots))
+    click.echo('worst gamestate gap: {:.3f}s'.format(
+        max(bot.max_gap for bot in result)))
+
+
+if __name__ == '__main__':
+    bench()
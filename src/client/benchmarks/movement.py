@@ -0,0 +1,98 @@
+"""Movement system benchmark.
+
+Moves crowds of movables along random paths and measures the time of a frame
+with the vectorized movement system, against a per-entity Python loop
+implementing the same movement (with plain floats: the previous Movable
+also allocated `Vec` objects, and was slower than this loop).
+
+Usage (from the client directory):
+
+    python -m benchmarks.movement --entities 10 --entities 1000
+"""
+from benchmarks.common import measure
+from game.movement import MovementSystem
+from math import hypot
+import click
+import random
+
+
+def python_step(movables, dt):
+    """Reference per-entity movement step.
+
+    :param movables: The movables, as [position, path, waypoint, speed] lists
+    :type movables: list
+
+    :param dt: The time delta
+    :type dt: float
+    """
+    for movable in movables:
+        position, path, waypoint, speed = movable
+        if waypoint >= len(path):
+            continue
+        distance = speed * dt
+        x, y = position
+        while waypoint < len(path):
+            tx, ty = path[waypoint]
+            length = hypot(tx - x, ty - y)
+            if distance < length:
+                x += (tx - x) / length * distance
+                y += (ty - y) / length * distance
+                break
+            distance -= length
+            x, y = tx, ty
+            waypoint += 1
+        movable[0], movable[2] = (x, y), waypoint
+
+
+def random_path(position, waypoints, side):
+    x, y = position
+    path = []
+    for _ in range(waypoints):
+        x = min(max(x + random.uniform(-5, 5), 0), side)
+        y = min(max(y + random.uniform(-5, 5), 0), side)
+        path.append((x, y))
+    return path
+
+
+@click.command()
+@click.option('--entities', default=[10, 100, 1000, 5000], multiple=True,
+              help='Number of movables.')
+@click.option('--frames', default=200, help='Number of frames.')
+@click.option('--waypoints', default=10, help='Waypoints per path.')
+@click.option('--speed', default=3.0, help='Speed of the movables.')
+def bench(entities, frames, waypoints, speed):
+    dt = 1 / 60
+    click.echo('{:>8} {:>14} {:>14}'.format(
+        'entities', 'python ms', 'vectorized ms'))
+    for count in entities:
+        side = count ** 0.5 * 4
+        starts = [
+            (random.uniform(0, side), random.uniform(0, side))
+            for _ in range(count)]
+        paths = [random_path(p, waypoints, side) for p in starts]
+
+        movables = [
+            [start, path, 0, speed] for start, path in zip(starts, paths)]
+        with measure() as python:
+            for _ in range(frames):
+                python_step(movables, dt)
+
+        system = MovementSystem()
+        for start, path in zip(starts, paths):
+            system.move(system.allocate(start), start, path, speed)
+        with measure() as vectorized:
+            for _ in range(frames):
+                system.step(dt)
+
+        for i, (position, _, _, _) in enumerate(movables):
+            assert abs(system.position[i, 0] - position[0]) < 1e-6
+            assert abs(system.position[i, 1] - position[1]) < 1e-6
+
+        click.echo('{:>8} {:>14.3f} {:>14.3f}'.format(
+            count,
+            python['elapsed'] / frames * 1e3,
+            vectorized['elapsed'] / frames * 1e3))
+
+
+if __name__ == '__main__':
+    bench()
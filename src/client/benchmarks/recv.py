@@ -0,0 +1,143 @@
+"""Receive path benchmark.
+
+Compares the receive buffer based `network.Connection` with the previous
+chunked implementation, streaming frames over a loopback TCP socket pair.
+
+Usage (from the client directory):
+
+    python -m benchmarks.recv --frames 2000 --size 65536
+"""
+from benchmarks.common import CountingSocket
+from benchmarks.common import measure
+from benchmarks.common import network_config
+from benchmarks.common import tcp_socketpair
+from network.connection import Connection
+from network.connection import HEADER_LENGTH
+from network.connection import create_packet
+from network.connection import parse_header
+from threading import Thread
+import click
+import select
+
+
+class ChunkedConnection:
+    """The previous receive path, kept as benchmark baseline.
+
+    Reads at most `chunk_size` bytes per `recv` call and copies every chunk into
+    a growing bytearray, which is swapped for every header and payload.
+    """
+
+    def __init__(self, sock, chunk_size):
+        self.socket = sock
+        self.socket.setblocking(False)
+        self.chunk_size = chunk_size
+        self.header = None
+        self.payload = None
+        self.buffer = bytearray()
+
+    def recv(self):
+        def read(size):
+            while True:
+                try:
+                    chunk = min([self.chunk_size, size - len(self.buffer)])
+                    d = self.socket.recv(chunk)
+                    self.buffer.extend(d)
+                    if len(self.buffer) == size:
+                        buff, self.buffer = self.buffer, bytearray()
+                        return buff
+                except BlockingIOError:
+                    return
+
+        if self.header is None:
+            header = read(HEADER_LENGTH)
+            if header is None:
+                return
+            self.header = parse_header(header)
+
+        if self.header is not None:
+            payload = read(self.header[1])
+            if payload is None:
+                return None
+            self.payload = payload
+
+        msgtype, payload = self.header[0], self.payload
+        self.header, self.payload = None, None
+        return msgtype, payload
+
+
+def send_frames(sock, packet, frames):
+    """Sends the same packet the given number of times."""
+    for _ in range(frames):
+        sock.sendall(packet)
+
+
+def read_frames(conn, frames):
+    """Reads the given number of frames from the connection.
+
+    :returns: The number of bytes of payload read
+    :rtype: int
+    """
+    read = total = 0
+    while read < frames:
+        frame = conn.recv()
+        if frame is None:
+            select.select([conn.socket], [], [], 1)
+            continue
+        total += len(frame[1])
+        read += 1
+    return total
+
+
+def run(factory, frames, size, trace):
+    """Runs a single benchmark round.
+
+    :param factory: Callable building the connection from the reading socket
+    :type factory: callable
+
+    :returns: The measurements
+    :rtype: dict
+    """
+    reader, writer = tcp_socketpair()
+    sock = CountingSocket(reader)
+    conn = factory(sock)
+
+    packet = create_packet(6, b'\x00' * size)
+    sender = Thread(target=send_frames, args=(writer, packet, frames))
+    sender.start()
+    with measure(trace) as result:
+        result['bytes'] = read_frames(conn, frames)
+    sender.join()
+    result['calls'] = sock.calls
+
+    reader.close()
+    writer.close()
+    return result
+
+
+@click.command()
+@click.option('--frames', default=2000, help='Number of frames to stream.')
+@click.option('--size', default=64 * 1024, help='Payload size in bytes.')
+@click.option('--chunk-size', default=1024, help='Chunk size of the baseline.')
+@click.option('--buffer-size', default=256 * 1024, help='Receive buffer size.')
+def bench(frames, size, chunk_size, buffer_size):
+    config = network_config(RecvBufferSize=buffer_size)
+    implementations = [
+        ('chunked', lambda s: ChunkedConnection(s, chunk_size)),
+        ('buffered', lambda s: Connection(config, sock=s)),
+    ]
+
+    click.echo('{} frames of {} bytes'.format(frames, size))
+    click.echo('{:<10} {:>12} {:>12} {:>14}'.format(
+        'impl', 'MiB/s', 'calls/frame', 'peak KiB'))
+    for name, factory in implementations:
+        timed = run(factory, frames, size, trace=False)
+        traced = run(factory, frames, size, trace=True)
+        click.echo('{:<10} {:>12.1f} {:>12.2f} {:>14.1f}'.format(
+            name,
+            timed['bytes'] / timed['elapsed'] / 2 ** 20,
+            timed['calls'] / frames,
+            traced['peak'] / 1024))
+
+
+if __name__ == '__main__':
+    bench()
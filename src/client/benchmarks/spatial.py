@@ -0,0 +1,162 @@
+"""Spatial index benchmark.
+
+Compares the queries of the spatial grid with a linear scan of all the
+bounding boxes, on maps crowded with actor-sized boxes. Rays are cast from
+above, like the camera rays used for picking.
+
+Also compares the NumPy ray/box intersection with a Python loop, testing one
+ray against all the boxes (1xN) and as many rays as boxes, pairwise (NxN):
+in these rows the timings are for the whole batch, with the Python loop in
+the scan column and NumPy in the grid one.
+
+Usage (from the client directory):
+
+    python -m benchmarks.spatial --entities 1000 --entities 10000
+"""
+from benchmarks.common import measure
+from collections import namedtuple
+from spatial import SpatialGrid
+from spatial import ray_aabb
+import click
+import numpy as np
+import random
+
+
+#: Minimal vector type, with the attributes used by the spatial grid
+Point = namedtuple('Point', ['x', 'y', 'z'])
+
+
+def box(x, z):
+    """Returns an actor-sized bounding box centered in the given position."""
+    return Point(x - 0.5, 0, z - 0.5), Point(x + 0.5, 2, z + 0.5)
+
+
+def slab(pos, ray, box):
+    """Reference ray/box intersection test (slab method).
+
+    :returns: Whether the ray hits the box
+    :rtype: bool
+    """
+    t0, t1 = 0.0, float('inf')
+    for p, d, lo, hi in zip(pos, ray, box[:3], box[3:]):
+        if d:
+            ta, tb = (lo - p) / d, (hi - p) / d
+            t0, t1 = max(t0, min(ta, tb)), min(t1, max(ta, tb))
+        elif not lo <= p <= hi:
+            return False
+    return t0 <= t1
+
+
+def scan_ray(boxes, pos, ray):
+    return {key for key, b in boxes.items() if slab(pos, ray, b)}
+
+
+def scan_radius(boxes, x, z, r):
+    found = set()
+    for key, (lx, _, lz, mx, _, mz) in boxes.items():
+        dx = max(lx - x, 0, x - mx)
+        dz = max(lz - z, 0, z - mz)
+        if dx * dx + dz * dz <= r * r:
+            found.add(key)
+    return found
+
+
+def scan_rect(boxes, x0, z0, x1, z1):
+    return {
+        key for key, b in boxes.items()
+        if b[0] <= x1 and b[3] >= x0 and b[2] <= z1 and b[5] >= z0
+    }
+
+
+@click.command()
+@click.option('--entities', default=[1000, 5000, 20000], multiple=True,
+              help='Number of entities.')
+@click.option('--queries', default=200, help='Number of queries per kind.')
+@click.option('--density', default=0.05,
+              help='Entities per square unit of the map.')
+@click.option('--cell-size', default=4.0, help='Size of the grid cells.')
+def bench(entities, queries, density, cell_size):
+    click.echo('{:>8} {:<8} {:>12} {:>12} {:>12}'.format(
+        'entities', 'query', 'scan us', 'grid us', 'results'))
+    for count in entities:
+        side = (count / density) ** 0.5
+        grid = SpatialGrid(cell_size)
+        positions = {}
+        for key in range(count):
+            positions[key] = random.uniform(0, side), random.uniform(0, side)
+            grid.insert(key, box(*positions[key]))
+        boxes = grid.boxes
+
+        def point():
+            return random.uniform(0, side), random.uniform(0, side)
+
+        rays = []
+        for _ in range(queries):
+            (x, z), (tx, tz) = point(), point()
+            pos = Point(x, 30, z)
+            rays.append((pos, Point(tx - x, -30, tz - z)))
+        circles = [point() + (5.0,) for _ in range(queries)]
+        rects = [
+            (x, z, x + 10, z + 10)
+            for x, z in (point() for _ in range(queries))]
+
+        cases = [
+            ('ray', rays, scan_ray,
+             lambda *a: {k for k, _ in grid.cast(*a)}),
+            ('radius', circles, scan_radius, grid.radius),
+            ('rect', rects, scan_rect, grid.rect),
+        ]
+        for name, args, scan, query in cases:
+            with measure() as scan_time:
+                expected = [scan(boxes, *a) for a in args]
+            with measure() as grid_time:
+                found = [query(*a) for a in args]
+            assert found == expected, name
+            click.echo('{:>8} {:<8} {:>12.1f} {:>12.1f} {:>12.1f}'.format(
+                count,
+                name,
+                scan_time['elapsed'] / queries * 1e6,
+                grid_time['elapsed'] / queries * 1e6,
+                sum(map(len, found)) / queries))
+
+        # Every entity moves a bit, as in a frame with a crowd on the move
+        with measure() as update:
+            for key, (x, z) in positions.items():
+                grid.insert(key, box(x + 0.1, z + 0.1))
+        click.echo('{:>8} {:<8} {:>12} {:>12.1f}'.format(
+            count, 'update', '-', update['elapsed'] / count * 1e6))
+
+        # Exact intersections of all the boxes, without the grid
+        keys = list(boxes)
+        array = np.array([boxes[key] for key in keys])
+        lo, hi = array[:, :3], array[:, 3:]
+        # Rays cast from above, each one toward the center of a box
+        origins = np.column_stack([
+            np.random.uniform(0, side, count),
+            np.full(count, 30.0),
+            np.random.uniform(0, side, count)])
+        directions = (lo + hi) / 2 - origins
+        pos, ray = origins[0], directions[0]
+        with measure() as loop_time:
+            expected = [slab(pos, ray, boxes[key]) for key in keys]
+        with measure() as numpy_time:
+            distances = ray_aabb(pos, ray, lo, hi)
+        assert (distances != np.inf).tolist() == expected
+        click.echo('{:>8} {:<8} {:>12.1f} {:>12.1f} {:>12}'.format(
+            count, '1xN', loop_time['elapsed'] * 1e6,
+            numpy_time['elapsed'] * 1e6, int(sum(expected))))
+
+        with measure() as loop_time:
+            expected = [
+                slab(p, d, boxes[key])
+                for p, d, key in zip(origins, directions, keys)]
+        with measure() as numpy_time:
+            distances = ray_aabb(origins, directions, lo, hi)
+        assert (distances != np.inf).tolist() == expected
+        click.echo('{:>8} {:<8} {:>12.1f} {:>12.1f} {:>12}'.format(
+            count, 'NxN', loop_time['elapsed'] * 1e6,
+            numpy_time['elapsed'] * 1e6, int(sum(expected))))
+
+
+if __name__ == '__main__':
+    bench()
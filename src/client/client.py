@@ -1,13 +1,25 @@
 from context import Context
+from context import EntityKind
+from events import flush_events
 from events import send_event
+from events import set_deferred
 from game.actions import ray_cast
+from game.components import Movable
+from game.crowd import configure_crowd
+from game.crowd import update_crowd_animation
 from game.entities.actor import ActorType
+from game.entities.building import prewarm_buildings
+from game.entities.enemy import prewarm_enemies
 from game.entities.map import Map
 from game.entities.terrain import Terrain
 from game.events import CharacterJoin
 from game.events import CharacterLeave
 from game.events import PlayerJoin
+from game.gamestate import configure_gamestate
+from game.gamestate import entity_positions
 from game.gamestate import process_gamestate
+from game.movement import update_movement
+from game.snapshot import Snapshot
 from game.ui import UI
 from itertools import count
 from matlib import Vec
@@ -22,11 +34,18 @@ from renderer.light import LightNode
 from renderer.scene import Scene
 from utils import as_utf8
 from utils import tstamp
+import asyncio
 import logging
 
 
 LOG = logging.getLogger(__name__)
 
+#: Default period (in seconds) of the time offset resync in the coroutine loop
+RESYNC_PERIOD = 10.0
+
+#: Period (in seconds) of the update rate adjustments of the far actors
+SCHEDULE_PERIOD = 1.0
+
 
 class Client:
     """Client."""
@@ -63,6 +82,16 @@ class Client:
         context.input_mgr = input_mgr
         context.res_mgr = res_mgr
         context.audio_mgr = audio_mgr
+        configure_gamestate(conf['Game'])
+        configure_crowd(conf['Game'])
+        set_deferred(conf['Game'].getboolean('DeferredEvents', fallback=False))
+        self.interpolation_delay = conf['Game'].getint(
+            'InterpolationDelay', fallback=0)
+        self.far_update_distance = conf['Game'].getfloat(
+            'FarUpdateDistance', fallback=0)
+        self.far_update_rate = conf['Game'].getfloat(
+            'FarUpdateRate', fallback=10)
+        self.schedule_elapsed = 0.0
 
         # Setup the player
         c_res = res_mgr.get('/characters')
@@ -81,6 +110,7 @@ class Client:
         context.camera, context.ratio = self.setup_camera(context)
         context.terrain = self.setup_terrain(context)
         context.map = self.setup_map(context)
+        self.setup_pools(context)
 
         # Setup UI
         ui_res = context.res_mgr.get('/ui')
@@ -137,7 +167,7 @@ class Client:
         # matrix.
         resource = context.res_mgr.get('/map')
         terrain = Terrain(resource, root)
-        context.entities[terrain.e_id] = terrain
+        context.registry.add(terrain)
         return terrain
 
     def setup_map(self, context):
@@ -152,6 +182,17 @@ class Client:
         resource = context.res_mgr.get('/map')
         return Map(resource, context.scene.root)
 
+    def setup_pools(self, context):
+        """Pre-warms the pools of the entities spawned during the game.
+
+        :param context: The client context
+        :type context: :class:`context.Context`
+        """
+        conf = context.conf['Game']
+        prewarm_enemies(context, conf.getint('PrewarmEnemies', fallback=0))
+        prewarm_buildings(
+            context, conf.getint('PrewarmBuildings', fallback=0))
+
     def setup_camera(self, context):
         """Sets up camera.
 
@@ -216,6 +257,12 @@ class Client:
             self.time_acc -= 1
             self.context.ui.set_fps(self.fps_count)
             self.fps_count = 0
+            LOG.debug('Shader parameters: {} uploaded, {} skipped'.format(
+                *self.renderer.uniform_counters.last))
+            LOG.debug('Draw calls: {}'.format(self.renderer.draw_calls))
+            root = self.context.scene.root
+            LOG.debug('Scene nodes: {} visited, {} culled'.format(
+                root.visited, root.culled_count))
 
     def process_message(self, msg):
         """Processes a message received from the server.
@@ -266,6 +313,87 @@ class Client:
             })
         self.proxy.enqueue(msg)
 
+    def interpolate_entities(self):
+        """Moves the actors where they were `InterpolationDelay` milliseconds
+        ago, according to the buffered gamestates.
+
+        Only the actors which moved are woken up.
+        """
+        t = tstamp() - self.interpolation_delay
+        for srv_id, position in entity_positions(t).items():
+            actor = self.context.resolve_entity(srv_id)
+            if actor and actor[Movable].interpolate(position):
+                self.context.registry.wake(actor)
+
+    def schedule_far_actors(self, dt):
+        """Updates the actors farther than `FarUpdateDistance` from the player
+        at the reduced `FarUpdateRate`, checking the distances once every
+        `SCHEDULE_PERIOD` seconds.
+
+        :param dt: Time delta from last frame.
+        :type dt: float
+        """
+        self.schedule_elapsed += dt
+        player = self.context.player
+        if self.schedule_elapsed < SCHEDULE_PERIOD or not player:
+            return
+        self.schedule_elapsed = 0.0
+
+        registry = self.context.registry
+        x, y = player.position
+        near = registry.index.radius(x, y, self.far_update_distance)
+        for actor in registry.of_kind(EntityKind.actor):
+            e_id = actor.e_id
+            rate = None if e_id in near else self.far_update_rate
+            registry.scheduler.set_rate(e_id, rate)
+
+    def step(self):
+        """Runs a single iteration of the client main loop.
+        """
+        # Compute time delta
+        dt = self.dt()
+
+        # Update FPS stats
+        self.update_fps_counter(dt)
+
+        # Poll messages from network
+        self.poll_network()
+
+        # Process user input
+        self.context.input_mgr.process_input()
+
+        # Dispatch the events queued while processing network and input
+        flush_events()
+
+        # Interpolate positions between the buffered gamestates
+        if self.interpolation_delay:
+            self.interpolate_entities()
+
+        # Move all the movables at once
+        update_movement(dt)
+
+        # Evaluate the animation poses shared by the actors
+        update_crowd_animation(dt)
+
+        # Update entities
+        if self.far_update_distance:
+            self.schedule_far_actors(dt)
+        self.context.registry.scheduler.update(dt)
+
+        # rendering
+        self.renderer.clear()
+        self.context.scene.render(self.renderer, self.context.camera)
+        self.context.ui.render()
+        self.renderer.present()
+
+        # Enqueue messages in context and emtpy the queue
+        for msg in self.context.msg_queue:
+            self.proxy.enqueue(msg)
+        self.context.msg_queue = []
+
+        # Push messages in the proxy queue
+        self.proxy.push()
+
     def start(self):
         """Client main loop.
         """
@@ -274,35 +402,43 @@ class Client:
         self.join(self.context.character_name, self.context.character_type)
 
         while not self.exit:
-            # Compute time delta
-            dt = self.dt()
+            self.step()
 
-            # Update FPS stats
-            self.update_fps_counter(dt)
+    async def resync(self, period):
+        """Coroutine: periodically pings the server to keep the time offset
+        with the server up to date.
 
-            # Poll messages from network
-            self.poll_network()
+        :param period: The period in seconds
+        :type period: float
+        """
+        while not self.exit:
+            await asyncio.sleep(period)
+            self.ping()
 
-            # Process user input
-            self.context.input_mgr.process_input()
+    async def start_async(self):
+        """Client main loop, coroutine variant.
 
-            # Update entities
-            for ent in self.context.entities.values():
-                ent.update(dt)
+        To be used along with an asyncio based message proxy: each iteration
+        yields control to the event loop, so that networking and timers are
+        scheduled cooperatively with the rendering.
+        """
+        self.ping()
+        self.join(self.context.character_name, self.context.character_type)
 
-            # rendering
-            self.renderer.clear()
-            self.context.scene.render(self.renderer, self.context.camera)
-            self.context.ui.render()
-            self.renderer.present()
+        period = self.context.conf['Network'].getfloat(
+            'ResyncPeriod', fallback=RESYNC_PERIOD)
+        resync = asyncio.ensure_future(self.resync(period))
 
-            # Enqueue messages in context and emtpy the queue
-            for msg in self.context.msg_queue:
-                self.proxy.enqueue(msg)
-            self.context.msg_queue = []
+        while not self.exit:
+            self.step()
+            await self.proxy.drain()
+            await asyncio.sleep(0)
 
-            # Push messages in the proxy queue
-            self.proxy.push()
+        resync.cancel()
+        try:
+            await resync
+        except asyncio.CancelledError:
+            pass
 
     @message_handler(MT.pong)
     def pong(self, msg):
@@ -391,4 +527,4 @@ class Client:
         # Update the server timestamp adding the offset calculated after the
         # ping-pong exchange.
         msg.data[MF.timestamp] += self.delta or 0
-        process_gamestate(msg.data)
+        process_gamestate(Snapshot.from_data(msg.data))
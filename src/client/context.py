@@ -1,7 +1,216 @@
 from collections import defaultdict
 from enum import Enum
 from enum import unique
-from utils import intersect
+from scheduler import UpdateScheduler
+from spatial import SpatialGrid
+
+
+@unique
+class EntityKind(Enum):
+    """Kinds of entities tracked by the registry."""
+    actor = 'actor'
+    building = 'building'
+    map_object = 'map_object'
+    other = 'other'
+
+
+class EntityRegistry:
+    """Registry of the game entities.
+
+    Owns the entity objects, mapped by local id, along with the server id of
+    the entities known to the server and the kind of each entity: lookups in
+    both directions and per-kind iteration never scan the whole registry.
+
+    The bounding boxes of the entities known to the server are kept in a
+    spatial index, for picking and proximity queries, and the updates of all
+    the entities are scheduled by the update scheduler.
+    """
+
+    def __init__(self):
+        #: The entities, mapped by local id
+        self.entities = {}
+        #: The local ids, mapped by server id
+        self.local_ids = {}
+        #: The server ids, mapped by local id
+        self.server_ids = {}
+        #: The entities of each kind, mapped by local id
+        self.kinds = {kind: {} for kind in EntityKind}
+        #: The spatial index of the bounding boxes, keyed by local id
+        self.index = SpatialGrid()
+        #: The scheduler of the entity updates
+        self.scheduler = UpdateScheduler()
+        # The kind of each entity, mapped by local id
+        self._kind_of = {}
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __contains__(self, e_id):
+        return e_id in self.entities
+
+    def add(self, entity, srv_id=None, kind=EntityKind.other):
+        """Adds an entity to the registry.
+
+        :param entity: The entity
+        :type entity: :class:`game.entities.entity.Entity`
+
+        :param srv_id: The server id, if the entity is known to the server
+        :type srv_id: int
+
+        :param kind: The kind of the entity
+        :type kind: :enum:`context.EntityKind`
+        """
+        e_id = entity.e_id
+        self.entities[e_id] = entity
+        self.kinds[kind][e_id] = entity
+        self._kind_of[e_id] = kind
+        self.scheduler.add(entity)
+        if srv_id is not None:
+            self.local_ids[srv_id] = e_id
+            self.server_ids[e_id] = srv_id
+            self.move(entity)
+
+    def move(self, entity):
+        """Updates the bounding box of an entity in the spatial index.
+
+        Entities are expected to call this whenever they move.
+
+        :param entity: The entity
+        :type entity: :class:`game.entities.entity.Entity`
+        """
+        e_id = entity.e_id
+        if e_id in self.server_ids:
+            bb = entity.bounding_box
+            if bb:
+                self.index.insert(e_id, bb)
+            else:
+                self.index.remove(e_id)
+
+    def wake(self, entity=None, kind=None):
+        """Wakes up an entity, or all the entities of a kind.
+
+        :param entity: The entity
+        :type entity: :class:`game.entities.entity.Entity`
+
+        :param kind: The kind of the entities
+        :type kind: :enum:`context.EntityKind`
+        """
+        if entity is not None:
+            self.scheduler.wake(entity.e_id)
+        if kind is not None and self.scheduler.sleeping:
+            for e_id in self.kinds[kind]:
+                self.scheduler.wake(e_id)
+
+    def remove(self, e_id):
+        """Removes the entity identified by the given (local) id.
+
+        :param e_id: The local entity id
+        :type e_id: int
+
+        :returns: The removed entity, if any
+        :rtype: :class:`game.entities.entity.Entity`
+        """
+        entity = self.entities.pop(e_id, None)
+        if entity is not None:
+            del self.kinds[self._kind_of.pop(e_id)][e_id]
+            self.scheduler.remove(e_id)
+            srv_id = self.server_ids.pop(e_id, None)
+            if srv_id is not None:
+                del self.local_ids[srv_id]
+                self.index.remove(e_id)
+        return entity
+
+    def remove_server(self, srv_id):
+        """Removes the entity identified by the given server id.
+
+        :param srv_id: The server id
+        :type srv_id: int
+
+        :returns: The removed entity, if any
+        :rtype: :class:`game.entities.entity.Entity`
+        """
+        e_id = self.local_ids.get(srv_id)
+        return self.remove(e_id) if e_id is not None else None
+
+    def remove_all(self, e_ids=None, kind=None):
+        """Removes many entities at once.
+
+        :param e_ids: The local ids of the entities, all of them by default
+        :type e_ids: iterable
+
+        :param kind: Restricts the removal to the entities of this kind
+        :type kind: :enum:`context.EntityKind`
+
+        :returns: The removed entities
+        :rtype: list
+        """
+        if e_ids is None:
+            e_ids = self.kinds[kind] if kind else self.entities
+        elif kind:
+            e_ids = [e_id for e_id in e_ids if self._kind_of.get(e_id) == kind]
+        return [
+            entity for entity in map(self.remove, list(e_ids))
+            if entity is not None]
+
+    def get(self, e_id):
+        """Returns the entity identified by the given (local) id.
+
+        :param e_id: The local entity id
+        :type e_id: int
+
+        :returns: The entity object
+        :rtype: :class:`game.entities.entity.Entity`
+        """
+        return self.entities.get(e_id)
+
+    def resolve(self, srv_id):
+        """Returns the entity identified by the given server id.
+
+        :param srv_id: The server id
+        :type srv_id: int
+
+        :returns: The entity object
+        :rtype: :class:`game.entities.entity.Entity`
+        """
+        return self.entities.get(self.local_ids.get(srv_id))
+
+    def server_id(self, e_id):
+        """Returns the server id of the entity identified by the local id.
+
+        :param e_id: The local entity id
+        :type e_id: int
+
+        :returns: The server id
+        :rtype: int
+        """
+        return self.server_ids.get(e_id)
+
+    def of_kind(self, kind):
+        """Iterates over the entities of the given kind.
+
+        :param kind: The kind of the entities
+        :type kind: :enum:`context.EntityKind`
+
+        :returns: The entities
+        :rtype: iterable
+        """
+        return self.kinds[kind].values()
+
+    def networked(self):
+        """Iterates over the entities known to the server.
+
+        :returns: The entities
+        :rtype: iterable
+        """
+        return map(self.entities.__getitem__, self.local_ids.values())
+
+    def values(self):
+        """Iterates over all the entities.
+
+        :returns: The entities
+        :rtype: iterable
+        """
+        return self.entities.values()
 
 
 class Context:
@@ -42,9 +251,8 @@ class Context:
         self.terrain = None
         self.ui = None
 
-        # Entity related maps
-        self.server_entities_map = {}
-        self.entities = {}
+        # Entity registry
+        self.registry = EntityRegistry()
 
         # Local player entity information
         self.player_name = None
@@ -68,6 +276,16 @@ class Context:
         """
         return cls.__INSTANCE
 
+    @property
+    def entities(self):
+        """The entities, mapped by local id (read only)."""
+        return self.registry.entities
+
+    @property
+    def server_entities_map(self):
+        """The local ids of the entities, mapped by server id (read only)."""
+        return self.registry.local_ids
+
     @property
     def player(self):
         return self.resolve_entity(self.player_id)
@@ -81,7 +299,7 @@ class Context:
         :returns: The entity object
         :rtype: :class:`game.entities.entity.Entity`
         """
-        return self.entities.get(self.server_entities_map.get(srv_id))
+        return self.registry.resolve(srv_id)
 
     def server_id(self, e_id):
         """Take the entity or id and return the corresponding server id.
@@ -92,8 +310,7 @@ class Context:
         :returns: The server id
         :rtype: :class:`int`
         """
-        reverse_map = {v: k for k, v in self.server_entities_map.items()}
-        return reverse_map.get(e_id)
+        return self.registry.server_id(e_id)
 
     def get_entity(self, e_id):
         """Returns the entity identified by the given (local) id.
@@ -104,7 +321,7 @@ class Context:
         :returns: The entity object
         :rtype: :class:`game.entities.entity.Entity`
         """
-        return self.entities.get(e_id)
+        return self.registry.get(e_id)
 
     def toggle_game_mode(self, mode=None):
         """Handle the game mode.
@@ -131,21 +348,42 @@ class Context:
         :param ray: The normalized ray vector
         :type ray: :class:`mathlib.Vec`
 
-        :returns: The entity picked
+        :returns: The nearest entity hit by the ray
         :rtype: :class:`game.entities.entity.Entity` or None
         """
-        # This is the list of the entities, sorted by z-axis (reverse order)
-        entities = sorted(
-            [
-                self.entities[e_id]
-                for e_id in self.server_entities_map.values()
-                if self.entities[e_id].bounding_box
-            ],
-            key=lambda entity: entity.bounding_box[1].z, reverse=True)
-
-        # Check eventual intersections between the ray and the bounding boxes
-        for e in entities:
-            if intersect(pos, ray, e.bounding_box):
-                return e
-
-        return None
+        hits = self.registry.index.cast(pos, ray)
+        return self.registry.get(hits[0][0]) if hits else None
+
+    def entities_in_radius(self, pos, r):
+        """Finds the entities within the given distance from a position.
+
+        :param pos: The position in world coordinates
+        :type pos: :class:`tuple`
+
+        :param r: The distance
+        :type r: float
+
+        :returns: The entities
+        :rtype: list
+        """
+        return [
+            self.registry.get(e_id)
+            for e_id in self.registry.index.radius(pos[0], pos[1], r)
+        ]
+
+    def entities_in_rect(self, p0, p1):
+        """Finds the entities overlapping the given rectangle.
+
+        :param p0: The minimum corner in world coordinates
+        :type p0: :class:`tuple`
+
+        :param p1: The maximum corner in world coordinates
+        :type p1: :class:`tuple`
+
+        :returns: The entities
+        :rtype: list
+        """
+        return [
+            self.registry.get(e_id)
+            for e_id in self.registry.index.rect(p0[0], p0[1], p1[0], p1[1])
+        ]
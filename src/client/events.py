@@ -1,37 +1,156 @@
 from abc import ABC
+from abc import abstractmethod
 from context import Context
 from collections import defaultdict
+from collections import deque
 import logging
+import time
 
 LOG = logging.getLogger(__name__)
 
 
 __SUBSCRIBED = defaultdict(list)
 
+#: Cached subscribers of each event type, including the ones of its bases
+__DISPATCH = {}
+
+#: Events waiting for the next flush, when deferred
+__QUEUE = deque()
+__DEFERRED = False
+
+#: Number of calls and total time spent (in seconds) by each subscriber
+__TIMINGS = defaultdict(lambda: [0, 0.0])
+
 
 def subscriber(event):
     """Decorator for event handlers.
 
+    Handlers subscribed to an event class are called for the events of its
+    subclasses as well.
+
+    Handlers of a :class:`BatchEvent` receive the data of all the entities at
+    once, while handlers of its `item_event` keep receiving one event for each
+    entity.
+
     :param event: the event to be handled
     :type event: :class:`Event`
     """
     def wrap(f):
         __SUBSCRIBED[event].append(f)
+        __DISPATCH.clear()
         return f
     return wrap
 
 
+def subscribers(event_type):
+    """Returns the handlers of the given event type.
+
+    :param event_type: The event type
+    :type event_type: type
+
+    :returns: The handlers subscribed to the type and to its bases
+    :rtype: tuple
+    """
+    try:
+        return __DISPATCH[event_type]
+    except KeyError:
+        handlers = tuple(
+            f
+            for cls in event_type.__mro__
+            for f in __SUBSCRIBED.get(cls, ()))
+        __DISPATCH[event_type] = handlers
+        return handlers
+
+
+def set_deferred(deferred):
+    """Sets the event bus mode.
+
+    In deferred mode, events are queued by `send_event` and dispatched by
+    `flush_events`, usually once per frame.
+
+    :param deferred: Whether events should be deferred
+    :type deferred: bool
+    """
+    global __DEFERRED
+    __DEFERRED = deferred
+    if not deferred:
+        flush_events()
+
+
+def dispatch(event):
+    """Calls all the event handlers subscribed to the event.
+
+    :param event: The event to be dispatched.
+    :type event: :class:`Event`
+    """
+    if LOG.isEnabledFor(logging.DEBUG):
+        LOG.debug('Sending event {}'.format(event))
+
+    timings = __TIMINGS
+    perf_counter = time.perf_counter
+    for handler in subscribers(type(event)):
+        start = perf_counter()
+        handler(event)
+        timing = timings[handler]
+        timing[0] += 1
+        timing[1] += perf_counter() - start
+
+    # Per-entity subscribers of batches
+    if isinstance(event, BatchEvent):
+        handlers = subscribers(event.item_event)
+        if handlers:
+            for item in event.items():
+                for handler in handlers:
+                    start = perf_counter()
+                    handler(item)
+                    timing = timings[handler]
+                    timing[0] += 1
+                    timing[1] += perf_counter() - start
+
+
 def send_event(event):
     """Emits the given event.
 
-    Calls all the event handlers subscribed to the specified event.
+    Calls all the event handlers subscribed to the specified event, or queues
+    the event in deferred mode.
 
     :param event: The event to be emitted.
     :type event: :class:`game.events.Event`
     """
-    LOG.debug('Sending event {}'.format(event))
-    for subscriber in __SUBSCRIBED[type(event)]:
-        subscriber(event)
+    if __DEFERRED:
+        __QUEUE.append(event)
+    else:
+        dispatch(event)
+
+
+def flush_events():
+    """Dispatches the queued events.
+
+    Events sent by the handlers during the flush are queued and dispatched in
+    the same flush, instead of recursively.
+
+    :returns: The number of events dispatched
+    :rtype: int
+    """
+    queue = __QUEUE
+    count = 0
+    while queue:
+        dispatch(queue.popleft())
+        count += 1
+    return count
+
+
+def subscriber_timings():
+    """Returns the time spent by each event handler.
+
+    :returns: tuples (handler name, calls, total time in seconds), sorted by
+        total time
+    :rtype: list
+    """
+    return sorted((
+        ('{}.{}'.format(f.__module__, f.__name__), calls, total)
+        for f, (calls, total) in __TIMINGS.items()
+    ), key=lambda timing: timing[2], reverse=True)
 
 
 class Event(ABC):
@@ -42,3 +161,27 @@ class Event(ABC):
         inst = super(Event, cls).__new__(cls)
         inst.context = Context.get_instance()
         return inst
+
+
+class BatchEvent(Event):
+    """Abstract base class for the events carrying the data of many entities.
+
+    Sent once per tick instead of one `item_event` for each entity: batch
+    subscribers are called once, subscribers of `item_event` are called for
+    each item, as if the single events were sent.
+    """
+
+    #: The per-entity event class
+    item_event = None
+
+    def __len__(self):
+        return len(self.srv_ids)
+
+    @abstractmethod
+    def items(self):
+        """Yields the per-entity events.
+
+        :returns: The per-entity events
+        :rtype: :class:`Event`
+        """
+        pass
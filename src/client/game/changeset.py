@@ -0,0 +1,152 @@
+"""Differences between consecutive gamestate snapshots."""
+from game.entities.actor import ActionType
+
+#: Actions of a character working on a building
+BUILDING_ACTIONS = {ActionType.build, ActionType.repair}
+
+
+class Changeset:
+    """Structured differences between two consecutive gamestates.
+
+    Every slice is computed by a single pass over the snapshots. Records are
+    listed as they are in the new snapshot, or in the old one for what
+    disappeared; changes are listed as (old, new) record pairs.
+
+    Slices:
+        spawned: entities not in the old gamestate
+        disappeared: entities not in the new gamestate
+        idle: idle entities
+        moved: entities which were moving and changed position
+        action_changed: entities which changed action
+        hp_changed: entities which changed hit points
+        build_started: characters which started building or repairing
+        build_stopped: characters which stopped building or repairing
+        buildings_added: buildings not in the old gamestate
+        buildings_removed: buildings not in the new gamestate
+        buildings_changed: buildings which changed hit points or status
+        objects_added: objects not in the old gamestate
+        time: the new (hours, minutes) game time, if the minute changed
+    """
+
+    __slots__ = ['spawned', 'disappeared', 'idle', 'moved', 'action_changed',
+                 'hp_changed', 'build_started', 'build_stopped',
+                 'buildings_added', 'buildings_removed', 'buildings_changed',
+                 'objects_added', 'time']
+
+    def __init__(self):
+        self.spawned = []
+        self.disappeared = []
+        self.idle = []
+        self.moved = []
+        self.action_changed = []
+        self.hp_changed = []
+        self.build_started = []
+        self.build_stopped = []
+        self.buildings_added = []
+        self.buildings_removed = []
+        self.buildings_changed = []
+        self.objects_added = []
+        self.time = None
+
+    @classmethod
+    def diff(cls, new, old, cache=None):
+        """Computes the changes between two gamestates.
+
+        :param new: The new gamestate
+        :type new: :class:`game.snapshot.Snapshot`
+
+        :param old: The previous gamestate, if any
+        :type old: :class:`game.snapshot.Snapshot`
+
+        :param cache: Data the backend can reuse between consecutive diffs,
+            owned by the caller
+        :type cache: dict
+
+        :returns: The changeset
+        :rtype: :class:`game.changeset.Changeset`
+        """
+        changes = cls()
+        changes.diff_entities(
+            new.entities, old.entities if old else {}, cache)
+        changes.diff_buildings(new.buildings, old.buildings if old else {})
+
+        old_objects = old.objects if old else {}
+        changes.objects_added = [
+            obj for o_id, obj in new.objects.items()
+            if o_id not in old_objects]
+
+        if old and new.time % 60 != old.time % 60:
+            changes.time = int(new.time / 60), new.time % 60
+
+        return changes
+
+    def diff_entities(self, new, old, cache=None):
+        """Fills the entity slices of the changeset.
+
+        :param new: The new entities, mapped by server id
+        :type new: dict
+
+        :param old: The old entities, mapped by server id
+        :type old: dict
+
+        :param cache: Data reused between consecutive diffs (unused)
+        :type cache: dict
+        """
+        for srv_id, entity in new.items():
+            action_type = entity.action_type
+            if action_type == ActionType.idle:
+                self.idle.append(entity)
+
+            prev = old.get(srv_id)
+            if prev is None:
+                self.spawned.append(entity)
+                if action_type in BUILDING_ACTIONS:
+                    self.build_started.append(entity)
+                continue
+
+            prev_action_type = prev.action_type
+            if prev_action_type == ActionType.move and (
+                    prev.x != entity.x or prev.y != entity.y):
+                self.moved.append((prev, entity))
+            if prev_action_type != action_type:
+                self.action_changed.append((prev, entity))
+                building = action_type in BUILDING_ACTIONS
+                was_building = prev_action_type in BUILDING_ACTIONS
+                if building and not was_building:
+                    self.build_started.append(entity)
+                elif was_building and not building:
+                    self.build_stopped.append(prev)
+            if prev.cur_hp != entity.cur_hp:
+                self.hp_changed.append((prev, entity))
+
+        for srv_id, prev in old.items():
+            if srv_id not in new:
+                self.disappeared.append(prev)
+                if prev.action_type in BUILDING_ACTIONS:
+                    self.build_stopped.append(prev)
+
+    def diff_buildings(self, new, old):
+        """Fills the building slices of the changeset.
+
+        :param new: The new buildings, mapped by server id
+        :type new: dict
+
+        :param old: The old buildings, mapped by server id
+        :type old: dict
+        """
+        for b_id, building in new.items():
+            prev = old.get(b_id)
+            if prev is None:
+                self.buildings_added.append(building)
+            elif (prev.cur_hp != building.cur_hp or
+                    prev.completed != building.completed):
+                self.buildings_changed.append((prev, building))
+
+        for b_id, prev in old.items():
+            if b_id not in new:
+                self.buildings_removed.append(prev)
+
+    def __str__(self):
+        return '<Changeset({})>'.format(', '.join(
+            '{}={}'.format(name, len(getattr(self, name)))
+            for name in self.__slots__[:-1]))
@@ -1,4 +1,6 @@
 from game.components import Component
+from game.movement import movement_system
+from math import hypot
 from matlib import Vec
 import logging
 
@@ -11,6 +13,10 @@ class Movable(Component):
 
     Given a destination and a target arrival timestamp, computes the position
     for each dt.
+
+    The state of the movable lives in a slot of the movement system, which
+    advances all the movables at once: this component is just a view on it
+    (see :class:`game.movement.MovementSystem`).
     """
 
     #: tolerance: if the current position is not different from the new "current
@@ -18,26 +24,23 @@ class Movable(Component):
     # current interpolation.
     EPSILON = 0.1
 
-    def __init__(self, position):
+    def __init__(self, position, system=None):
         """Constructor.
 
         :param position: The starting position of the movable.
         :type position: tuple
-        """
-        # Current position of the server
-        self._position = position
-
-        # Destination
-        self.next_position = None
-
-        # Path
-        self.path = None
 
-        # Speed
-        self.speed = 0
+        :param system: The movement system, the one of the game by default
+        :type system: :class:`game.movement.MovementSystem`
+        """
+        self.system = system if system is not None else movement_system()
+        self.slot = self.system.allocate(position)
 
-        # Direction vector
-        self._direction = None
+    def destroy(self):
+        """Releases the slot of the movable in the movement system."""
+        if self.slot is not None:
+            self.system.release(self.slot)
+            self.slot = None
 
     @property
     def position(self):
@@ -46,11 +49,20 @@ class Movable(Component):
         :returns: The current position of the movable.
         :rtype: tuple
         """
-        return self._position
+        x, y = self.system.position[self.slot].tolist()
+        return x, y
 
     @property
     def direction(self):
-        return self._direction
+        """The normalized direction of the movement, if any.
+
+        :returns: The direction
+        :rtype: :class:`matlib.Vec`
+        """
+        if self.system.oriented[self.slot]:
+            dx, dy = self.system.direction[self.slot].tolist()
+            return Vec(dx, dy, 0.0)
+        return None
 
     @position.setter
     def position(self, value):
@@ -60,12 +72,58 @@ class Movable(Component):
         :type value: tuple
         """
         LOG.debug('Manually setting position {} -> {}'.format(
-            self._position, value))
-        self.next_position = None
-        self._direction = None
-        self.path = []
-        self.speed = 0
-        self._position = value
+            self.position, value))
+        self.system.stop(self.slot, value)
+        self.system.oriented[self.slot] = False
+
+    def interpolate(self, position):
+        """Sets the position interpolated from the server gamestates.
+
+        Unlike the position setter, the direction follows the movement, so that
+        the owner can be orientated accordingly. The direction is cleared as
+        soon as the position stops changing.
+
+        :param position: The interpolated position.
+        :type position: tuple
+
+        :returns: Whether the position changed
+        :rtype: bool
+        """
+        system, slot = self.system, self.slot
+        x, y = system.position[slot].tolist()
+        dx, dy = position[0] - x, position[1] - y
+        changed = bool(dx or dy)
+        if abs(dx) > self.EPSILON / 10 or abs(dy) > self.EPSILON / 10:
+            norm = hypot(dx, dy)
+            system.direction[slot] = dx / norm, dy / norm
+            system.oriented[slot] = True
+        elif not changed:
+            system.oriented[slot] = False
+        system.stop(slot, position)
+        return changed
+
+    @property
+    def speed(self):
+        """The movement speed, 0 when not moving."""
+        return float(self.system.speed[self.slot])
+
+    @property
+    def next_position(self):
+        """The next waypoint of the path, if moving."""
+        system, slot = self.system, self.slot
+        if not system.moving[slot]:
+            return None
+        x, y = system.paths[slot, system.waypoint[slot]].tolist()
+        return x, y
+
+    @property
+    def path(self):
+        """The waypoints of the path after the next one."""
+        system, slot = self.system, self.slot
+        if not system.moving[slot]:
+            return []
+        start, end = system.waypoint[slot] + 1, system.path_len[slot]
+        return [tuple(p) for p in system.paths[slot, start:end].tolist()]
 
     @property
     def destination(self):
@@ -74,8 +132,8 @@ class Movable(Component):
     def move(self, position, path, speed):
         """Initial setup of a movable.
 
-        Sets the initial position, the movement path and the speed. And computes
-        the direction vector.
+        Sets the initial position, the movement path and the speed. The
+        movement system will compute the direction vector.
 
         :param position: The starting position of the movable.
         :type position: :class:`tuple`
@@ -86,70 +144,4 @@ class Movable(Component):
         :param speed: The movement speed.
         :type target_tstamp: :class:`float`
         """
-        # compute new direction
-        self.speed = speed
-        self.next_position = path[0]
-        self.path = path[1:] if len(path) > 1 else []
-        self._position = position
-
-    def partial_movement(self, distance, position, next_position, path):
-        """Recursive function to calculate parial movements (to consider cases
-        in which during the given dt we are actually going over a the
-        destination point.
-
-        :param distance: The magnitude of the movement vector.
-        :type distance: float
-
-        :param position: The current position of the movable.
-        :type position: tuple
-
-        :param next_position: The next position in the path.
-        :type next_position: tuple
-
-        :param path: The other points of the path.
-        :type path: list
-        """
-        # Actual distance from destination
-        np = Vec(next_position[0], next_position[1], 0.0)
-        p = Vec(position[0], position[1], 0.0)
-        dst = (np - p).mag()
-
-        # We did not reach the next_position yet.
-        if distance < dst:
-            self._direction = np - p
-            self._direction.norm()
-            cur = p + self._direction * distance
-            self._position = cur.x, cur.y
-
-        # We arrived in next_position, continue toward the next waypoint of the
-        # path recursively calling partial_movement.
-        elif path:
-            position, next_position, path = next_position, path[0], path[1:]
-            LOG.debug('Switched destination to {}'.format(next_position))
-            self.partial_movement(
-                distance - dst, position, next_position, path)
-
-        # We reached or surpassed next_position and there are no more path
-        # steps: we arrived!
-        else:
-            LOG.debug('Movable arrived at destination {}'.format(self._position))
-            self.next_position = None
-            self._direction = None
-            self.path = []
-            self.speed = 0
-            self._position = next_position
-
-    def update(self, dt):
-        """Movable update function.
-
-        Computes the amount of movement to be done in the given dt time. The
-        movement is calculated using the speed and the direction of the
-        movement.
-
-        :param dt: The time spent since the last update call (in seconds).
-        :type dt: float
-        """
-        if self.next_position and self.speed:
-            distance = self.speed * dt
-            self.partial_movement(
-                distance, self._position, self.next_position, self.path)
+        self.system.move(self.slot, position, path, speed)
@@ -0,0 +1,97 @@
+"""Crowd animation.
+
+Actors playing the same animation clip share its poses: the time of each
+clip is quantized in a number of phase buckets, the pose of each bucket is
+evaluated once per frame and each actor renders the skin transforms of the
+bucket matching its own phase offset. The cost of the animations depends on
+the number of clips and buckets in use, no longer on the number of actors.
+"""
+from surrender import AnimationInstance
+import logging
+
+
+LOG = logging.getLogger(__name__)
+
+#: Default number of phase buckets of each clip
+PHASES = 8
+
+
+class CrowdAnimation:
+    """Shared animation poses, by clip and phase."""
+
+    def __init__(self, phases=PHASES):
+        """Constructor.
+
+        :param phases: The number of phase buckets of each clip
+        :type phases: int
+        """
+        self.phases = phases
+        #: The animation instances of each bucket, mapped by clip
+        self.clips = {}
+
+    def instance(self, animation, phase):
+        """Returns the shared instance of an animation clip in a phase.
+
+        The buckets of a clip are created the first time it is requested,
+        evenly spread along its duration.
+
+        :param animation: The animation clip
+        :type animation: :class:`surrender.Animation`
+
+        :param phase: The phase offset, in [0, 1)
+        :type phase: float
+
+        :returns: The animation instance
+        :rtype: :class:`surrender.AnimationInstance`
+        """
+        buckets = self.clips.get(animation)
+        if buckets is None:
+            LOG.debug('Adding clip {} to the crowd'.format(animation))
+            buckets = self.clips[animation] = []
+            for bucket in range(self.phases):
+                inst = AnimationInstance(animation)
+                inst.play(animation.duration * bucket / self.phases)
+                buckets.append(inst)
+        return buckets[int(phase * self.phases) % self.phases]
+
+    def play(self, dt):
+        """Advances the poses of all the clips.
+
+        :param dt: Time delta from last update.
+        :type dt: float
+        """
+        for buckets in self.clips.values():
+            for inst in buckets:
+                inst.play(dt)
+
+
+__CROWD = CrowdAnimation()
+
+
+def configure_crowd(config):
+    """Configures the crowd animation.
+
+    :param config: the game section of the config object
+    :type config: :class:`configparser.SectionProxy`
+    """
+    global __CROWD
+    __CROWD = CrowdAnimation(
+        max(config.getint('AnimationPhases', fallback=PHASES), 1))
+
+
+def crowd_animation():
+    """Returns the crowd animation of the game.
+
+    :returns: The crowd animation
+    :rtype: :class:`game.crowd.CrowdAnimation`
+    """
+    return __CROWD
+
+
+def update_crowd_animation(dt):
+    """Advances the animation poses shared by the actors.
+
+    :param dt: Time delta from last update.
+    :type dt: float
+    """
+    __CROWD.play(dt)
@@ -1,23 +1,24 @@
+from context import Context
 from enum import IntEnum
 from enum import unique
 from events import subscriber
 from game.components import Movable
+from game.crowd import crowd_animation
 from game.components import Renderable
 from game.entities.entity import Entity
 from game.entities.widgets.health_bar import HealthBar
 from game.events import ActorActionChange
-from game.events import ActorIdle
-from game.events import ActorMove
-from game.events import ActorStatusChange
+from game.events import ActorIdleBatch
+from game.events import ActorMoveBatch
+from game.events import ActorStatusChangeBatch
 from math import atan
 from math import copysign
 from math import pi
 from matlib import Vec
-from renderer.texture import Texture
 from renderer.scene import SceneNode
-from surrender import AnimationInstance
 from utils import to_scene
 import logging
+import random
 
 
 LOG = logging.getLogger(__name__)
@@ -68,13 +69,31 @@ class Actor(Entity):
     }
 
     def init_animations(self, mesh_data):
+        # NOTE: the clips are played by the crowd animation, which shares the
+        # poses between all the actors in the same phase.
         self.animations = {}
+        self.phase = random.random()
         for i in range(3):
             try:
-                self.animations[i] = AnimationInstance(mesh_data.animations[i])
+                self.animations[i] = mesh_data.animations[i]
             except IndexError:
                 self.animations[i] = None
 
+    def animation_instance(self, index):
+        """Returns the shared instance of an animation clip, in the phase of
+        the actor.
+
+        :param index: The index of the clip
+        :type index: int
+
+        :returns: The animation instance, None if there is no such clip
+        :rtype: :class:`surrender.AnimationInstance`
+        """
+        clip = self.animations[index]
+        if clip is None:
+            return None
+        return crowd_animation().instance(clip, self.phase)
+
     def __init__(self, resource, actor_type, health, parent_node):
         """Constructor.
 
@@ -87,6 +106,7 @@ class Actor(Entity):
         :param parent_node: The parent node in the scene graph
         :type parent_node: :class:`renderer.scene.SceneNode`
         """
+        self.resource = resource
         self.actor_type = actor_type
 
         # Health is going to be a property used to update only when necessary
@@ -102,13 +122,15 @@ class Actor(Entity):
 
         # instantiate animations
         self.init_animations(md)
-        self.current_anim = self.animations[action_anim_index(ActionType.idle)]
+        self.current_anim = self.animation_instance(
+            action_anim_index(ActionType.idle))
 
-        texture = Texture.from_image(resource['texture'])
+        self.texture = Context.get_instance().res_mgr.get_texture(
+            resource, 'texture')
 
         # shader params
         params = {
-            'tex': texture,
+            'tex': self.texture,
             'opacity': 1.0,
             'color_ambient': Vec(0, 0, 0, 1),
             'color_diffuse': Vec(0, 0, 0, 1),
@@ -136,7 +158,7 @@ class Actor(Entity):
             mesh,
             shader,
             params,
-            textures=[texture],
+            textures=[self.texture],
             enable_light=True,
             animation=self.current_anim)
 
@@ -151,6 +173,11 @@ class Actor(Entity):
 
         self.heading = 0.0
 
+        # Position and heading currently applied to the transforms (and to the
+        # bounding box in the spatial index)
+        self.placed_position = None
+        self.placed_heading = None
+
     @property
     def health(self):
         """Returns the health of the character as a tuple current/total.
@@ -234,8 +261,37 @@ class Actor(Entity):
         """Removes itself from the scene.
         """
         LOG.debug('Destroying character {}'.format(self.e_id))
+        self.retire()
+        self[Movable].destroy()
+        Context.get_instance().res_mgr.release_texture(self.texture)
+
+    def retire(self):
+        """Stops the actor and detaches it from the scene, to be reused.
+        """
+        self[Movable].position = (0.0, 0.0)
         node = self.group_node
-        node.parent.remove_child(node)
+        if node.parent:
+            node.parent.remove_child(node)
+
+    def reuse(self, actor_type, health, parent_node):
+        """Resets a retired actor and attaches it to the scene again.
+
+        :param actor_type: The actor type
+        :type actor_type: :enum:`game.entities.actor.ActorType`
+
+        :param health: The current amount of hp and the total one
+        :type health: :class:`tuple`
+
+        :param parent_node: The parent node in the scene graph
+        :type parent_node: :class:`renderer.scene.SceneNode`
+        """
+        self.actor_type = actor_type
+        self.health = health
+        self.heading = 0.0
+        self.placed_position = None
+        self.placed_heading = None
+        self.set_action(ActionType.idle)
+        parent_node.add_child(self.group_node)
 
     def set_action(self, action_type):
         """Sets current player action.
@@ -243,8 +299,21 @@ class Actor(Entity):
         :param action_type: Action to set.
         :type action_type: :class:`game.entities.actor.ActionType`
         """
-        anim = self.animations[action_anim_index(action_type)]
+        anim = self.animation_instance(action_anim_index(action_type))
         self[Renderable].animation = self.current_anim = anim
+        Context.get_instance().registry.wake(self)
+
+    def is_idle(self):
+        """The actor is idle when it is not moving nor turning and its health
+        bar is idle (animations are played by the crowd animation).
+        """
+        movable = self[Movable]
+        return (
+            not movable.speed and
+            movable.direction is None and
+            movable.position == self.placed_position and
+            self.heading == self.placed_heading and
+            self.health_bar.is_idle())
 
     def update(self, dt):
         """Update the character.
@@ -254,32 +323,35 @@ class Actor(Entity):
         :param dt: Time delta from last update.
         :type dt: float
         """
-        self[Movable].update(dt)
         x, y = self[Movable].position
 
-        # FIXME: I don't like the idea of saving the group node here. We need
-        # something better here.
-        g_t = self.group_node.transform
-        g_t.identity()
-        g_t.translate(to_scene(x, y))
-
-        rot, scale = self.TRANSFORMS[self.actor_type]
-        t = self[Renderable].transform
-        t.identity()
-        t *= self.transform
-        t.rotate(Vec(0, 1, 0), rot)  # FIXME
-        t.rotate(Vec(0, 1, 0), -self.heading)
-        t.scale(Vec(scale, scale, scale))
+        # Transforms are rebuilt only when the actor moves or turns
+        if (x, y) != self.placed_position:
+            self.placed_position = x, y
+            # FIXME: I don't like the idea of saving the group node here. We
+            # need something better here.
+            g_t = self.group_node.transform
+            g_t.identity()
+            g_t.translate(to_scene(x, y))
+
+            # Keep the spatial index in sync with the movements
+            Context.get_instance().registry.move(self)
+
+        if self.heading != self.placed_heading:
+            self.placed_heading = self.heading
+            rot, scale = self.TRANSFORMS[self.actor_type]
+            t = self[Renderable].transform
+            t.identity()
+            t *= self.transform
+            t.rotate(Vec(0, 1, 0), rot)  # FIXME
+            t.rotate(Vec(0, 1, 0), -self.heading)
+            t.scale(Vec(scale, scale, scale))
 
         self.orientate()
 
         # Update the health bar
         self.health_bar.update(dt)
 
-        # play animation
-        if self.current_anim:
-            self.current_anim.play(dt)
-
 
 def lookup_entity(evt):
     """Looks up the entity associated with given event.
@@ -287,10 +359,7 @@ def lookup_entity(evt):
     :param evt: Event object.
     :type evt: :class:`events.Event`
     """
-    context = evt.context
-    if evt.srv_id in context.server_entities_map:
-        e_id = context.server_entities_map[evt.srv_id]
-        return context.entities[e_id]
+    return evt.context.resolve_entity(evt.srv_id)
 
 
 @subscriber(ActorActionChange)
@@ -301,44 +370,49 @@ def actor_action_change(evt):
         actor.set_action(evt.new)
 
 
-@subscriber(ActorStatusChange)
+@subscriber(ActorStatusChangeBatch)
 def actor_health_change(evt):
-    """Updates the number of hp of the actor.
+    """Updates the number of hp of the actors.
+
+    :param evt: The event instance
+    :type evt: :class:`game.events.ActorStatusChangeBatch`
     """
     LOG.debug('Event subscriber: {}'.format(evt))
-    context = evt.context
-    if evt.srv_id in context.server_entities_map:
-        e_id = context.server_entities_map[evt.srv_id]
-        actor = context.entities[e_id]
-        actor.health = evt.new, actor.health[1]
+    resolve_entity = evt.context.resolve_entity
+    for srv_id, hp in zip(evt.srv_ids, evt.new):
+        actor = resolve_entity(srv_id)
+        if actor:
+            actor.health = hp, actor.health[1]
 
 
-@subscriber(ActorIdle)
+@subscriber(ActorIdleBatch)
 def actor_set_postition(evt):
-    """Updates the character position
-
-    Gets all the relevant data from the event.
+    """Updates the position of the idle actors.
 
     :param evt: The event instance
-    :type evt: :class:`game.events.ActorIdle`
+    :type evt: :class:`game.events.ActorIdleBatch`
     """
     LOG.debug('Event subscriber: {}'.format(evt))
-    actor = evt.context.resolve_entity(evt.srv_id)
-    if actor:
-        actor[Movable].position = evt.x, evt.y
+    resolve_entity = evt.context.resolve_entity
+    for srv_id, position in zip(evt.srv_ids, evt.positions):
+        actor = resolve_entity(srv_id)
+        if actor:
+            actor[Movable].position = position
+            evt.context.registry.wake(actor)
 
 
-@subscriber(ActorMove)
+@subscriber(ActorMoveBatch)
 def character_set_movement(evt):
-    """Set the move action in the actor.
+    """Set the move action in the actors.
 
     :param evt: The event instance
-    :type evt: :class:`game.events.ActorMove`
+    :type evt: :class:`game.events.ActorMoveBatch`
     """
     LOG.debug('Event subscriber: {}'.format(evt))
-    actor = evt.context.resolve_entity(evt.srv_id)
-    if actor and evt.path:
-        actor[Movable].move(
-            position=evt.position,
-            path=evt.path,
-            speed=evt.speed)
+    resolve_entity = evt.context.resolve_entity
+    for srv_id, position, path, speed in zip(
+            evt.srv_ids, evt.positions, evt.paths, evt.speeds):
+        actor = resolve_entity(srv_id)
+        if actor and path:
+            actor[Movable].move(position=position, path=path, speed=speed)
+            evt.context.registry.wake(actor)
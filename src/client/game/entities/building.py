@@ -1,3 +1,5 @@
+from context import Context
+from context import EntityKind
 from enum import IntEnum
 from enum import unique
 from events import subscriber
@@ -8,12 +10,13 @@ from game.events import BuildingDisappear
 from game.events import BuildingSpawn
 from game.events import BuildingStatusChange
 from game.events import EntityPick
+from game.pool import entity_pool
+from game.pool import release_entity
 from matlib import Vec
 from network.message import Message
 from network.message import MessageField as MF
 from network.message import MessageType
 from renderer.scene import SceneNode
-from renderer.texture import Texture
 from utils import to_scene
 import logging
 
@@ -49,6 +52,7 @@ class Building(Entity):
         :param parent_node: The parent node in the scene graph
         :type parent_node: :class:`renderer.scene.SceneNode`
         """
+        self.resource = resource
         self._position = position
         # Progress is going to be a property used to update only when necessary
         # the health bar.
@@ -56,30 +60,32 @@ class Building(Entity):
         self.completed = completed
 
         shader = resource['shader']
-        texture = Texture.from_image(resource['texture'])
+        self.texture = Context.get_instance().res_mgr.get_texture(
+            resource, 'texture')
         self.mesh_project = resource['model_project']
         self.mesh_complete = resource['model_complete']
 
         # Setup the group node and add the health bar
-        group_node = SceneNode()
-        g_transform = group_node.transform
+        self.group_node = SceneNode()
+        g_transform = self.group_node.transform
         g_transform.translate(to_scene(*position))
-        parent_node.add_child(group_node)
+        parent_node.add_child(self.group_node)
 
         self.health_bar = HealthBar(
-            resource['health_bar'], progress[0] / progress[1], group_node)
+            resource['health_bar'], progress[0] / progress[1],
+            self.group_node)
 
         params = {
-            'tex': texture,
+            'tex': self.texture,
         }
 
         # create components
         renderable = Renderable(
-            group_node,
+            self.group_node,
             self.mesh,
             shader,
             params,
-            textures=[texture],
+            textures=[self.texture],
             enable_light=True)
 
         # initialize entity
@@ -148,12 +154,49 @@ class Building(Entity):
         """Removes itself from the scene.
         """
         LOG.debug('Destroying building {}'.format(self.e_id))
+        self.retire()
+        Context.get_instance().res_mgr.release_texture(self.texture)
 
-        # Destroys the health bar first.
-        self.health_bar.destroy()
+    def retire(self):
+        """Detaches the building, along with its health bar, from the scene,
+        to be reused.
+        """
+        node = self.group_node
+        if node.parent:
+            node.parent.remove_child(node)
 
-        node = self[Renderable].node
-        node.parent.remove_child(node)
+    def reuse(self, position, progress, completed, parent_node):
+        """Resets a retired building and attaches it to the scene again.
+
+        :param position: The position of the building
+        :type position: :class:`tuple`
+
+        :param progress: The current amount of hp and the total one
+        :type progress: :class:`tuple`
+
+        :param completed: Whether the building is completed or not
+        :type completed: :class:`bool`
+
+        :param parent_node: The parent node in the scene graph
+        :type parent_node: :class:`renderer.scene.SceneNode`
+        """
+        self._position = position
+        self.progress = progress
+        self.completed = completed
+        self[Renderable].node.mesh = self.mesh
+
+        g_transform = self.group_node.transform
+        g_transform.identity()
+        g_transform.translate(to_scene(*position))
+        parent_node.add_child(self.group_node)
+
+    def is_idle(self):
+        """The building is idle when its mesh and health bar are up to date,
+        until its status changes.
+        """
+        return (
+            self[Renderable].node.mesh is self.mesh and
+            self.health_bar.is_idle())
 
     def update(self, dt):
         """Updates the building.
@@ -170,6 +213,45 @@ class Building(Entity):
         self.health_bar.update(dt)
 
 
+def building_resource(context, b_type):
+    """Returns the resource of the given type of building.
+
+    :param context: The game context
+    :type context: :class:`context.Context`
+
+    :param b_type: The building type
+    :type b_type: :enum:`game.entities.building.BuildingType`
+
+    :returns: The building resource
+    :rtype: :class:`loaders.Resource`
+    """
+    # Search for the proper resource to use basing on the building_type.
+    # FIXME: right now it defaults on mg_turret.
+    entities = context.res_mgr.get('/entities')
+    return context.res_mgr.get(
+        entities.data['buildings_map'].get(
+            BuildingType(b_type).name,
+            '/prefabs/buildings/barricade'
+        )
+    )
+
+
+def prewarm_buildings(context, count):
+    """Builds in advance the given number of buildings of each type.
+
+    :param context: The game context
+    :type context: :class:`context.Context`
+
+    :param count: The number of buildings of each type
+    :type count: int
+    """
+    for b_type in BuildingType:
+        resource = building_resource(context, b_type)
+        tot = resource.data['tot_hp']
+        entity_pool(Building, resource).prewarm(
+            count, (0, 0), (0, tot), False, context.scene.root)
+
+
 @subscriber(BuildingSpawn)
 def building_spawn(evt):
     """Creates a building.
@@ -183,23 +265,12 @@ def building_spawn(evt):
     entity_exists = context.resolve_entity(evt.srv_id)
 
     if not entity_exists:
-        # Search for the proper resource to use basing on the building_type.
-        # FIXME: right now it defaults on mg_turret.
-        entities = context.res_mgr.get('/entities')
-        resource = context.res_mgr.get(
-            entities.data['buildings_map'].get(
-                BuildingType(evt.b_type).name,
-                '/prefabs/buildings/barricade'
-            )
-        )
-
+        resource = building_resource(context, evt.b_type)
         tot = resource.data['tot_hp']
-        # Create the building
-        building = Building(
-            resource, evt.pos, (evt.cur_hp, tot), evt.completed,
-            context.scene.root)
-        context.entities[building.e_id] = building
-        context.server_entities_map[evt.srv_id] = building.e_id
+        # Create the building, reusing a pooled one if available
+        building = entity_pool(Building, resource).acquire(
+            evt.pos, (evt.cur_hp, tot), evt.completed, context.scene.root)
+        context.registry.add(building, evt.srv_id, EntityKind.building)
 
 
 @subscriber(BuildingDisappear)
@@ -208,10 +279,9 @@ def building_disappear(evt):
     """
     LOG.debug('Event subscriber: {}'.format(evt))
     context = evt.context
-    if evt.srv_id in context.server_entities_map:
-        e_id = context.server_entities_map.pop(evt.srv_id)
-        building = context.entities.pop(e_id)
-        building.destroy()
+    building = context.registry.remove_server(evt.srv_id)
+    if building:
+        release_entity(building)
 
 
 @subscriber(BuildingStatusChange)
@@ -220,11 +290,11 @@ def building_health_change(evt):
     """
     LOG.debug('Event subscriber: {}'.format(evt))
     context = evt.context
-    if evt.srv_id in context.server_entities_map:
-        e_id = context.server_entities_map[evt.srv_id]
-        building = context.entities[e_id]
+    building = context.resolve_entity(evt.srv_id)
+    if building:
         building.progress = evt.new, building.progress[1]
         building.completed = evt.completed
+        context.registry.wake(building)
 
 
 @subscriber(EntityPick)
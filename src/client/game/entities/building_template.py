@@ -129,7 +129,7 @@ def show_building_template(evt):
 
         context.building_type = building_type
         context.building_template = building_template
-        context.entities[building_template.e_id] = building_template
+        context.registry.add(building_template)
         x, y = context.input_mgr.mouse_position
         place_building_template(context, x, y)
 
@@ -137,7 +137,7 @@ def show_building_template(evt):
         # Reset the building-mode related context while exiting building mode
         context.building_type = 0
         bt, context.building_template = context.building_template, None
-        del context.entities[bt.e_id]
+        context.registry.remove(bt.e_id)
         bt.destroy()
 
 
@@ -1,4 +1,5 @@
 from context import Context
+from context import EntityKind
 from events import subscriber
 from game.entities.actor import Actor
 from game.entities.actor import ActorType
@@ -8,11 +9,13 @@ from game.events import ActorStatusChange
 from game.events import CharacterBuildingStart
 from game.events import CharacterBuildingStop
 from game.events import CharacterJoin
+from game.pool import entity_pool
+from game.pool import release_entity
 from matlib import Vec
 from renderer.font import Font
+from renderer.scene import Billboard
 from renderer.text import TextNode
 import logging
-import math
 
 
 LOG = logging.getLogger(__name__)
@@ -46,14 +49,9 @@ class Label:
             self.color))
 
         self.ratio = context.ratio
-        text_w = self.node.width
-        self.translation = Vec(-text_w * context.ratio * 0.5, 3.5, 0)
-        self.scale = Vec(context.ratio, context.ratio, context.ratio)
-
-        t = self.node.transform
-        t.translate(self.translation)
-        t.rotate(Vec(1, 0, 0), math.pi / 2)
-        t.scale(self.scale)
+        # The label is turned toward the camera when rendered
+        self.node.billboard = Billboard(None)
+        self.text = name
 
     @property
     def text(self):
@@ -76,32 +74,11 @@ class Label:
         self.node.text = text
 
         text_w = self.node.width
-        self.translation = Vec(-text_w * self.ratio * 0.5, 3.5, 0)
-        self.scale = Vec(self.ratio, self.ratio, self.ratio)
-
-        t = self.node.transform
-        t.identity()
-        t.translate(self.translation)
-        t.rotate(Vec(1, 0, 0), math.pi / 2)
-        t.scale(self.scale)
-
-    def update(self):
-        """Update the rotation of the label to always be pointing to the camera.
-        """
-        context = Context.get_instance()
-        c_pos = context.camera.position
-        direction = Vec(c_pos.x, c_pos.y, c_pos.z, 1)
-        direction.norm()
-        z_axis = Vec(0, 0, 1)
-
-        # Find the angle between the camera and the health bar, then rotate it.
-        # NOTE: also scaling and tranlsation are applied here.
-        angle = math.acos(z_axis.dot(direction))
-        t = self.node.transform
-        t.identity()
-        t.translate(self.translation)
-        t.rotate(Vec(1, 0, 0), angle)
-        t.scale(self.scale)
+        billboard = self.node.billboard
+        billboard.translation = Vec(-text_w * self.ratio * 0.5, 3.5, 0)
+        billboard.scale = Vec(self.ratio, self.ratio, self.ratio)
+        # NOTE: rebuild the transform at the next render
+        billboard.angle = None
 
 
 class Character(Actor):
@@ -126,6 +103,24 @@ class Character(Actor):
         self._name = name
         # self.name_node = Label(resource, name, self.group_node)
 
+    def reuse(self, actor_type, name, health, parent_node):
+        """Resets a retired character and attaches it to the scene again.
+
+        :param actor_type: The actor type
+        :type actor_type: :enum:`game.entities.actor.ActorType`
+
+        :param name: The character name
+        :type name: :class:`str`
+
+        :param health: The current amount of hp and the total one
+        :type health: :class:`tuple`
+
+        :param parent_node: The parent node in the scene graph
+        :type parent_node: :class:`renderer.scene.SceneNode`
+        """
+        self.name = name
+        super().reuse(actor_type, health, parent_node)
+
     @property
     def name(self):
         return self._name
@@ -174,10 +169,9 @@ def character_spawn(evt):
         # Search for the character name
         name = context.players_name_map[evt.srv_id]
         # Create the character
-        character = Character(
-            resource, evt.actor_type, name, (evt.cur_hp, tot), context.scene.root)
-        context.entities[character.e_id] = character
-        context.server_entities_map[evt.srv_id] = character.e_id
+        character = entity_pool(Character, resource).acquire(
+            evt.actor_type, name, (evt.cur_hp, tot), context.scene.root)
+        context.registry.add(character, evt.srv_id, EntityKind.actor)
 
 
 @subscriber(ActorDisappear)
@@ -193,9 +187,8 @@ def character_disappear(evt):
     context = evt.context
     is_character = evt.actor_type in Character.MEMBERS
     if evt.srv_id in context.server_entities_map and is_character:
-        e_id = context.server_entities_map.pop(evt.srv_id)
-        character = context.entities.pop(e_id)
-        character.destroy()
+        character = context.registry.remove_server(evt.srv_id)
+        release_entity(character)
 
 
 @subscriber(ActorDisappear)
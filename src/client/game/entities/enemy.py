@@ -1,3 +1,4 @@
+from context import EntityKind
 from events import subscriber
 from game.entities.actor import ActionType
 from game.entities.actor import Actor
@@ -6,6 +7,8 @@ from game.events import ActorDisappear
 from game.events import ActorSpawn
 from game.events import ActorStatusChange
 from game.events import EntityPick
+from game.pool import entity_pool
+from game.pool import release_entity
 from network.message import Message
 from network.message import MessageField as MF
 from network.message import MessageType
@@ -21,6 +24,43 @@ class Enemy(Actor):
     MEMBERS = {ActorType.zombie}
 
 
+def enemy_resource(context, actor_type):
+    """Returns the resource of the given type of enemy.
+
+    :param context: The game context
+    :type context: :class:`context.Context`
+
+    :param actor_type: The actor type
+    :type actor_type: :enum:`game.entities.actor.ActorType`
+
+    :returns: The enemy resource
+    :rtype: :class:`loaders.Resource`
+    """
+    entities = context.res_mgr.get('/entities')
+    return context.res_mgr.get(
+        entities.data['entities_map'].get(
+            ActorType(actor_type).name,
+            '/enemies/zombie'
+        )
+    )
+
+
+def prewarm_enemies(context, count):
+    """Builds in advance the given number of enemies of each type.
+
+    :param context: The game context
+    :type context: :class:`context.Context`
+
+    :param count: The number of enemies of each type
+    :type count: int
+    """
+    for actor_type in Enemy.MEMBERS:
+        resource = enemy_resource(context, actor_type)
+        tot = resource.data['tot_hp']
+        entity_pool(Enemy, resource).prewarm(
+            count, actor_type, (tot, tot), context.scene.root)
+
+
 @subscriber(ActorSpawn)
 def enemy_spawn(evt):
     """Add a enemy in the game.
@@ -37,21 +77,14 @@ def enemy_spawn(evt):
     entity_exists = context.resolve_entity(evt.srv_id)
 
     if not entity_exists and evt.actor_type in Enemy.MEMBERS:
-        entities = context.res_mgr.get('/entities')
-        resource = context.res_mgr.get(
-            entities.data['entities_map'].get(
-                ActorType(evt.actor_type).name,
-                '/enemies/zombie'
-            )
-        )
-
+        resource = enemy_resource(context, evt.actor_type)
         tot = resource.data['tot_hp']
 
-        # Create the character
-        character = Enemy(resource, evt.actor_type, (evt.cur_hp, tot), context.scene.root)
+        # Create the character, reusing a pooled one if available
+        character = entity_pool(Enemy, resource).acquire(
+            evt.actor_type, (evt.cur_hp, tot), context.scene.root)
         character.set_action(ActionType.move)
-        context.entities[character.e_id] = character
-        context.server_entities_map[evt.srv_id] = character.e_id
+        context.registry.add(character, evt.srv_id, EntityKind.actor)
 
 
 @subscriber(ActorDisappear)
@@ -67,9 +100,8 @@ def enemy_disappear(evt):
     context = evt.context
     is_zombie = evt.actor_type in Enemy.MEMBERS
     if evt.srv_id in context.server_entities_map and is_zombie:
-        e_id = context.server_entities_map.pop(evt.srv_id)
-        character = context.entities.pop(e_id)
-        character.destroy()
+        character = context.registry.remove_server(evt.srv_id)
+        release_entity(character)
 
 
 @subscriber(ActorDisappear)
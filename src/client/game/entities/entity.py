@@ -33,6 +33,17 @@ class Entity(ABC):
         """
         return self._components[key]
 
+    def is_idle(self):
+        """Whether the entity has nothing to update until something changes.
+
+        Idle entities are put to sleep by the update scheduler, until they are
+        woken up.
+
+        :returns: Whether the entity is idle
+        :rtype: bool
+        """
+        return False
+
     @abstractmethod
     def update(self, dt):
         """Update function.
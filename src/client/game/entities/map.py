@@ -1,8 +1,8 @@
+from context import Context
 from game.components import Renderable
 from game.entities.entity import Entity
 from game.entities.map_object import MapObject
 from matlib import Vec
-from renderer.texture import Texture
 
 
 class Map(Entity):
@@ -19,7 +19,8 @@ class Map(Entity):
         """
         shader = resource['shader']
         mesh = resource['walls_mesh']
-        texture = Texture.from_image(resource['walls_texture'])
+        texture = Context.get_instance().res_mgr.get_texture(
+            resource, 'walls_texture')
         # shader params
         params = {
             'tex': texture,
@@ -61,3 +62,7 @@ class Map(Entity):
     def update(self, dt):
         # NOTE: nothing to do
         pass
+
+    def is_idle(self):
+        # NOTE: static entity
+        return True
@@ -1,3 +1,5 @@
+from context import Context
+from context import EntityKind
 from enum import IntEnum
 from enum import unique
 from events import subscriber
@@ -10,7 +12,6 @@ from matlib import Vec
 from network.message import Message
 from network.message import MessageField as MF
 from network.message import MessageType
-from renderer.texture import Texture
 from utils import to_scene
 import logging
 
@@ -44,7 +45,8 @@ class MapObject(Entity):
         """
         mesh = resource['model']
         shader = resource['shader']
-        texture = Texture.from_image(resource['texture'])
+        texture = Context.get_instance().res_mgr.get_texture(
+            resource, 'texture')
 
         # shader params
         params = {
@@ -81,6 +83,10 @@ class MapObject(Entity):
         # NOTE: nothing to do
         pass
 
+    def is_idle(self):
+        # NOTE: static entity
+        return True
+
     @property
     def bounding_box(self):
         l, m = self._bounding_box
@@ -115,8 +121,7 @@ def object_spawn(evt):
     map_obj = MapObject(obj_res, obj_data, level[Renderable].node)
     level.add_object(map_obj)
 
-    context.entities[map_obj.e_id] = map_obj
-    context.server_entities_map[evt.srv_id] = map_obj.e_id
+    context.registry.add(map_obj, evt.srv_id, EntityKind.map_object)
     # TODO: handle operated objects
 
 
@@ -1,8 +1,10 @@
 from context import Context
+from context import EntityKind
 from events import subscriber
 from game.entities.actor import ActorType
 from game.entities.character import Character
 from game.events import ActorSpawn
+from game.pool import entity_pool
 from utils import to_scene
 import logging
 
@@ -13,6 +15,9 @@ LOG = logging.getLogger(__name__)
 class Player(Character):
     """Game entity representing the local player"""
 
+    #: The position the camera is centered on
+    camera_position = None
+
     def update(self, dt):
         """Update the local player.
 
@@ -27,8 +32,10 @@ class Player(Character):
         x, y = self.position
 
         # update camera position
-        context = Context.get_instance()
-        context.camera.set_position(to_scene(x, y))
+        if (x, y) != self.camera_position:
+            self.camera_position = x, y
+            context = Context.get_instance()
+            context.camera.set_position(to_scene(x, y))
 
 
 @subscriber(ActorSpawn)
@@ -65,9 +72,9 @@ def player_spawn(evt):
         # Search for the player name
         name = context.character_name
         # Create the player
-        player = Player(resource, evt.actor_type, name, (evt.cur_hp, tot), context.scene.root)
-        context.entities[player.e_id] = player
-        context.server_entities_map[evt.srv_id] = player.e_id
+        player = entity_pool(Player, resource).acquire(
+            evt.actor_type, name, (evt.cur_hp, tot), context.scene.root)
+        context.registry.add(player, evt.srv_id, EntityKind.actor)
 
 
 @subscriber(ActorSpawn)
@@ -1,7 +1,7 @@
+from context import Context
 from game.components import Renderable
 from game.entities.entity import Entity
 from matlib import Vec
-from renderer.texture import Texture
 
 
 class Terrain(Entity):
@@ -18,7 +18,8 @@ class Terrain(Entity):
         """
         shader = resource['shader']
         mesh = resource['floor_mesh']
-        texture = Texture.from_image(resource['floor_texture'])
+        texture = Context.get_instance().res_mgr.get_texture(
+            resource, 'floor_texture')
         # shader params
         params = {
             'tex': texture,
@@ -41,3 +42,7 @@ class Terrain(Entity):
     def update(self, dt):
         # NOTE: nothing to do here
         pass
+
+    def is_idle(self):
+        # NOTE: static entity
+        return True
@@ -1,11 +1,9 @@
-from context import Context
 from game.components import Renderable
 from game.entities.entity import Entity
-from math import pi
 from matlib import Vec
 from renderer.mesh import Rect
+from renderer.scene import Billboard
 import logging
-import math
 
 
 LOG = logging.getLogger(__name__)
@@ -57,9 +55,9 @@ class HealthBar(Entity):
             params,
             enable_light=False)
 
-        t = renderable.transform
-        t.translate(Vec(-self.w / 2, self.y_offset, 0))
-        t.rotate(Vec(1, 0, 0), pi / 2)
+        # The health bar is turned toward the camera when rendered
+        renderable.node.billboard = Billboard(
+            Vec(-self.w / 2, self.y_offset, 0))
 
         super().__init__(renderable)
 
@@ -89,21 +87,14 @@ class HealthBar(Entity):
         node = self[Renderable].node
         node.parent.remove_child(node)
 
+    def is_idle(self):
+        """The health bar is turned toward the camera when rendered."""
+        return True
+
     def update(self, dt):
         """Updates the health bar.
 
         :param dt: Time delta from last update.
         :type dt: float
         """
-        context = Context.get_instance()
-        c_pos = context.camera.position
-        direction = Vec(c_pos.x, c_pos.y, c_pos.z, 1)
-        direction.norm()
-        z_axis = Vec(0, 0, 1)
-
-        # Find the angle between the camera and the health bar, then rotate it.
-        angle = math.acos(z_axis.dot(direction))
-        t = self[Renderable].transform
-        t.identity()
-        t.translate(Vec(-self.w / 2, self.y_offset, 0))
-        t.rotate(Vec(1, 0, 0), angle)
+        pass
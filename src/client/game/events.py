@@ -1,3 +1,4 @@
+from events import BatchEvent
 from events import Event
 
 
@@ -334,3 +335,103 @@ class ObjectSpawn(Event):
     def __str__(self):
         return '<ObjectSpawn({}, {}, {}, {})>'.format(
             self.srv_id, self.obj_type, self.pos, self.operated_by)
+
+
+class ActorStatusChangeBatch(BatchEvent):
+    """Many actors status changed.
+
+    Batch of :class:`ActorStatusChange` events.
+    """
+
+    item_event = ActorStatusChange
+
+    def __init__(self, srv_ids, actor_types, old, new):
+        """Constructor.
+
+        :param srv_ids: The server ids of the actors.
+        :type srv_ids: list
+
+        :param actor_types: The types of the actors.
+        :type actor_types: list
+
+        :param old: The old amounts of hp.
+        :type old: list
+
+        :param new: The new amounts of hp.
+        :type new: list
+        """
+        self.srv_ids = srv_ids
+        self.actor_types = actor_types
+        self.old = old
+        self.new = new
+
+    def items(self):
+        for args in zip(self.srv_ids, self.actor_types, self.old, self.new):
+            yield ActorStatusChange(*args)
+
+    def __str__(self):
+        return '<ActorStatusChangeBatch({})>'.format(len(self))
+
+
+class ActorIdleBatch(BatchEvent):
+    """Many actors are idle.
+
+    Batch of :class:`ActorIdle` events.
+    """
+
+    item_event = ActorIdle
+
+    def __init__(self, srv_ids, positions):
+        """Constructor.
+
+        :param srv_ids: The server ids of the actors.
+        :type srv_ids: list
+
+        :param positions: The positions of the actors.
+        :type positions: list
+        """
+        self.srv_ids = srv_ids
+        self.positions = positions
+
+    def items(self):
+        for srv_id, (x, y) in zip(self.srv_ids, self.positions):
+            yield ActorIdle(srv_id, x, y)
+
+    def __str__(self):
+        return '<ActorIdleBatch({})>'.format(len(self))
+
+
+class ActorMoveBatch(BatchEvent):
+    """Many actors received a move action.
+
+    Batch of :class:`ActorMove` events.
+    """
+
+    item_event = ActorMove
+
+    def __init__(self, srv_ids, positions, paths, speeds):
+        """Constructor.
+
+        :param srv_ids: The server ids of the actors.
+        :type srv_ids: list
+
+        :param positions: The current positions.
+        :type positions: list
+
+        :param paths: The movement paths.
+        :type paths: list
+
+        :param speeds: The speeds in game unit / seconds.
+        :type speeds: list
+        """
+        self.srv_ids = srv_ids
+        self.positions = positions
+        self.paths = paths
+        self.speeds = speeds
+
+    def items(self):
+        for args in zip(self.srv_ids, self.positions, self.paths, self.speeds):
+            yield ActorMove(*args)
+
+    def __str__(self):
+        return '<ActorMoveBatch({})>'.format(len(self))
@@ -1,13 +1,14 @@
+from collections import OrderedDict
 from events import send_event
+from game.changeset import Changeset
 from game.entities.actor import ActorType
-from game.entities.actor import ActionType
 from game.entities.building import BuildingType
 from game.events import ActorActionChange
 from game.events import ActorDisappear
-from game.events import ActorIdle
-from game.events import ActorMove
+from game.events import ActorIdleBatch
+from game.events import ActorMoveBatch
 from game.events import ActorSpawn
-from game.events import ActorStatusChange
+from game.events import ActorStatusChangeBatch
 from game.events import BuildingDisappear
 from game.events import BuildingSpawn
 from game.events import BuildingStatusChange
@@ -15,6 +16,7 @@ from game.events import CharacterBuildingStart
 from game.events import CharacterBuildingStop
 from game.events import ObjectSpawn
 from game.events import TimeUpdate
+from game.vectorized import VectorizedChangeset
 from network import MessageField as MF
 import logging
 
@@ -22,32 +24,76 @@ import logging
 LOG = logging.getLogger(__name__)
 
 
+def interpolate(old, new, alpha):
+    """Interpolates the positions of the entities between two gamestates.
+
+    Values of alpha greater than 1 extrapolate the positions. Entities which
+    are not in the old gamestate are placed in their new position.
+
+    :param old: The old gamestate
+    :type old: :class:`game.snapshot.Snapshot`
+
+    :param new: The new gamestate
+    :type new: :class:`game.snapshot.Snapshot`
+
+    :param alpha: The interpolation factor
+    :type alpha: float
+
+    :returns: The positions, mapped by server id
+    :rtype: dict
+    """
+    old_entities = old.entities
+    positions = {}
+    for srv_id, entity in new.entities.items():
+        prev = old_entities.get(srv_id)
+        if prev is None:
+            positions[srv_id] = entity.x, entity.y
+        else:
+            positions[srv_id] = (
+                prev.x + (entity.x - prev.x) * alpha,
+                prev.y + (entity.y - prev.y) * alpha)
+    return positions
+
+
 class GameStateManager:
     """Game state manager.
 
     Instances of this objects are meant to handle a configurable ring buffer of
     game states.
+
+    The buffered gamestates are also used as a jitter buffer: entity positions
+    can be sampled at any time covered by the buffer, interpolating between
+    the gamestates around it.
     """
 
-    def __init__(self, size):
+    def __init__(self, size, max_extrapolation=0):
         """Constructur.
 
         :param size: the size of the ring buffer
         :type size: int
+
+        :param max_extrapolation: the maximum time (in milliseconds) positions
+            are extrapolated beyond the last gamestate
+        :type max_extrapolation: int
         """
         self.size = size
+        self.max_extrapolation = max_extrapolation
         # NOTE: -1 means that the buffer is empty. This should only happen
         # during initialization
         self.cur = -1
+        self.count = 0
         self.gamestate_buf = [None for x in range(size)]
+        # Data reused by the consecutive gamestate diffs
+        self.diff_cache = {}
 
     def push(self, gamestate):
         """Push a new gamestate into the ring bffer.
 
         :param gamestate: The gamestate to be pushed.
-        :type gamestate: dict
+        :type gamestate: :class:`game.snapshot.Snapshot`
         """
         self.cur = (self.cur + 1) % self.size
+        self.count = min(self.count + 1, self.size)
         self.gamestate_buf[self.cur] = gamestate
 
     def get(self, n=1):
@@ -67,304 +113,300 @@ class GameStateManager:
             for i in range(self.cur, self.cur - n, -1)
         ]
 
+    def positions(self, t):
+        """Samples the positions of the entities at the given time.
+
+        NOTE: gamestates are expected to be pushed in timestamp order.
+
+        :param t: The timestamp (in milliseconds)
+        :type t: int
+
+        :returns: The positions, mapped by server id
+        :rtype: dict
+        """
+        if not self.count:
+            return {}
+
+        # Gamestates from the newest to the oldest
+        gamestates = self.get(self.count)
+        newest = gamestates[0]
+        if len(gamestates) == 1:
+            return interpolate(newest, newest, 0.0)
+
+        if t >= newest.tstamp:
+            # Packets are late: extrapolate from the last two gamestates
+            prev = gamestates[1]
+            span = newest.tstamp - prev.tstamp
+            ahead = min(t - newest.tstamp, self.max_extrapolation)
+            alpha = (1.0 + ahead / span) if span else 1.0
+            return interpolate(prev, newest, alpha)
+
+        for new, old in zip(gamestates, gamestates[1:]):
+            if old.tstamp <= t:
+                span = new.tstamp - old.tstamp
+                alpha = (t - old.tstamp) / span if span else 1.0
+                return interpolate(old, new, alpha)
+
+        # Earlier than the whole buffer
+        oldest = gamestates[-1]
+        return interpolate(oldest, oldest, 0.0)
+
+
+#: Available implementations of the gamestate diff
+DIFF_BACKENDS = {
+    'python': Changeset,
+    'numpy': VectorizedChangeset,
+}
+
+#: Default number of buffered gamestates
+BUFFER_SIZE = 2
+
+#: Default maximum extrapolation time (in milliseconds)
+MAX_EXTRAPOLATION = 100
+
+__MANAGER = GameStateManager(BUFFER_SIZE)
+__PROCESSORS = OrderedDict()
+__CHANGESET = Changeset
+
+
+def configure_gamestate(config):
+    """Configures the gamestate processing.
+
+    :param config: the game section of the config object
+    :type config: :class:`configparser.SectionProxy`
+    """
+    global __MANAGER
+    __MANAGER = GameStateManager(
+        max(config.getint('GameStateBuffer', fallback=BUFFER_SIZE), 2),
+        config.getint('MaxExtrapolation', fallback=MAX_EXTRAPOLATION))
+    set_diff_backend(config.get('DiffBackend', fallback='python'))
+
+
+def entity_positions(t):
+    """Samples the positions of the entities at the given time.
 
-__MANAGER = GameStateManager(2)
-__PROCESSORS = []
+    :param t: The timestamp (in milliseconds, local time)
+    :type t: int
+
+    :returns: The positions, mapped by server id
+    :rtype: dict
+    """
+    return __MANAGER.positions(t)
+
+
+def set_diff_backend(name):
+    """Selects the implementation of the gamestate diff.
+
+    :param name: The name of the backend (see `DIFF_BACKENDS`)
+    :type name: str
+    """
+    global __CHANGESET
+    LOG.info('Using the {} gamestate diff backend'.format(name))
+    __CHANGESET = DIFF_BACKENDS[name]
 
 
-def processor(f):
+def processor(changes):
     """Decorator for gamestate processors.
+
+    The processor is called with the given slice of the changeset, only when
+    the slice is not empty.
+
+    :param changes: The name of the slice of :class:`game.changeset.Changeset`
+    :type changes: str
     """
-    __PROCESSORS.append(f)
-    return f
+    def wrap(f):
+        __PROCESSORS.setdefault(changes, []).append(f)
+        return f
+    return wrap
 
 
 def process_gamestate(gamestate):
     """Director of all the gamestate handlers.
 
-    Pushes the gamestate in the global gamestate manager and calls every
-    processor passing the gamestate manager as parameter.
+    Pushes the gamestate in the global gamestate manager, computes the changes
+    with the previous gamestate and calls every processor passing the slice of
+    changes it subscribed to.
 
     :param gamestate: The current gamestate
-    :type gamestate: dict
+    :type gamestate: :class:`game.snapshot.Snapshot`
     """
     __MANAGER.push(gamestate)
-    for proc in __PROCESSORS:
-        proc(__MANAGER)
+    changeset = __CHANGESET.diff(*__MANAGER.get(2), __MANAGER.diff_cache)
+    for name, processors in __PROCESSORS.items():
+        changes = getattr(changeset, name)
+        if changes:
+            for proc in processors:
+                proc(changes)
 
 
-def gamestate_entities(gs_mgr):
-    """Returns the entities available in the gamestate.
+@processor('spawned')
+def handle_actor_spawn(spawned):
+    """Sends the appropriate events for the new entities.
 
-    :param gs_mgr: the gamestate manager.
-    :type gs_mgr: :class:`game.gamestate.GameStateManager`
-
-    :returns: server id, entity
-    :rtype: tuple
+    :param spawned: The new entities
+    :type spawned: list
     """
-    gamestate = gs_mgr.get()[0]
-    for srv_id, e in gamestate.get(MF.entities, {}).items():
-        yield srv_id, e
-
+    for entity in spawned:
+        actor_type = ActorType(entity.entity_type)
+        send_event(ActorSpawn(entity.srv_id, actor_type, entity.cur_hp))
 
-@processor
-def handle_actor_spawn(gs_mgr):
-    """Check for new entities and send the appropriate events.
 
-    Check if there are new entities that were not in the previous gamestate.
+@processor('disappeared')
+def handle_actor_disappear(disappeared):
+    """Sends the appropriate events for the disappeared entities.
 
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: dict
+    :param disappeared: The disappeared entities
+    :type disappeared: list
     """
-    n, o = gs_mgr.get(2)
-    o = o or {}
-    new, old = n[MF.entities], o.get(MF.entities, {})
-    new_entities = set(new) - set(old)
-    for ent in new_entities:
-        data = new[ent]
-        actor_type = ActorType(data[MF.entity_type])
-        cur_hp = data[MF.cur_hp]
-        evt = ActorSpawn(ent, actor_type, cur_hp)
-        send_event(evt)
-
+    for entity in disappeared:
+        send_event(ActorDisappear(entity.srv_id, entity.entity_type))
 
-@processor
-def handle_actor_disappear(gs_mgr):
-    """Check for disappeared entities and send the appropriate events.
 
-    Check if there are new entities that were not in the previous gamestate.
+@processor('action_changed')
+def handle_actor_action_change(action_changed):
+    """Sends the appropriate events for the entities which changed action.
 
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: dict
+    :param action_changed: The old and new records of the entities
+    :type action_changed: list
     """
-    n, o = gs_mgr.get(2)
-    o = o or {}
-    new, old = n[MF.entities], o.get(MF.entities, {})
-    old_entities = set(old) - set(new)
-    for ent in old_entities:
-        evt = ActorDisappear(ent, old[ent][MF.entity_type])
-        send_event(evt)
+    for old, new in action_changed:
+        send_event(ActorActionChange(
+            old.srv_id,
+            ActorType(old.entity_type),
+            old.action_type,
+            new.action_type))
+
 
+@processor('idle')
+def handle_actor_idle(idle):
+    """Handles entities in idle state and fires ActorIdleBatch event for them.
 
-@processor
-def handle_actor_action_change(gs_mgr):
-    new, old = gs_mgr.get(2)
-    if not old:
-        return
-
-    new_entities = new.get(MF.entities, {})
-    old_entities = old.get(MF.entities, {})
-    for srv_id, entity in old_entities.items():
-        if srv_id in new_entities:
-            old_action = entity[MF.action_type]
-            new_action = new_entities[srv_id][MF.action_type]
-            if old_action != new_action:
-                actor_type = ActorType(entity[MF.entity_type])
-                send_event(ActorActionChange(
-                    srv_id,
-                    actor_type,
-                    old_action,
-                    new_action))
-
-
-@processor
-def handle_actor_idle(gs_mgr):
-    """Handles entities in idle state and fires ActorIdle event for them.
-
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: dict
+    :param idle: The idle entities
+    :type idle: list
     """
-    for srv_id, entity in gamestate_entities(gs_mgr):
-        # Update the position of every idle entity
-        if entity.get(MF.action_type, ActionType.idle) == ActionType.idle:
-            x, y = entity[MF.x_pos], entity[MF.y_pos]
-            evt = ActorIdle(srv_id, x, y)
-            send_event(evt)
+    # Update the position of every idle entity
+    send_event(ActorIdleBatch(
+        [entity.srv_id for entity in idle],
+        [(entity.x, entity.y) for entity in idle]))
 
 
-@processor
-def handle_actor_move(gs_mgr):
-    """Handles moving entities and fires ActorMove event for them.
+@processor('moved')
+def handle_actor_move(moved):
+    """Handles moving entities and fires ActorMoveBatch event for them.
 
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: dict
+    :param moved: The old and new records of the entities
+    :type moved: list
     """
-    new, old = gs_mgr.get(2)
-    if not old:
-        return
-    new_entities = new.get(MF.entities, {})
-    old_entities = old.get(MF.entities, {})
-    for srv_id, entity in old_entities.items():
-        if entity[MF.action_type] == ActionType.move and srv_id in new_entities:
-            action = entity[MF.action]
-            position = entity[MF.x_pos], entity[MF.y_pos]
-            new_entity = new_entities[srv_id]
-            new_position = new_entity[MF.x_pos], new_entity[MF.y_pos]
-            send_event(ActorMove(
-                srv_id,
-                position=position,
-                path=[new_position],
-                speed=action[MF.speed]))
-
-
-@processor
-def handle_character_start_building(gs_mgr):
-    """Handles building entities and fires CharacterBuildingStart event for them.
-
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: dict
+    send_event(ActorMoveBatch(
+        [old.srv_id for old, new in moved],
+        [(old.x, old.y) for old, new in moved],
+        [[(new.x, new.y)] for old, new in moved],
+        [old.action[MF.speed] for old, new in moved]))
+
+
+@processor('build_started')
+def handle_character_start_building(build_started):
+    """Fires CharacterBuildingStart event for the characters which started
+    building.
+
+    :param build_started: The characters
+    :type build_started: list
     """
-    n, o = gs_mgr.get(2)
-    o = o or {}
-    new, old = n[MF.entities], o.get(MF.entities, {})
-    for e_id, entity in new.items():
-        if entity[MF.action_type] in {ActionType.build, ActionType.repair}:
-            if e_id not in old or old[e_id][MF.action_type] not in {ActionType.build, ActionType.repair}:
-                send_event(CharacterBuildingStart(e_id))
-
-
-@processor
-def handle_character_stop_building(gs_mgr):
-    """Handles entities that stopped building and fires CharacterBuildingStop
-    event for them.
-
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: dict
+    for entity in build_started:
+        send_event(CharacterBuildingStart(entity.srv_id))
+
+
+@processor('build_stopped')
+def handle_character_stop_building(build_stopped):
+    """Fires CharacterBuildingStop event for the characters which stopped
+    building.
+
+    :param build_stopped: The characters
+    :type build_stopped: list
     """
-    n, o = gs_mgr.get(2)
-    o = o or {}
-    new, old = n[MF.entities], o.get(MF.entities, {})
-    for e_id, entity in old.items():
-        if entity[MF.action_type] in {ActionType.build, ActionType.repair}:
-            if e_id not in new or new[e_id][MF.action_type] not in {ActionType.build, ActionType.repair}:
-                send_event(CharacterBuildingStop(e_id))
+    for entity in build_stopped:
+        send_event(CharacterBuildingStop(entity.srv_id))
 
 
-@processor
-def handle_actor_health(gs_mgr):
-    """Check for entity health changes and send the appropriate event.
+@processor('hp_changed')
+def handle_actor_health(hp_changed):
+    """Sends the appropriate events for the entity health changes.
 
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: :class:`dict`
+    :param hp_changed: The old and new records of the entities
+    :type hp_changed: list
     """
-    n, o = gs_mgr.get(2)
-    o = o or {}
-    new, old = n[MF.entities], o.get(MF.entities, {})
-    for e_id, entities in new.items():
-        if e_id in old:
-            new_hp = entities[MF.cur_hp]
-            old_hp = old[e_id][MF.cur_hp]
-            hp_changed = new_hp != old_hp
-            actor_type = ActorType(entities[MF.entity_type])
-            if hp_changed:
-                send_event(ActorStatusChange(e_id, actor_type, old_hp, new_hp))
-
-
-@processor
-def handle_time(gs_mgr):
-    """Handles time change and sends time update event.
-
-    :param gs_mgr: The gamestate manager.
-    :type gs_mgr: :class:`game.gamestate.GameStateManager`
+    send_event(ActorStatusChangeBatch(
+        [new.srv_id for old, new in hp_changed],
+        [ActorType(new.entity_type) for old, new in hp_changed],
+        [old.cur_hp for old, new in hp_changed],
+        [new.cur_hp for old, new in hp_changed]))
+
+
+@processor('time')
+def handle_time(time):
+    """Sends time update event.
+
+    :param time: The game time
+    :type time: tuple
     """
-    new, old = gs_mgr.get(2)
-    if old:
-        prev_total_minutes = old.get(MF.time, 0)
-        total_minutes = new.get(MF.time, 0)
-        h, m = int(total_minutes / 60), total_minutes % 60
-        prev_m = prev_total_minutes % 60
-        if m != prev_m:
-            send_event(TimeUpdate(h, m))
+    send_event(TimeUpdate(*time))
 
 
-def handle_buildings(selected, buildings, event):
+def handle_buildings(buildings, event):
     """Generic function for building spawning/disappearing handling.
 
-    :param selected: The ids of the building to be handled.
-    :type selected: :class:`set`
-
-    :param buildings: The mapping of all the buildings in the gamestate.
-    :type buildings: :class:`dict`
+    :param buildings: The buildings to be handled.
+    :type buildings: list
 
     :param event: The event class to be used
     :type event: :class:`type`
     """
-    for building in selected:
-        data = buildings[building]
-        b_type = BuildingType(data[MF.building_type])
-        pos = data[MF.x_pos], data[MF.y_pos]
-        cur_hp = data[MF.cur_hp]
-        completed = data[MF.completed]
-        evt = event(building, b_type, pos, cur_hp, completed)
+    for data in buildings:
+        b_type = BuildingType(data.building_type)
+        evt = event(
+            data.srv_id, b_type, data.position, data.cur_hp, data.completed)
         send_event(evt)
 
 
-@processor
-def handle_building_spawn(gs_mgr):
-    """Check for new buildings and send the appropriate events.
+@processor('buildings_added')
+def handle_building_spawn(buildings_added):
+    """Sends the appropriate events for the new buildings.
 
-    Check if there are new buildings that were not in the previous gamestate.
-
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: dict
+    :param buildings_added: The new buildings
+    :type buildings_added: list
     """
-    n, o = gs_mgr.get(2)
-    o = o or {}
-    new, old = n[MF.buildings], o.get(MF.buildings, {})
-    new_buildings = set(new) - set(old)
-    handle_buildings(new_buildings, new, BuildingSpawn)
-
+    handle_buildings(buildings_added, BuildingSpawn)
 
-@processor
-def handle_building_disappear(gs_mgr):
-    """Check for disappeared buildings and send the appropriate events.
 
-    Check if there are new buildings that were not in the previous gamestate.
+@processor('buildings_removed')
+def handle_building_disappear(buildings_removed):
+    """Sends the appropriate events for the disappeared buildings.
 
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: dict
+    :param buildings_removed: The disappeared buildings
+    :type buildings_removed: list
     """
-    n, o = gs_mgr.get(2)
-    o = o or {}
-    new, old = n[MF.buildings], o.get(MF.buildings, {})
-    old_buildings = set(old) - set(new)
-    handle_buildings(old_buildings, old, BuildingDisappear)
+    handle_buildings(buildings_removed, BuildingDisappear)
 
 
-@processor
-def handle_building_health(gs_mgr):
-    """Check for building health/satatus changes and send the appropriate event.
+@processor('buildings_changed')
+def handle_building_health(buildings_changed):
+    """Sends the appropriate events for the building health/status changes.
 
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: :class:`dict`
+    :param buildings_changed: The old and new records of the buildings
+    :type buildings_changed: list
     """
-    n, o = gs_mgr.get(2)
-    o = o or {}
-    new, old = n[MF.buildings], o.get(MF.buildings, {})
-    for b_id, building in new.items():
-        if b_id in old:
-            new_hp = building[MF.cur_hp]
-            old_hp = old[b_id][MF.cur_hp]
-            hp_changed = new_hp != old_hp
-            status_changed = building[MF.completed] == old[b_id][MF.completed]
-            if hp_changed or status_changed:
-                send_event(BuildingStatusChange(
-                    b_id, old_hp, new_hp, building[MF.completed]))
-
-
-@processor
-def handle_object_spawn(gs_mgr):
-    """Check for new static objects and place them on the scene.
-
-    :param gs_mgr: the gs_mgr
-    :type gs_mgr: :class:`dict`
+    for old, new in buildings_changed:
+        send_event(BuildingStatusChange(
+            new.srv_id, old.cur_hp, new.cur_hp, new.completed))
+
+
+@processor('objects_added')
+def handle_object_spawn(objects_added):
+    """Places the new static objects on the scene.
+
+    :param objects_added: The new objects
+    :type objects_added: list
     """
-    n, o = gs_mgr.get(2)
-    o = o or {}
-    new, old = n[MF.objects], o.get(MF.objects, {})
-    for o_id, obj in new.items():
-        if o_id not in old:
-            obj_type = obj[MF.object_type]
-            pos = obj[MF.x_pos], obj[MF.y_pos]
-            operated_by = obj[MF.operated_by]
-            send_event(ObjectSpawn(o_id, obj_type, pos, operated_by))
+    for obj in objects_added:
+        send_event(ObjectSpawn(
+            obj.srv_id, obj.object_type, obj.position, obj.operated_by))
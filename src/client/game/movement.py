@@ -0,0 +1,225 @@
+"""Movement system.
+
+Positions, directions, speeds and paths of all the movables are stored in
+contiguous arrays (struct of arrays) and advanced together, once per frame,
+with array operations. :class:`game.components.Movable` components are views
+on a slot of these arrays.
+"""
+import logging
+import numpy as np
+
+
+LOG = logging.getLogger(__name__)
+
+
+def grow(array, size):
+    """Returns a copy of the array, enlarged along the first axis.
+
+    :param array: The array
+    :type array: :class:`numpy.ndarray`
+
+    :param size: The new size of the first axis
+    :type size: int
+
+    :returns: The new array, padded with zeros
+    :rtype: :class:`numpy.ndarray`
+    """
+    new = np.zeros((size,) + array.shape[1:], dtype=array.dtype)
+    new[:len(array)] = array
+    return new
+
+
+class MovementSystem:
+    """Struct of arrays holding the state of every movable.
+
+    Each movable owns a slot, that is an index in the arrays:
+
+        position: the current position
+        direction: the normalized direction of the movement
+        oriented: whether the direction is set
+        speed: the movement speed
+        moving: whether the movable is following a path
+        paths: the waypoints of the path, padded to the longest path
+        waypoint: the index of the current waypoint in the path
+        path_len: the number of waypoints in the path
+
+    Arrays grow (doubling) when slots or waypoints run out.
+    """
+
+    def __init__(self, capacity=64, path_capacity=8):
+        """Constructor.
+
+        :param capacity: The initial number of slots
+        :type capacity: int
+
+        :param path_capacity: The initial number of waypoints per path
+        :type path_capacity: int
+        """
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 2))
+        self.direction = np.zeros((capacity, 2))
+        self.oriented = np.zeros(capacity, dtype=bool)
+        self.speed = np.zeros(capacity)
+        self.moving = np.zeros(capacity, dtype=bool)
+        self.paths = np.zeros((capacity, path_capacity, 2))
+        self.waypoint = np.zeros(capacity, dtype=np.intp)
+        self.path_len = np.zeros(capacity, dtype=np.intp)
+        # Free slots, the lowest on top
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return self.capacity - len(self._free)
+
+    def allocate(self, position):
+        """Allocates a slot for a new movable.
+
+        :param position: The starting position
+        :type position: tuple
+
+        :returns: The slot
+        :rtype: int
+        """
+        if not self._free:
+            capacity = self.capacity * 2
+            for name in ('position', 'direction', 'oriented', 'speed',
+                         'moving', 'paths', 'waypoint', 'path_len'):
+                setattr(self, name, grow(getattr(self, name), capacity))
+            self._free = list(range(capacity - 1, self.capacity - 1, -1))
+            self.capacity = capacity
+
+        slot = self._free.pop()
+        self.stop(slot, position)
+        self.oriented[slot] = False
+        return slot
+
+    def release(self, slot):
+        """Releases the slot of a movable.
+
+        :param slot: The slot
+        :type slot: int
+        """
+        self.moving[slot] = False
+        self.speed[slot] = 0
+        self._free.append(slot)
+
+    def stop(self, slot, position):
+        """Places a movable in the given position, stopping its movement.
+
+        :param slot: The slot
+        :type slot: int
+
+        :param position: The position
+        :type position: tuple
+        """
+        self.position[slot] = position
+        self.moving[slot] = False
+        self.speed[slot] = 0
+        self.path_len[slot] = 0
+
+    def move(self, slot, position, path, speed):
+        """Starts the movement of a movable along a path.
+
+        :param slot: The slot
+        :type slot: int
+
+        :param position: The starting position
+        :type position: tuple
+
+        :param path: The waypoints of the path
+        :type path: list
+
+        :param speed: The movement speed
+        :type speed: float
+        """
+        length = len(path)
+        if length > self.paths.shape[1]:
+            size = self.paths.shape[1]
+            while size < length:
+                size *= 2
+            paths = np.zeros((self.capacity, size, 2))
+            paths[:, :self.paths.shape[1]] = self.paths
+            self.paths = paths
+
+        self.position[slot] = position
+        self.paths[slot, :length] = path
+        self.path_len[slot] = length
+        self.waypoint[slot] = 0
+        self.speed[slot] = speed
+        self.moving[slot] = True
+
+    def step(self, dt):
+        """Advances all the moving movables.
+
+        Movables which reach a waypoint within the step continue toward the
+        next one with the remaining distance; those which reach the end of
+        their path stop there.
+
+        :param dt: The time spent since the last step (in seconds).
+        :type dt: float
+        """
+        active = self.moving & (self.speed > 0)
+        if not active.any():
+            return
+
+        distance = self.speed * dt
+        target = self.paths[np.arange(self.capacity), self.waypoint]
+        delta = target - self.position
+        length = np.hypot(delta[:, 0], delta[:, 1])
+
+        # Movables which do not reach their waypoint (almost all of them) are
+        # updated in place over the whole arrays, faster than selecting them.
+        short = active & (distance < length)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            direction = delta / length[:, np.newaxis]
+        mask = short[:, np.newaxis]
+        np.copyto(self.direction, direction, where=mask)
+        self.oriented |= short
+        self.position += np.where(mask, direction * distance[:, np.newaxis], 0)
+
+        # Movables which reach their waypoint continue toward the next one
+        # with the remaining distance: every iteration handles those which go
+        # past the next waypoint too.
+        slots = np.nonzero(active & ~short)[0]
+        distance = (distance - length)[slots]
+        while len(slots):
+            self.position[slots] = self.paths[slots, self.waypoint[slots]]
+            self.waypoint[slots] += 1
+            more = self.waypoint[slots] < self.path_len[slots]
+            arrived = slots[~more]
+            self.moving[arrived] = False
+            self.oriented[arrived] = False
+            self.speed[arrived] = 0
+            self.path_len[arrived] = 0
+            slots, distance = slots[more], distance[more]
+
+            target = self.paths[slots, self.waypoint[slots]]
+            delta = target - self.position[slots]
+            length = np.hypot(delta[:, 0], delta[:, 1])
+            short = distance < length
+            moved = slots[short]
+            direction = delta[short] / length[short, np.newaxis]
+            self.direction[moved] = direction
+            self.oriented[moved] = True
+            self.position[moved] += direction * distance[short, np.newaxis]
+            slots, distance = slots[~short], (distance - length)[~short]
+
+
+__SYSTEM = MovementSystem()
+
+
+def movement_system():
+    """Returns the movement system of the game.
+
+    :returns: The movement system
+    :rtype: :class:`game.movement.MovementSystem`
+    """
+    return __SYSTEM
+
+
+def update_movement(dt):
+    """Advances all the movables of the game.
+
+    :param dt: The time spent since the last update (in seconds).
+    :type dt: float
+    """
+    __SYSTEM.step(dt)
@@ -0,0 +1,106 @@
+"""Entity pools.
+
+Entities which are spawned and removed often (enemies, buildings) are built
+from a prefab resource once and then reused: removed entities are detached
+from the scene and kept in the pool of their prefab, along with their meshes,
+textures, animations and scene nodes, and spawning one of them again only
+resets its state.
+
+Pooled entity classes implement `retire()`, to detach an entity from the
+scene, and `reuse()`, which takes the arguments of the constructor but the
+resource and resets the entity.
+"""
+from functools import partial
+import logging
+
+
+LOG = logging.getLogger(__name__)
+
+
+class EntityPool:
+    """Pool of the entities built from the same prefab resource."""
+
+    def __init__(self, factory):
+        """Constructor.
+
+        :param factory: The function building new entities
+        :type factory: callable
+        """
+        self.factory = factory
+        #: The retired entities, ready to be reused
+        self.free = []
+
+    def __len__(self):
+        return len(self.free)
+
+    def prewarm(self, count, *args):
+        """Builds entities in advance, up to the given number of them.
+
+        :param count: The number of entities in the pool
+        :type count: int
+
+        :param args: The arguments of the factory
+        :type args: tuple
+        """
+        for _ in range(count - len(self.free)):
+            entity = self.factory(*args)
+            entity.retire()
+            self.free.append(entity)
+
+    def acquire(self, *args):
+        """Returns a retired entity reset with the given arguments, or a new
+        entity when the pool is empty.
+
+        :param args: The arguments of the factory
+        :type args: tuple
+
+        :returns: The entity
+        :rtype: :class:`game.entities.entity.Entity`
+        """
+        if self.free:
+            entity = self.free.pop()
+            entity.reuse(*args)
+            return entity
+        return self.factory(*args)
+
+    def release(self, entity):
+        """Retires an entity and returns it to the pool.
+
+        :param entity: The entity
+        :type entity: :class:`game.entities.entity.Entity`
+        """
+        entity.retire()
+        self.free.append(entity)
+
+
+__POOLS = {}
+
+
+def entity_pool(cls, resource):
+    """Returns the pool of the entities of the given class built from the
+    given prefab resource.
+
+    :param cls: The entity class
+    :type cls: type
+
+    :param resource: The prefab resource
+    :type resource: :class:`loaders.Resource`
+
+    :returns: The pool
+    :rtype: :class:`game.pool.EntityPool`
+    """
+    key = cls, resource.r_path
+    pool = __POOLS.get(key)
+    if pool is None:
+        LOG.debug('Creating pool of {} {}'.format(cls.__name__, key[1]))
+        pool = __POOLS[key] = EntityPool(partial(cls, resource))
+    return pool
+
+
+def release_entity(entity):
+    """Returns an entity to the pool of its class and prefab resource.
+
+    :param entity: The entity
+    :type entity: :class:`game.entities.entity.Entity`
+    """
+    entity_pool(type(entity), entity.resource).release(entity)
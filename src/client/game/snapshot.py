@@ -0,0 +1,181 @@
+"""Decoded gamestate snapshots.
+
+Gamestate messages are converted once into compact records, so that the
+gamestate processors do not have to dig through the nested maps of the message
+payload over and over.
+"""
+from network import MessageField as MF
+
+
+class EntityRecord:
+    """Snapshot of a mobile entity (player or enemy)."""
+
+    __slots__ = ['srv_id', 'entity_type', 'x', 'y', 'cur_hp', 'action_type',
+                 'action']
+
+    def __init__(self, srv_id, entity_type, x, y, cur_hp, action_type, action):
+        self.srv_id = srv_id
+        self.entity_type = entity_type
+        self.x = x
+        self.y = y
+        self.cur_hp = cur_hp
+        self.action_type = action_type
+        self.action = action
+
+    @classmethod
+    def from_data(cls, srv_id, data):
+        """Builds the record from the gamestate message data.
+
+        :param srv_id: The server id of the entity
+        :type srv_id: int
+
+        :param data: The entity data
+        :type data: dict
+
+        :returns: The record
+        :rtype: :class:`game.snapshot.EntityRecord`
+        """
+        return cls(
+            srv_id,
+            data[MF.entity_type],
+            data[MF.x_pos],
+            data[MF.y_pos],
+            data[MF.cur_hp],
+            # NOTE: 0 is ActionType.idle
+            data.get(MF.action_type, 0),
+            data.get(MF.action))
+
+    @property
+    def position(self):
+        return self.x, self.y
+
+    def __str__(self):
+        return '<EntityRecord({}, {}, {}, {})>'.format(
+            self.srv_id, self.entity_type, self.position, self.action_type)
+
+
+class BuildingRecord:
+    """Snapshot of a building."""
+
+    __slots__ = ['srv_id', 'building_type', 'x', 'y', 'cur_hp', 'completed']
+
+    def __init__(self, srv_id, building_type, x, y, cur_hp, completed):
+        self.srv_id = srv_id
+        self.building_type = building_type
+        self.x = x
+        self.y = y
+        self.cur_hp = cur_hp
+        self.completed = completed
+
+    @classmethod
+    def from_data(cls, srv_id, data):
+        """Builds the record from the gamestate message data.
+
+        :param srv_id: The server id of the building
+        :type srv_id: int
+
+        :param data: The building data
+        :type data: dict
+
+        :returns: The record
+        :rtype: :class:`game.snapshot.BuildingRecord`
+        """
+        return cls(
+            srv_id,
+            data[MF.building_type],
+            data[MF.x_pos],
+            data[MF.y_pos],
+            data[MF.cur_hp],
+            data[MF.completed])
+
+    @property
+    def position(self):
+        return self.x, self.y
+
+    def __str__(self):
+        return '<BuildingRecord({}, {}, {}, {})>'.format(
+            self.srv_id, self.building_type, self.position, self.completed)
+
+
+class ObjectRecord:
+    """Snapshot of a map object."""
+
+    __slots__ = ['srv_id', 'object_type', 'x', 'y', 'operated_by']
+
+    def __init__(self, srv_id, object_type, x, y, operated_by):
+        self.srv_id = srv_id
+        self.object_type = object_type
+        self.x = x
+        self.y = y
+        self.operated_by = operated_by
+
+    @classmethod
+    def from_data(cls, srv_id, data):
+        """Builds the record from the gamestate message data.
+
+        :param srv_id: The server id of the object
+        :type srv_id: int
+
+        :param data: The object data
+        :type data: dict
+
+        :returns: The record
+        :rtype: :class:`game.snapshot.ObjectRecord`
+        """
+        return cls(
+            srv_id,
+            data[MF.object_type],
+            data[MF.x_pos],
+            data[MF.y_pos],
+            data[MF.operated_by])
+
+    @property
+    def position(self):
+        return self.x, self.y
+
+    def __str__(self):
+        return '<ObjectRecord({}, {}, {})>'.format(
+            self.srv_id, self.object_type, self.position)
+
+
+class Snapshot:
+    """Decoded gamestate.
+
+    Entities, buildings and objects are indexed by their server id.
+    """
+
+    __slots__ = ['tstamp', 'time', 'entities', 'buildings', 'objects']
+
+    def __init__(self, tstamp, time, entities, buildings, objects):
+        self.tstamp = tstamp
+        self.time = time
+        self.entities = entities
+        self.buildings = buildings
+        self.objects = objects
+
+    @classmethod
+    def from_data(cls, data):
+        """Builds the snapshot from the gamestate message data.
+
+        :param data: The gamestate message data
+        :type data: dict
+
+        :returns: The snapshot
+        :rtype: :class:`game.snapshot.Snapshot`
+        """
+        entity = EntityRecord.from_data
+        building = BuildingRecord.from_data
+        obj = ObjectRecord.from_data
+        return cls(
+            data.get(MF.timestamp),
+            data.get(MF.time, 0),
+            {k: entity(k, v) for k, v in data.get(MF.entities, {}).items()},
+            {k: building(k, v) for k, v in data.get(MF.buildings, {}).items()},
+            {k: obj(k, v) for k, v in data.get(MF.objects, {}).items()})
+
+    def __str__(self):
+        return '<Snapshot({}, entities={}, buildings={}, objects={})>'.format(
+            self.tstamp,
+            len(self.entities),
+            len(self.buildings),
+            len(self.objects))
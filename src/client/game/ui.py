@@ -242,8 +242,7 @@ def player_health_change(evt):
     LOG.debug('Event subscriber: {}'.format(evt))
     context = evt.context
     srv_id = evt.srv_id
-    if srv_id == context.player_id and srv_id in context.server_entities_map:
-        e_id = context.server_entities_map[evt.srv_id]
-        actor = context.entities[e_id]
+    actor = context.resolve_entity(srv_id)
+    if srv_id == context.player_id and actor:
         actor.health = evt.new, actor.health[1]
         context.ui.health_bar.value = evt.new / actor.health[1]
@@ -0,0 +1,144 @@
+"""NumPy backend of the gamestate diff.
+
+Entities of each snapshot are loaded into arrays sorted by server id, and all
+the entity comparisons are performed with array operations: the Python loops
+only run over the rows that actually changed.
+"""
+from game.changeset import Changeset
+from game.entities.actor import ActionType
+from operator import attrgetter
+import numpy as np
+
+
+def is_building(actions):
+    """Mask of the actions of a character working on a building.
+
+    :param actions: The action types
+    :type actions: :class:`numpy.ndarray`
+
+    :returns: The mask
+    :rtype: :class:`numpy.ndarray`
+    """
+    return (actions == ActionType.build) | (actions == ActionType.repair)
+
+
+def lookup(sorted_ids, ids):
+    """Finds the given ids in a sorted array of ids.
+
+    :param sorted_ids: The sorted array to look into
+    :type sorted_ids: :class:`numpy.ndarray`
+
+    :param ids: The ids to be found
+    :type ids: :class:`numpy.ndarray`
+
+    :returns: tuple (found, index): mask of the ids found and their index in
+        the sorted array (meaningful only where found)
+    :rtype: tuple
+    """
+    if not len(sorted_ids):
+        return np.zeros(len(ids), dtype=bool), np.zeros(len(ids), dtype=np.intp)
+    index = np.searchsorted(sorted_ids, ids)
+    index[index == len(sorted_ids)] = 0
+    return sorted_ids[index] == ids, index
+
+
+class EntityTable:
+    """Entities of a snapshot as arrays sorted by server id."""
+
+    __slots__ = ['ids', 'x', 'y', 'hp', 'action']
+
+    def __init__(self, entities):
+        """Constructor.
+
+        :param entities: The entity records, mapped by server id
+        :type entities: dict
+        """
+        records = list(entities.values())
+        count = len(records)
+
+        def column(attr, dtype):
+            return np.fromiter(map(attrgetter(attr), records), dtype, count)
+
+        ids = np.fromiter(entities, np.int64, count)
+        order = np.argsort(ids, kind='mergesort')
+        self.ids = ids[order]
+        self.x = column('x', np.float64)[order]
+        self.y = column('y', np.float64)[order]
+        self.hp = column('cur_hp', np.int64)[order]
+        self.action = column('action_type', np.int64)[order]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class VectorizedChangeset(Changeset):
+    """Changeset computing the entity slices with NumPy.
+
+    Produces the same slices of :class:`game.changeset.Changeset`, with the
+    entities listed by server id.
+    """
+
+    __slots__ = []
+
+    def diff_entities(self, new, old, cache=None):
+        """Fills the entity slices of the changeset.
+
+        The table of the new entities is stored in the cache, to be reused as
+        old table by the next diff.
+
+        :param new: The new entities, mapped by server id
+        :type new: dict
+
+        :param old: The old entities, mapped by server id
+        :type old: dict
+
+        :param cache: Data reused between consecutive diffs
+        :type cache: dict
+        """
+        last_entities, last_table = (cache or {}).get('entities', (None, None))
+        old_t = last_table if last_entities is old else EntityTable(old)
+        new_t = EntityTable(new)
+        if cache is not None:
+            cache['entities'] = new, new_t
+
+        def records(entities, ids):
+            return list(map(entities.__getitem__, ids.tolist()))
+
+        found, index = lookup(old_t.ids, new_t.ids)
+        kept, _ = lookup(new_t.ids, old_t.ids)
+        building = is_building(new_t.action)
+        was_building = is_building(old_t.action)
+
+        self.idle = records(new, new_t.ids[new_t.action == ActionType.idle])
+        self.spawned = records(new, new_t.ids[~found])
+        self.disappeared = records(old, old_t.ids[~kept])
+
+        # Rows of the entities in both the gamestates
+        rows = np.nonzero(found)[0]
+        old_rows = index[rows]
+        ids = new_t.ids[rows]
+        old_action = old_t.action[old_rows]
+        new_action = new_t.action[rows]
+
+        def pairs(mask):
+            selected = ids[mask].tolist()
+            return list(zip(
+                map(old.__getitem__, selected),
+                map(new.__getitem__, selected)))
+
+        action_changed = old_action != new_action
+        position_changed = \
+            (new_t.x[rows] != old_t.x[old_rows]) | \
+            (new_t.y[rows] != old_t.y[old_rows])
+        self.moved = pairs((old_action == ActionType.move) & position_changed)
+        self.action_changed = pairs(action_changed)
+        self.hp_changed = pairs(new_t.hp[rows] != old_t.hp[old_rows])
+
+        started = action_changed & building[rows] & ~was_building[old_rows]
+        stopped = action_changed & was_building[old_rows] & ~building[rows]
+        self.build_started = \
+            records(new, new_t.ids[~found & building]) + \
+            records(new, ids[started])
+        self.build_stopped = \
+            records(old, ids[stopped]) + \
+            records(old, old_t.ids[~kept & was_building])
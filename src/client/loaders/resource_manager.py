@@ -74,6 +74,10 @@ class ResourceManager:
         # TODO: find a proper way to define reliable relative paths here.
         self.r_path = os.path.abspath(conf['ResourceLocation'])
         self.cache = {}
+        # GPU textures and number of users, mapped by image resource path
+        self.textures = {}
+        # Image resource paths, mapped by texture
+        self.texture_paths = {}
 
     def norm_path(self, path):
         """Normalizes the given path relative to the resource location
@@ -110,6 +114,52 @@ class ResourceManager:
             self.cache[path] = res
         return res
 
+    def get_texture(self, package, name):
+        """Gets the texture of an image linked by the given package.
+
+        Textures are shared between all the users of the same image and
+        uploaded to the GPU only once: each call must be paired with a call
+        to `release_texture` once the texture is no longer used.
+
+        :param package: The package linking the image
+        :type package: :class:`Package`
+
+        :param name: The name of the linked image resource
+        :type name: str
+
+        :returns: The texture
+        :rtype: :class:`renderer.texture.Texture`
+        """
+        path = os.path.join(package.r_path, package.data['resources'][name])
+        entry = self.textures.get(path)
+        if entry is None:
+            from renderer.texture import Texture
+            LOG.debug('Creating texture {}'.format(path))
+            texture = Texture.from_image(self.get(path).data)
+            entry = self.textures[path] = [texture, 0]
+            self.texture_paths[texture] = path
+        entry[1] += 1
+        return entry[0]
+
+    def release_texture(self, texture):
+        """Releases a texture obtained by `get_texture`.
+
+        The texture is dropped from the cache, and its GPU memory freed, when
+        its last user releases it.
+
+        :param texture: The texture
+        :type texture: :class:`renderer.texture.Texture`
+        """
+        path = self.texture_paths.get(texture)
+        if path is None:
+            return
+        entry = self.textures[path]
+        entry[1] -= 1
+        if entry[1] <= 0:
+            LOG.debug('Releasing texture {}'.format(path))
+            del self.textures[path]
+            del self.texture_paths[texture]
+
     def load_package(self, package):
         """Loads the specified resource package.
 
@@ -4,13 +4,17 @@ from client import Client
 from configparser import ConfigParser
 from contextlib import ContextDecorator
 from core import InputManager
+from events import subscriber_timings
 from functools import partial
 from game.audio import AudioManager
 from loaders import ResourceManager
+from network import AsyncMessageProxy
 from network import Connection
 from network import MessageProxy
+from network import ThreadedMessageProxy
 from renderer.renderer import Renderer
 from sdl2 import sdlmixer
+import asyncio
 import click
 import game.actions  # noqa
 import logging
@@ -98,11 +102,31 @@ class sdl2context(ContextDecorator):
         return False
 
 
+def connect(config):
+    """Connects to the server using the configured transport.
+
+    :param config: the network section of the config object
+    :type config: :class:`configparser.SectionProxy`
+
+    :returns: The message proxy
+    :rtype: :class:`network.message.MessageProxy`
+    """
+    transport = config.get('Transport')
+    if transport == 'asyncio':
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(AsyncMessageProxy.connect(config))
+
+    conn = Connection(config)
+    if transport == 'threaded':
+        return ThreadedMessageProxy(conn, config)
+    return MessageProxy(conn)
+
+
 @sdl2context()
 def main(character, config):
     renderer = Renderer(config['Renderer'])
-    conn = Connection(config['Network'])
-    proxy = MessageProxy(conn)
+    proxy = connect(config['Network'])
     input_mgr = InputManager()
     res_mgr = ResourceManager(config['Game'])
     audio_mgr = AudioManager(config['Sound'])
@@ -110,7 +134,23 @@ def main(character, config):
     client = Client(
         character, renderer, proxy, input_mgr, res_mgr, audio_mgr, config)
 
-    client.start()
+    if isinstance(proxy, AsyncMessageProxy):
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(client.start_async())
+        loop.run_until_complete(proxy.close())
+    else:
+        client.start()
+        proxy.close()
+
+    for name, calls, total in subscriber_timings():
+        LOG.debug('Event subscriber {}: {} calls, {:.3f}s'.format(
+            name, calls, total))
+    for name, calls, total in client.context.registry.scheduler.timings():
+        LOG.debug('Entity {} updates: {} calls, {:.3f}s'.format(
+            name, calls, total))
+    uploaded, skipped, frames = renderer.uniform_counters.total
+    LOG.debug('Shader parameters: {} uploaded, {} skipped in {} frames'.format(
+        uploaded, skipped, frames))
 
 
 @click.command()
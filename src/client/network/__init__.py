@@ -1,3 +1,5 @@
+from network.aio import AsyncConnection  # noqa
+from network.aio import AsyncMessageProxy  # noqa
 from network.connection import Connection  # noqa
 from network.message import Message  # noqa
 from network.message import MessageField  # noqa
@@ -5,3 +7,4 @@ from network.message import MessageProxy  # noqa
 from network.message import MessageType  # noqa
 from network.message_handlers import get_message_handlers  # noqa
 from network.message_handlers import message_handler  # noqa
+from network.threaded import ThreadedMessageProxy  # noqa
@@ -0,0 +1,223 @@
+"""asyncio based implementation of the network layer.
+
+Implements the same contract of :class:`network.connection.Connection` and
+:class:`network.message.MessageProxy` on top of asyncio streams, so that
+networking can be scheduled cooperatively with the rest of the client and many
+clients can share the same process.
+"""
+from collections import deque
+from network.connection import HEADER
+from network.connection import HEADER_LENGTH
+from network.decoder import MessageDecoder
+from network.message import Message
+from network.message import MessageProxy
+import asyncio
+import logging
+import socket
+
+LOG = logging.getLogger(__name__)
+
+
+class AsyncConnection:
+    """Application layer handler based on asyncio streams."""
+
+    def __init__(self, config, reader, writer):
+        """Constructor.
+
+        :param config: the network section of the config object
+        :type config: :class:`configparser.SectionProxy`
+
+        :param reader: the stream reader of the connection
+        :type reader: :class:`asyncio.StreamReader`
+
+        :param writer: the stream writer of the connection
+        :type writer: :class:`asyncio.StreamWriter`
+        """
+        self.reader = reader
+        self.writer = writer
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+
+        self.decoder = MessageDecoder(config)
+        self.out_buffer = bytearray()
+        self.out_callbacks = []
+
+    @classmethod
+    async def open(cls, config):
+        """Connects to the configured server.
+
+        :param config: the network section of the config object
+        :type config: :class:`configparser.SectionProxy`
+
+        :returns: the connection
+        :rtype: :class:`network.aio.AsyncConnection`
+        """
+        ip, port = config['ServerIPAddress'], config.getint('ServerPort')
+        LOG.info('Connecting to {}:{}'.format(ip, port))
+        reader, writer = await asyncio.open_connection(
+            ip, port, limit=config.getint('RecvBufferSize', fallback=2 ** 16))
+        return cls(config, reader, writer)
+
+    def write(self, msgtype, payload, callback=None):
+        """Appends a packet to the outgoing buffer.
+
+        :param msgtype: the message type
+        :type msgtype: int
+
+        :param payload: the encoded payload
+        :type payload: bytes
+
+        :param callback: Callback to be called when the packet is handed to
+            the transport
+        :type callback: function or None
+        """
+        LOG.debug('Writing message: {} {}'.format(msgtype, payload))
+        self.out_buffer += HEADER.pack(msgtype, len(payload))
+        self.out_buffer += payload
+        if callback:
+            self.out_callbacks.append(callback)
+
+    def flush(self):
+        """Hands the outgoing buffer to the transport.
+
+        The transport sends the data as soon as possible, without blocking:
+        use `drain` to wait for its buffer to be flushed.
+
+        :returns: the number of bytes written
+        :rtype: int
+        """
+        size = len(self.out_buffer)
+        if size:
+            self.writer.write(bytes(self.out_buffer))
+            self.out_buffer.clear()
+
+        callbacks, self.out_callbacks = self.out_callbacks, []
+        for callback in callbacks:
+            callback()
+
+        return size
+
+    async def drain(self):
+        """Waits for the transport to flush its buffer."""
+        await self.writer.drain()
+
+    async def recv(self):
+        """Receives a single packet from the server.
+
+        :returns: tuple (msgtype, encoded_payload)
+        :rtype: tuple
+        """
+        header = await self.reader.readexactly(HEADER_LENGTH)
+        msgtype, size = HEADER.unpack(header)
+        payload = await self.reader.readexactly(size)
+        LOG.debug('Received message: type={} size={}'.format(msgtype, size))
+        return msgtype, payload
+
+    async def close(self):
+        """Coroutine: closes the connection with the server."""
+        LOG.info('Closing connection')
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError as exc:
+            LOG.warning('Connection closed with error: {}'.format(exc))
+
+
+class AsyncMessageProxy(MessageProxy):
+    """Message proxy based on asyncio.
+
+    A reader task receives and decodes the incoming messages, which are then
+    returned by `poll` as with the default message proxy. The coroutines of
+    the contract are `wait_for` and `close`.
+    """
+
+    def __init__(self, conn):
+        """Constructor.
+
+        NOTE: must be instantiated while the event loop is running.
+
+        :param conn: the underneath connection
+        :type conn: :class:`network.aio.AsyncConnection`
+        """
+        super().__init__(conn)
+        self.inbound = deque()
+        self.received = asyncio.Event()
+        self.connected = True
+        self.reader_task = asyncio.ensure_future(self.read())
+
+    @classmethod
+    async def connect(cls, config):
+        """Connects to the configured server and returns the proxy.
+
+        :param config: the network section of the config object
+        :type config: :class:`configparser.SectionProxy`
+
+        :returns: the message proxy
+        :rtype: :class:`network.aio.AsyncMessageProxy`
+        """
+        return cls(await AsyncConnection.open(config))
+
+    async def read(self):
+        """Reader task: receives and decodes the incoming messages."""
+        try:
+            while True:
+                msgtype, payload = await self.conn.recv()
+                msg = Message(msgtype, self.conn.decoder.decode(payload))
+                self.inbound.append(msg)
+                self.received.set()
+        except asyncio.CancelledError:
+            raise
+        except asyncio.IncompleteReadError:
+            LOG.info('Connection closed by the server')
+        except Exception:
+            LOG.exception('Reader task failed')
+        self.connected = False
+        self.received.set()
+
+    async def drain(self):
+        """Waits for the pushed messages to be flushed."""
+        await self.conn.drain()
+
+    async def wait_for(self, msgtype):
+        """Waits for a specific message.
+
+        :param msgtype: The message type we are waiting for
+        :type msgtype: :class:`network.message.MessageType`
+
+        :returns: The message, or None if the connection was closed before
+            it was received.
+        :rtype: :class:`network.message.Message`
+        """
+        while True:
+            # NOTE: messages received right before the connection was closed
+            # are still returned
+            for msg in self.poll(msgtype):
+                return msg
+            if not self.connected:
+                return None
+            self.received.clear()
+            await self.received.wait()
+
+    def poll(self, msgtype=None):
+        """Yields all the messages received so far.
+
+        :returns: the Message object to be pushed
+        :rtype: :class:`message.Message`
+        """
+        inbound = self.inbound
+        while inbound:
+            msg = inbound.popleft()
+            if msgtype and msg.msgtype != msgtype:
+                LOG.debug('Discarded message: {}'.format(msg))
+                continue
+            yield msg
+
+    async def close(self):
+        """Coroutine: stops the reader task and closes the connection."""
+        self.reader_task.cancel()
+        try:
+            await self.reader_task
+        except asyncio.CancelledError:
+            pass
+        await self.conn.close()
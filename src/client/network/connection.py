@@ -1,4 +1,6 @@
+from collections import deque
 from contextlib import contextmanager
+from network.decoder import MessageDecoder
 import logging
 import socket
 import struct
@@ -8,6 +10,9 @@ LOG = logging.getLogger(__name__)
 HEADER = struct.Struct('!HI')
 HEADER_LENGTH = HEADER.size
 
+#: Default size (in bytes) of the preallocated receive buffer
+RECV_BUFFER_SIZE = 256 * 1024
+
 
 def parse_header(header):
     """Uses HEADER struct to unpack the header.
@@ -37,6 +42,135 @@ def create_packet(msgtype, payload):
     return header + payload
 
 
+class ReceiveBuffer:
+    """Preallocated buffer for framed socket reads.
+
+    Data is read straight into the buffer with `socket.recv_into` and complete
+    frames are handed out as `memoryview` slices of the buffer itself, so that
+    no intermediate copy of the payload is ever made.
+
+    The unparsed tail of the buffer is moved back to the beginning only when
+    the end of the buffer is reached, keeping payloads contiguous. The buffer
+    grows when a single frame does not fit into it.
+
+    NOTE: views returned by `next_frame` are only valid until the next call to
+    `recv_from`.
+    """
+
+    def __init__(self, size=RECV_BUFFER_SIZE):
+        """Constructor.
+
+        :param size: the initial size of the buffer
+        :type size: int
+        """
+        self.data = bytearray(size)
+        self.view = memoryview(self.data)
+        # Offset of the first unparsed byte and end of the valid data
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        """Number of bytes received and not parsed yet."""
+        return self.end - self.start
+
+    def frame_size(self):
+        """Total size of the first unparsed frame.
+
+        :returns: the size of header and payload, or None in case the header
+            was not received yet
+        :rtype: int or None
+        """
+        if self.end - self.start < HEADER_LENGTH:
+            return None
+        _, size = HEADER.unpack_from(self.data, self.start)
+        return HEADER_LENGTH + size
+
+    def reclaim(self):
+        """Makes room at the end of the buffer.
+
+        Moves the unparsed data back to the beginning of the buffer, or grows
+        the buffer in case it is entirely filled by a single partial frame.
+
+        :returns: False if there is no need to make room, as the buffer is full
+            of complete frames to be parsed first
+        :rtype: bool
+        """
+        pending = self.end - self.start
+        if self.start:
+            self.view[:pending] = self.view[self.start:self.end]
+        else:
+            size = self.frame_size()
+            if size is not None and size <= pending:
+                return False
+            # NOTE: a new buffer is allocated instead of resizing the current
+            # one, as resizing is not allowed while views are exported.
+            data = bytearray(max(len(self.data) * 2, size or 0))
+            data[:pending] = self.view[:pending]
+            self.data, self.view = data, memoryview(data)
+            LOG.debug('Receive buffer grown to {} bytes'.format(len(data)))
+        self.start, self.end = 0, pending
+        return True
+
+    def recv_from(self, sock, drain=True):
+        """Reads the data available on the socket into the buffer.
+
+        :param sock: the socket to read from
+        :type sock: :class:`socket.socket`
+
+        :param drain: keep reading until the kernel buffer is empty (that is,
+            until the non-blocking socket would block) or the buffer is full
+        :type drain: bool
+
+        :returns: the number of bytes read
+        :rtype: int
+
+        :raises ConnectionError: if the peer closed the connection and no data
+            was left to be read
+        """
+        if self.start == self.end:
+            self.start = self.end = 0
+
+        total = 0
+        while True:
+            if self.end == len(self.data) and not self.reclaim():
+                break
+            try:
+                n = sock.recv_into(self.view[self.end:])
+            except BlockingIOError:
+                break
+            if not n:
+                # NOTE: the end of the stream is reported once the data read
+                # so far has been handed out
+                if not total:
+                    raise ConnectionError('Connection closed by the peer')
+                break
+            self.end += n
+            total += n
+            if not drain:
+                break
+        return total
+
+    def next_frame(self):
+        """Parses the next complete frame available in the buffer.
+
+        :returns: tuple (msgtype, payload) if available, where payload is a
+            view on the buffer
+        :rtype: tuple or None
+        """
+        start = self.start
+        if self.end - start < HEADER_LENGTH:
+            return None
+
+        msgtype, size = HEADER.unpack_from(self.data, start)
+        payload_start = start + HEADER_LENGTH
+        payload_end = payload_start + size
+        if payload_end > self.end:
+            return None
+
+        self.start = payload_end
+        return msgtype, self.view[payload_start:payload_end]
+
+
 class Connection:
     """Application layer handler.
 
@@ -45,80 +179,151 @@ class Connection:
     client config file.
     """
 
-    def __init__(self, config):
+    def __init__(self, config, sock=None):
         """Constructor.
 
         :param config: the network section of the config object
         :type config: :class:`configparser.SectionProxy`
+
+        :param sock: an already connected socket to be used instead of opening
+            a new connection to the configured server
+        :type sock: :class:`socket.socket`
         """
-        ip, port = config['ServerIPAddress'], config.getint('ServerPort')
-        LOG.info('Connecting to {}:{}'.format(ip, port))
-        self.socket = socket.create_connection((ip, port))
+        if sock is None:
+            ip, port = config['ServerIPAddress'], config.getint('ServerPort')
+            LOG.info('Connecting to {}:{}'.format(ip, port))
+            sock = socket.create_connection((ip, port))
+        self.socket = sock
         self.socket.setblocking(False)
         self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
-        self.chunk_size = config.getint('ChunkSize')
+        self.is_blocking = False
+
+        self.buffer = ReceiveBuffer(
+            config.getint('RecvBufferSize', fallback=RECV_BUFFER_SIZE))
+        self.decoder = MessageDecoder(config)
 
-        self.header = None
-        self.payload = None
-        self.buffer = bytearray()
+        # Outgoing data, with the total amount of bytes written and flushed so
+        # far, used to keep track of the callbacks of the packets being sent.
+        self.out_buffer = bytearray()
+        self.out_callbacks = deque()
+        self.written = 0
+        self.flushed = 0
 
-    def send(self, msgtype, payload):
-        """Sends a packet via TCP to the server.
+    def write(self, msgtype, payload, callback=None):
+        """Appends a packet to the outgoing buffer.
+
+        The packet is actually sent to the server during the next `flush`, along
+        with all the other buffered packets.
 
         :param msgtype: the message type
         :type msgtype: int
 
         :param payload: the encoded payload
         :type payload: bytes
+
+        :param callback: Callback to be called when the whole packet is handed
+            to the kernel
+        :type callback: function or None
         """
         LOG.debug('Writing message: {} {}'.format(msgtype, payload))
-        self.socket.sendall(create_packet(msgtype, payload))
-        LOG.debug('Written message: {} {}'.format(msgtype, payload))
+        self.out_buffer += HEADER.pack(msgtype, len(payload))
+        self.out_buffer += payload
+        self.written += HEADER_LENGTH + len(payload)
+        if callback:
+            self.out_callbacks.append((self.written, callback))
+
+    def flush(self):
+        """Sends the outgoing buffer via TCP to the server.
+
+        The buffered packets are sent with as few calls as possible (usually a
+        single one). In case the socket can not accept the whole buffer, the
+        remaining data is kept for the next flush.
+
+        :returns: the number of bytes sent
+        :rtype: int
+        """
+        if not self.out_buffer:
+            return 0
+
+        sent = 0
+        with memoryview(self.out_buffer) as view:
+            while sent < len(view):
+                try:
+                    sent += self.socket.send(view[sent:])
+                except BlockingIOError:
+                    break
+        del self.out_buffer[:sent]
+        self.flushed += sent
+        LOG.debug('Written {} bytes, {} pending'.format(
+            sent, len(self.out_buffer)))
+
+        # Notify the packets that were completely sent
+        callbacks = self.out_callbacks
+        while callbacks and callbacks[0][0] <= self.flushed:
+            _, callback = callbacks.popleft()
+            callback()
+
+        return sent
+
+    def close(self):
+        """Closes the connection with the server."""
+        LOG.info('Closing connection')
+        self.socket.close()
 
     @contextmanager
     def blocking(self):
         """Contextmanager: set the socket as blocking on demand."""
         self.socket.setblocking(True)
+        self.is_blocking = True
         LOG.debug('Blocking socket')
         yield
         self.socket.setblocking(False)
+        self.is_blocking = False
         LOG.debug('Unblocking socket')
 
     def recv(self):
         """Receives a single packet via TCP from the server.
 
+        All the data available in the kernel buffer is read at once when no
+        complete packet is left in the receive buffer.
+
+        NOTE: the returned payload is a view on the receive buffer, which is
+        only valid until the next call to this method.
+
         :returns: tuple (msgtype, encoded_payload) if available
         :rtype: tuple or None
         """
-        def read(size):
-            while True:
-                try:
-                    chunk = min([self.chunk_size, size - len(self.buffer)])
-                    d = self.socket.recv(chunk)
-                    self.buffer.extend(d)
-                    if len(self.buffer) == size:
-                        buff, self.buffer = self.buffer, bytearray()
-                        return buff
-                except BlockingIOError:
-                    return
-
-        if self.header is None:
-            header = read(HEADER_LENGTH)
-            if header is None:
-                return
-            self.header = parse_header(header)
-            LOG.debug('Received header: type={} size={}'.format(self.header[0], self.header[1]))
-
-        if self.header is not None:
-            payload = read(self.header[1])
-            if payload is None:
+        frame = self.buffer.next_frame()
+        if frame is None:
+            # In blocking mode just wait for the first chunk of data, draining
+            # the socket would block forever.
+            self.buffer.recv_from(self.socket, drain=not self.is_blocking)
+            frame = self.buffer.next_frame()
+            if frame is None:
                 return None
 
-            self.payload = payload
-            LOG.debug('Received payload: {} bytes'.format(len(payload)))
+        LOG.debug('Received message: type={} size={}'.format(
+            frame[0], len(frame[1])))
+        return frame
+
+    def messages(self, msgtype=None):
+        """Receives and decodes all the packets available.
 
-        # Returns the tuple (msgtype, payload)
-        msgtype, payload = self.header[0], self.payload
-        self.header, self.payload = None, None
-        LOG.debug('Received message: {} {}'.format(msgtype, payload))
-        return msgtype, payload
+        Payloads are fed to the decoder straight from the receive buffer.
+
+        :param msgtype: The only message type to be decoded, the others are
+            discarded
+        :type msgtype: :class:`network.message.MessageType`
+
+        :returns: tuple (msgtype, data)
+        :rtype: tuple
+        """
+        while True:
+            frame = self.recv()
+            if frame is None:
+                break
+            mt, payload = frame
+            if msgtype and mt != msgtype:
+                LOG.debug('Discarded message: {}'.format(mt))
+                continue
+            yield mt, self.decoder.decode(payload)
@@ -0,0 +1,96 @@
+from network.message import MessageField
+import logging
+import msgpack
+
+LOG = logging.getLogger(__name__)
+
+#: Default maximum size (in bytes) of a single encoded message
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+#: Canonical instances of the known message fields, used to intern map keys
+FIELDS = {field.value: field.value for field in MessageField}
+
+
+def intern_keys(pairs):
+    """Builds a map replacing known keys with their canonical instance.
+
+    :param pairs: the decoded key-value pairs
+    :type pairs: list
+
+    :returns: the map
+    :rtype: dict
+    """
+    get = FIELDS.get
+    return {get(k, k): v for k, v in pairs}
+
+
+def unpacker_options(max_size=MAX_MESSAGE_SIZE, intern=False):
+    """Returns the options of the unpacker, depending on the msgpack version.
+
+    Arrays are decoded as tuples, strings are left as bytes (message fields
+    are bytes) and every length is bounded by the maximum message size, so
+    that a malformed payload can not make the unpacker preallocate huge
+    containers.
+
+    :param max_size: the maximum size of a single encoded message
+    :type max_size: int
+
+    :param intern: whether map keys should be interned
+    :type intern: bool
+
+    :returns: the keyword arguments for :class:`msgpack.Unpacker`
+    :rtype: dict
+    """
+    options = {
+        'use_list': False,
+        'max_buffer_size': max_size,
+        'max_str_len': max_size,
+        'max_bin_len': max_size,
+        'max_array_len': max_size,
+        'max_map_len': max_size // 2,
+        'max_ext_len': max_size,
+    }
+    if msgpack.version >= (0, 5, 2):
+        options['raw'] = True
+    if msgpack.version >= (1, 0, 0):
+        # Entities are mapped by their numeric identifier
+        options['strict_map_key'] = False
+    if intern:
+        options['object_pairs_hook'] = intern_keys
+    return options
+
+
+class MessageDecoder:
+    """Streaming decoder of the message payloads of a connection.
+
+    Keeps a single long-lived unpacker, configured once, which payloads are
+    fed into straight from the receive buffer.
+    """
+
+    def __init__(self, config):
+        """Constructor.
+
+        :param config: the network section of the config object
+        :type config: :class:`configparser.SectionProxy`
+        """
+        self.options = unpacker_options(
+            config.getint('MaxMessageSize', fallback=MAX_MESSAGE_SIZE),
+            config.getboolean('InternKeys', fallback=False))
+        self.unpacker = msgpack.Unpacker(**self.options)
+
+    def decode(self, payload):
+        """Decodes a single message payload.
+
+        :param payload: the encoded payload
+        :type payload: bytes or memoryview
+
+        :returns: the message data
+        :rtype: dict
+        """
+        self.unpacker.feed(payload)
+        try:
+            return self.unpacker.unpack()
+        except Exception:
+            # Drop whatever is left of the malformed payload
+            self.unpacker = msgpack.Unpacker(**self.options)
+            raise
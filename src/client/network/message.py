@@ -1,3 +1,4 @@
+from collections import deque
 from enum import Enum
 from enum import IntEnum
 from enum import unique
@@ -112,7 +113,7 @@ class MessageProxy:
         """
         LOG.info('Initializing message proxy')
         self.conn = conn
-        self.msg_queue = []
+        self.msg_queue = deque()
 
     def enqueue(self, msg, callback=lambda: None):
         """Enqueue the message.
@@ -129,13 +130,20 @@ class MessageProxy:
         self.msg_queue.append((msg, callback))
 
     def push(self):
-        """Pushes the message through the underneath connection"""
-        while len(self.msg_queue):
-            msg, cb = self.msg_queue.pop(0)
+        """Pushes the message through the underneath connection.
+
+        All the enqueued messages are coalesced and sent at once. Callbacks are
+        called as soon as the respective message is handed to the kernel.
+        """
+        while self.msg_queue:
+            msg, cb = self.msg_queue.popleft()
             LOG.debug('Pushing message: {} {}'.format(msg, str(msg.data)))
-            self.conn.send(*msg.encode())
-            LOG.debug('Pushed message: {} {}'.format(msg, str(msg.data)))
-            cb()
+            self.conn.write(*msg.encode(), callback=cb)
+        self.conn.flush()
+
+    def close(self):
+        """Closes the underneath connection."""
+        self.conn.close()
 
     def wait_for(self, msgtype):
         """Polls the connection waiting for a specific message.
@@ -157,14 +165,7 @@ class MessageProxy:
         :returns: the Message object to be pushed
         :rtype: :class:`message.Message`
         """
-        while True:
-            data = self.conn.recv()
-            if data is None:
-                break
-            mt, payload = data
-            if msgtype and mt != msgtype:
-                LOG.debug('Discarded message: {}]'.format(mt))
-                continue
-            msg = Message.decode(mt, payload)
+        for mt, data in self.conn.messages(msgtype):
+            msg = Message(mt, data)
             LOG.debug('Received message: {} {}'.format(msg, str(msg.data)))
             yield msg
@@ -0,0 +1,211 @@
+from collections import deque
+from network.message import Message
+from network.message import MessageProxy
+from threading import Event
+from threading import Thread
+import logging
+import select
+import socket
+import time
+
+LOG = logging.getLogger(__name__)
+
+#: Default maximum number of decoded messages waiting for the game loop
+QUEUE_SIZE = 256
+
+#: Maximum time (in seconds) the network thread waits for socket events
+POLL_TIMEOUT = 0.01
+
+#: Period (in seconds) of the transport statistics logging
+STATS_PERIOD = 5.0
+
+
+class TransportStats:
+    """Counters describing the work done by the network thread."""
+
+    def __init__(self):
+        self.decoded = 0
+        self.decode_time = 0.0
+        self.max_inbound = 0
+        self.max_outbound = 0
+
+    def __str__(self):
+        return '<TransportStats(decoded={}, decode_time={:.3f}s, ' \
+            'max_inbound={}, max_outbound={})>'.format(
+                self.decoded,
+                self.decode_time,
+                self.max_inbound,
+                self.max_outbound)
+
+
+class ThreadedMessageProxy(MessageProxy):
+    """Message proxy which moves the network I/O off the game loop.
+
+    A dedicated thread owns the socket: it reads and frames the incoming data,
+    decodes the messages and sends the outgoing ones. Messages are handed
+    between the game loop and the network thread through deques, whose append
+    and popleft operations are atomic.
+
+    The inbound queue is bounded: when it is full the network thread stops
+    reading from the socket until the game loop catches up.
+
+    NOTE: message callbacks are called by the network thread.
+    """
+
+    def __init__(self, conn, config):
+        """Constructor.
+
+        :param conn: the underneath connection
+        :type conn: :class:`connection.Connection`
+
+        :param config: the network section of the config object
+        :type config: :class:`configparser.SectionProxy`
+        """
+        super().__init__(conn)
+        self.queue_size = config.getint('QueueSize', fallback=QUEUE_SIZE)
+        self.inbound = deque()
+        self.outbound = deque()
+        self.stats = TransportStats()
+        self.received = Event()
+
+        # Socket pair used to wake up the network thread when there are
+        # messages to be sent.
+        self.wakeup_r, self.wakeup_w = socket.socketpair()
+        self.wakeup_r.setblocking(False)
+
+        self.error = None
+        self.running = True
+        self.thread = Thread(target=self.run, name='network', daemon=True)
+        self.thread.start()
+
+    @property
+    def inbound_depth(self):
+        """Number of decoded messages waiting for the game loop."""
+        return len(self.inbound)
+
+    @property
+    def outbound_depth(self):
+        """Number of messages waiting for the network thread."""
+        return len(self.outbound)
+
+    def push(self):
+        """Hands the enqueued messages to the network thread."""
+        if not self.msg_queue:
+            return
+
+        self.outbound.extend(self.msg_queue)
+        self.msg_queue.clear()
+        self.stats.max_outbound = max(
+            self.stats.max_outbound, len(self.outbound))
+        self.wakeup_w.send(b'\0')
+
+    def wait_for(self, msgtype):
+        """Waits for a specific message.
+
+        :param msgtype: The message type we are waiting for
+        :type msgtype: :class:`network.message.MessageType`
+
+        :returns: The message.
+        :rtype: :class:`network.message.Message`
+        """
+        while True:
+            # Messages may have been decoded before the last wakeup was
+            # consumed, so check the queue before waiting for new ones.
+            self.received.clear()
+            for msg in self.poll(msgtype):
+                return msg
+            self.received.wait()
+
+    def poll(self, msgtype=None):
+        """Yields all the messages decoded by the network thread.
+
+        The error which stopped the network thread, if any, is raised once
+        the messages decoded before it have been yielded.
+
+        :returns: the Message object to be pushed
+        :rtype: :class:`message.Message`
+        """
+        inbound = self.inbound
+        while inbound:
+            msg = inbound.popleft()
+            if msgtype and msg.msgtype != msgtype:
+                LOG.debug('Discarded message: {}'.format(msg))
+                continue
+            yield msg
+
+        if self.error:
+            raise self.error
+
+    def close(self):
+        """Stops the network thread and closes the connection."""
+        self.running = False
+        self.wakeup_w.send(b'\0')
+        self.thread.join()
+        self.wakeup_r.close()
+        self.wakeup_w.close()
+        super().close()
+
+    def run(self):
+        """Network thread main loop."""
+        LOG.info('Starting network thread')
+        try:
+            last_stats = time.perf_counter()
+            while self.running:
+                self.process()
+
+                now = time.perf_counter()
+                if now - last_stats >= STATS_PERIOD:
+                    last_stats = now
+                    LOG.debug('Transport stats: {}'.format(self.stats))
+        except ConnectionError as exc:
+            LOG.info('Connection closed: {}'.format(exc))
+            self.error = exc
+            self.received.set()
+        except Exception as exc:
+            LOG.exception('Network thread failed')
+            self.error = exc
+            self.received.set()
+
+    def process(self):
+        """Waits for socket events, then sends and receives messages."""
+        conn = self.conn
+        readers = [self.wakeup_r]
+        if len(self.inbound) < self.queue_size:
+            readers.append(conn.socket)
+        writers = [conn.socket] if conn.out_buffer else []
+        readable, _, _ = select.select(readers, writers, [], POLL_TIMEOUT)
+
+        if self.wakeup_r in readable:
+            try:
+                while self.wakeup_r.recv(4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+        # Outgoing messages
+        outbound = self.outbound
+        while outbound:
+            msg, cb = outbound.popleft()
+            LOG.debug('Pushing message: {} {}'.format(msg, str(msg.data)))
+            conn.write(*msg.encode(), callback=cb)
+        conn.flush()
+
+        # Incoming messages
+        stats = self.stats
+        inbound = self.inbound
+        received = False
+        while len(inbound) < self.queue_size:
+            data = conn.recv()
+            if data is None:
+                break
+            start = time.perf_counter()
+            msgtype, payload = data
+            msg = Message(msgtype, conn.decoder.decode(payload))
+            stats.decode_time += time.perf_counter() - start
+            stats.decoded += 1
+            inbound.append(msg)
+            received = True
+
+        if received:
+            stats.max_inbound = max(stats.max_inbound, len(inbound))
+            self.received.set()
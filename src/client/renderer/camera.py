@@ -1,6 +1,7 @@
 from abc import ABC
 from matlib import Mat
 from matlib import Vec
+import math
 
 
 class Camera(ABC):
@@ -12,11 +13,51 @@ class Camera(ABC):
     """
 
     def __init__(self):
-        self.position = Vec()
+        self._position = Vec()
+        self._billboard_angle = None
         self.translate_mat = Mat()
         self.modelview_mat = Mat()
         self.projection_mat = Mat()
 
+    @property
+    def position(self):
+        """The position of the center of the scene.
+
+        :returns: The position
+        :rtype: :class:`matlib.Vec`
+        """
+        return self._position
+
+    @position.setter
+    def position(self, center):
+        """Sets the position of the center of the scene (without translating
+        the scene, see `set_position`).
+
+        :param center: The new center of the scene
+        :type center: :class:`matlib.Vec`
+        """
+        self._position = center
+        self._billboard_angle = None
+
+    @property
+    def billboard_angle(self):
+        """The rotation around the x-axis which makes billboards (health bars,
+        labels) face the camera.
+
+        Computed only once after each change of position of the camera and
+        shared by all the billboards.
+
+        :returns: The angle (in radians)
+        :rtype: float
+        """
+        if self._billboard_angle is None:
+            c_pos = self._position
+            direction = Vec(c_pos.x, c_pos.y, c_pos.z, 1)
+            direction.norm()
+            z_axis = Vec(0, 0, 1)
+            self._billboard_angle = math.acos(z_axis.dot(direction))
+        return self._billboard_angle
+
     def set_position(self, center):
         """Sets the position of the center of the scene.
 
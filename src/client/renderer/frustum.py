@@ -0,0 +1,142 @@
+"""View frustum culling.
+
+Bounding volumes are spheres, stored as (x, y, z, radius) tuples. Spheres
+bounding the geometry of a node are centered at its origin, so that they do
+not change when the node rotates; spheres bounding a subtree enclose those
+of the nodes in it.
+
+Matrices are indexed as `m[row, column]` and transform column vectors, so
+that both :class:`matlib.Mat` and 2D arrays can be used.
+"""
+from math import inf
+from math import sqrt
+
+
+#: Bounding sphere of the nodes which are never culled
+UNBOUNDED = (0.0, 0.0, 0.0, inf)
+
+
+def frustum_planes(view):
+    """Extracts the planes of the view frustum.
+
+    :param view: The combined projection and model-view matrix
+    :type view: :class:`matlib.Mat`
+
+    :returns: The left, right, bottom, top, near and far planes, as
+        normalized (a, b, c, d) tuples, pointing inside the frustum
+    :rtype: list
+    """
+    rows = [[view[i, j] for j in range(4)] for i in range(4)]
+    w = rows[3]
+    planes = []
+    for row in rows[:3]:
+        for sign in (1, -1):
+            a, b, c, d = (w[j] + sign * row[j] for j in range(4))
+            norm = sqrt(a * a + b * b + c * c) or 1.0
+            planes.append((a / norm, b / norm, c / norm, d / norm))
+    return planes
+
+
+def box_sphere(lo, hi):
+    """Returns the sphere centered at the origin enclosing a box.
+
+    :param lo: The minimum corner of the box
+    :type lo: :class:`matlib.Vec`
+
+    :param hi: The maximum corner of the box
+    :type hi: :class:`matlib.Vec`
+
+    :returns: The sphere
+    :rtype: tuple
+    """
+    x = max(abs(lo.x), abs(hi.x))
+    y = max(abs(lo.y), abs(hi.y))
+    z = max(abs(lo.z), abs(hi.z))
+    return 0.0, 0.0, 0.0, sqrt(x * x + y * y + z * z)
+
+
+def mesh_sphere(mesh):
+    """Returns the sphere centered at the origin enclosing a mesh.
+
+    :param mesh: The mesh
+    :type mesh: :class:`renderer.Mesh`
+
+    :returns: The sphere, `UNBOUNDED` if the mesh has no bounding box
+    :rtype: tuple
+    """
+    bounding_box = getattr(mesh, 'bounding_box', None)
+    if bounding_box is None:
+        return UNBOUNDED
+    return box_sphere(*bounding_box)
+
+
+def transform_sphere(m, sphere):
+    """Transforms a sphere, scaling its radius by the largest scale factor of
+    the transformation.
+
+    :param m: The transformation matrix
+    :type m: :class:`matlib.Mat`
+
+    :param sphere: The sphere
+    :type sphere: tuple
+
+    :returns: The transformed sphere
+    :rtype: tuple
+    """
+    x, y, z, r = sphere
+    scale = sqrt(max(
+        m[0, j] * m[0, j] + m[1, j] * m[1, j] + m[2, j] * m[2, j]
+        for j in range(3)))
+    return (
+        m[0, 0] * x + m[0, 1] * y + m[0, 2] * z + m[0, 3],
+        m[1, 0] * x + m[1, 1] * y + m[1, 2] * z + m[1, 3],
+        m[2, 0] * x + m[2, 1] * y + m[2, 2] * z + m[2, 3],
+        r * scale)
+
+
+def merge_spheres(a, b):
+    """Returns the smallest sphere enclosing two spheres.
+
+    :param a: The first sphere, or None
+    :type a: tuple
+
+    :param b: The second sphere, or None
+    :type b: tuple
+
+    :returns: The enclosing sphere, None if both are None
+    :rtype: tuple
+    """
+    if a is None:
+        return b
+    elif b is None:
+        return a
+
+    dx, dy, dz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    d = sqrt(dx * dx + dy * dy + dz * dz)
+    if d + b[3] <= a[3]:
+        return a
+    elif d + a[3] <= b[3]:
+        return b
+
+    r = (d + a[3] + b[3]) / 2
+    k = (r - a[3]) / d
+    return a[0] + dx * k, a[1] + dy * k, a[2] + dz * k, r
+
+
+def sphere_visible(planes, sphere):
+    """Whether a sphere intersects the view frustum.
+
+    :param planes: The frustum planes
+    :type planes: list
+
+    :param sphere: The sphere, in world coordinates
+    :type sphere: tuple
+
+    :returns: Whether the sphere is (at least partially) inside the frustum
+    :rtype: bool
+    """
+    x, y, z, r = sphere
+    for a, b, c, d in planes:
+        if a * x + b * y + c * z + d < -r:
+            return False
+    return True
@@ -1,10 +1,17 @@
-from itertools import chain
-from renderer.light import LIGHT_SOURCES
+from renderer.frustum import mesh_sphere
+from renderer.light import LIGHT_PARAMS
 from renderer.renderer import RenderOp
 from renderer.scene import SceneNode
+from renderer.uniform_buffer import CAMERA_BLOCK
+from renderer.uniform_buffer import LIGHTS_BLOCK
 from matlib import Vec
 
 
+#: Scale of the bounding spheres of animated meshes, whose poses can reach out
+#: of the box enclosing the vertices in bind pose
+ANIMATED_BOUNDS_SCALE = 2.0
+
+
 class GeometryNode(SceneNode):
     """A node for attaching static geometry (mesh) to the scene."""
 
@@ -39,6 +46,11 @@ class GeometryNode(SceneNode):
         self.enable_light = enable_light
         self.anim_inst = animation
         self._animate = False
+        self.render_op = RenderOp(
+            0, shader, self.params, mesh, self.textures)
+        # The mesh the bounding sphere of the node was computed for, and
+        # whether it was animated
+        self._bounded = None
 
     @property
     def animate(self):
@@ -49,34 +61,49 @@ class GeometryNode(SceneNode):
         self._animate = value
 
     def render(self, ctx, transform):
-        self.params['transform'] = transform
-        self.params['modelview'] = ctx.modelview
-        self.params['projection'] = ctx.projection
+        animated = bool(self.animate and self.anim_inst)
+        if self._bounded != (self.mesh, animated):
+            self._bounded = self.mesh, animated
+            x, y, z, r = mesh_sphere(self.mesh)
+            if animated:
+                r *= ANIMATED_BOUNDS_SCALE
+            self.set_own_bounds((x, y, z, r))
+
+        # camera and light sources are read from the uniform blocks by the
+        # shaders which declare them
+        blocks = ctx.renderer.uniform_blocks(self.shader)
+        camera = CAMERA_BLOCK not in blocks
+
+        params = self.params
+        params['transform'] = transform
+        if camera:
+            params['modelview'] = ctx.modelview
+            params['projection'] = ctx.projection
 
         # let there be light?
         if self.enable_light:
-            self.params.update({
-                'lights[{}].{}'.format(light_id, p): v for light_id, p, v in
-                chain.from_iterable([
-                    [(light_id, p, v) for p, v in params.items()] for light_id, params in
-                    LIGHT_SOURCES.items()
-                ])
-            })
-            self.params['eye'] = ctx.camera.position
-            self.params['enable_light'] = 1
-
-        # submit computed animation pose data if requested and available
-        if self.animate and self.anim_inst:
-            self.params['animate'] = 1
-            self.params['joints[0]'] = self.anim_inst.skin_transforms
-
-        # compute absolute Z value of the node center for proper rendering order
-        v = (ctx.view * transform) * Vec(0, 0, 0, 1)
-
-        # schedule the node rendering
-        ctx.renderer.add_render_op(RenderOp(
-            v.z,
-            self.shader,
-            self.params,
-            self.mesh,
-            self.textures))
+            if LIGHTS_BLOCK not in blocks:
+                params.update(LIGHT_PARAMS)
+            if camera:
+                params['eye'] = ctx.camera.position
+            params['enable_light'] = 1
+
+        # submit computed animation pose data if requested and available;
+        # skinned meshes are batched only with those sharing their pose
+        if animated:
+            params['animate'] = 1
+            params['joints[0]'] = self.anim_inst.skin_transforms
+
+        # update the render operation in the render list
+        op = self.render_op
+        op.mesh = self.mesh
+        op.shader = self.shader
+        op.shader_params = params
+        op.textures = self.textures
+        op.camera_block = ctx.camera_block
+        op.batch = self.anim_inst if animated else None
+
+        # compute absolute Z value of the node center for proper rendering
+        # order, when the node or the view moved
+        if self.moved or ctx.view_changed:
+            op.key = ((ctx.view * transform) * Vec(0, 0, 0, 1)).z
@@ -7,6 +7,9 @@ MAX_LIGHT_SOURCES = 1
 #: Light sources data
 LIGHT_SOURCES = {}
 
+#: Light sources data, as shader parameters
+LIGHT_PARAMS = {}
+
 
 class Light:
     """Light source."""
@@ -42,8 +45,16 @@ class LightNode(SceneNode):
             raise RuntimeError('Maximum number of lights reached')
 
     def render(self, ctx, transform):
-        LIGHT_SOURCES[self.light_id] = {
+        # NOTE: the light data changes only when the node moves
+        if not self.moved and self.light_id in LIGHT_SOURCES:
+            return
+        params = LIGHT_SOURCES[self.light_id] = {
             'color': self.light.color,
             'position': Vec(transform[0, 3], transform[1, 3], transform[2, 3]),
             'shininess': self.light.shininess,
         }
+        for p, v in params.items():
+            LIGHT_PARAMS['lights[{}].{}'.format(self.light_id, p)] = v
+
+        # shader programs declaring the lights block read it from there
+        ctx.renderer.lights_block.update(self.light_id, **params)
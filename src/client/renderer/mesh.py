@@ -11,10 +11,12 @@ from OpenGL.GL import glBufferData
 from OpenGL.GL import glDeleteBuffers
 from OpenGL.GL import glDeleteVertexArrays
 from OpenGL.GL import glDrawElements
+from OpenGL.GL import glDrawElementsInstanced
 from OpenGL.GL import glEnableVertexAttribArray
 from OpenGL.GL import glGenBuffers
 from OpenGL.GL import glGenVertexArrays
 from OpenGL.GL import glVertexAttribPointer
+from matlib import Vec
 import ctypes
 import numpy as np
 
@@ -80,6 +82,13 @@ class Mesh:
         # initialize vertex buffer
         vertex_data = np.array(vertices, np.float32)
 
+        # compute the bounding box of the vertices
+        positions = vertex_data.reshape(-1, 3)
+        lo, hi = positions.min(axis=0), positions.max(axis=0)
+        self.bounding_box = (
+            Vec(float(lo[0]), float(lo[1]), float(lo[2]), 1),
+            Vec(float(hi[0]), float(hi[1]), float(hi[2]), 1))
+
         # append normals data, if provided
         normals_offset = 0
         if normals:
@@ -149,6 +158,20 @@ class Mesh:
         glDrawElements(GL_TRIANGLES, self.num_elements, GL_UNSIGNED_INT, None)
         glBindVertexArray(0)
 
+    def render_instanced(self, count):
+        """Renders many instances of the model with a single draw call.
+
+        NOTE: The current OpenGL context is used, thus, there *MUST* be one set
+        up and active before calling this method.
+
+        :param count: The number of instances
+        :type count: int
+        """
+        glBindVertexArray(self.vao)
+        glDrawElementsInstanced(
+            GL_TRIANGLES, self.num_elements, GL_UNSIGNED_INT, None, count)
+        glBindVertexArray(0)
+
 
 class Rect(Mesh):
     """2D rectangle mesh with origin in top left corner."""
@@ -19,17 +19,36 @@ from OpenGL.GL import glClearColor
 from OpenGL.GL import glCullFace
 from OpenGL.GL import glEnable
 from OpenGL.GL import glPolygonMode
-from contextlib import ExitStack
 from enum import IntEnum
 from enum import unique
 from exceptions import ConfigError
-from renderer.texture import Texture
+from heapq import merge
+from operator import attrgetter
+from renderer.light import MAX_LIGHT_SOURCES
+from renderer.uniform_buffer import CAMERA_BINDING
+from renderer.uniform_buffer import INSTANCES_BINDING
+from renderer.uniform_buffer import INSTANCES_BLOCK
+from renderer.uniform_buffer import INSTANCE_PARAMS
+from renderer.uniform_buffer import InstancesBlock
+from renderer.uniform_buffer import LIGHTS_BINDING
+from renderer.uniform_buffer import LightsBlock
+from renderer.uniform_buffer import MAX_INSTANCES
+from renderer.uniform_buffer import bind_blocks
+from renderer.uniforms import ParamBlock
+from renderer.uniforms import ShaderState
+from renderer.uniforms import UniformCounters
 import logging
 import surrender
 
 
 LOG = logging.getLogger(__name__)
 
+#: Sort key of the rendering operations
+RENDER_ORDER = attrgetter('order')
+
+#: Shader parameters read from the instances block by instanced shaders
+INSTANCED_PARAMS = frozenset(('transform',) + INSTANCE_PARAMS)
+
 
 @unique
 class PolygonMode(IntEnum):
@@ -53,6 +72,9 @@ class RenderOp:
 
     The renderer internally can reorder rendering operations for better
     efficiency and less OpenGL context switches.
+
+    Render operations of the scene nodes are persistent, and updated in place
+    at each frame.
     """
 
     def __init__(
@@ -79,12 +101,69 @@ class RenderOp:
         :param polygon_mode: Polygon rasterization mode to use during rendering.
         :type polygon_mode: :enum:`renderer.renderer.PolygonMode`
         """
-        self.key = key
         self.mesh = mesh
         self.shader = shader
         self.shader_params = shader_params
         self.textures = textures or []
         self.polygon_mode = polygon_mode
+        self.key = key
+        #: The binding of the shader parameters, built when rendered
+        self.param_block = None
+        #: The camera block of the scene of the operation, if any
+        self.camera_block = None
+        #: Operations sharing mesh, shader, textures and batch key can be
+        #: drawn with a single instanced draw call
+        self.batch = None
+        #: Whether the operation is drawn, False when culled
+        self.visible = True
+        #: The position of the operation in the render list of its scene
+        self.index = None
+
+    @property
+    def key(self):
+        """The key for indexing purpose."""
+        return self._key
+
+    @key.setter
+    def key(self, key):
+        self._key = key
+        #: The rendering order, by key and shader
+        self.order = key, self.shader.prog
+
+
+def batch_render_ops(ops, instanced):
+    """Groups the render operations to draw with instancing.
+
+    Runs of consecutive instanced operations sharing mesh, shader, textures,
+    camera block and batch key are grouped, the other operations are left
+    alone: the rendering order, back to front, is preserved.
+
+    :param ops: The render operations, in rendering order
+    :type ops: iterable of :class:`renderer.renderer.RenderOp`
+
+    :param instanced: Whether an operation is drawn with instancing
+    :type instanced: callable
+
+    :returns: The batches to draw, as (operations, instanced) tuples
+    :rtype: list
+    """
+    batches = []
+    last_key = None
+    for op in ops:
+        if not instanced(op):
+            batches.append(([op], False))
+            last_key = None
+            continue
+
+        key = (
+            op.mesh, op.shader.prog, tuple(op.textures), op.camera_block,
+            op.batch)
+        if key == last_key:
+            batches[-1][0].append(op)
+        else:
+            batches.append(([op], True))
+            last_key = key
+    return batches
 
 
 class Renderer:
@@ -118,6 +197,21 @@ class Renderer:
         self._height = height
         self.gl_setup(width, height)
         self.render_queue = []
+        self.render_lists = []
+        #: The parameters and values of each shader program, by program
+        self.shader_states = {}
+        #: The counters of the uploaded and skipped shader parameter values
+        self.uniform_counters = UniformCounters()
+        #: The uniform blocks declared by each shader program, by program
+        self.shader_blocks = {}
+        #: The light sources, shared by all the shader programs
+        self.lights_block = LightsBlock(MAX_LIGHT_SOURCES)
+        self.lights_block.bind(LIGHTS_BINDING)
+        #: The data of the instances drawn by the current draw call
+        self.instances_block = InstancesBlock()
+        self.instances_block.bind(INSTANCES_BINDING)
+        #: The number of draw calls of the last frame
+        self.draw_calls = 0
 
     def __del__(self):
         self.shutdown()
@@ -150,6 +244,41 @@ class Renderer:
         """Clear buffers."""
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
+    def param_block(self, shader, params, exclude=frozenset()):
+        """Binds shader parameters to a shader.
+
+        :param shader: The shader
+        :type shader: :class:`surrender.Shader`
+
+        :param params: The parameter values, mapped by name
+        :type params: dict
+
+        :param exclude: The names of the parameters not to bind
+        :type exclude: frozenset
+
+        :returns: The parameter block
+        :rtype: :class:`renderer.uniforms.ParamBlock`
+        """
+        state = self.shader_states.get(shader.prog)
+        if state is None:
+            state = self.shader_states[shader.prog] = ShaderState(shader)
+        return ParamBlock(state, params, exclude)
+
+    def uniform_blocks(self, shader):
+        """Returns the uniform blocks declared by a shader, binding them the
+        first time.
+
+        :param shader: The shader
+        :type shader: :class:`surrender.Shader`
+
+        :returns: The names of the blocks
+        :rtype: frozenset
+        """
+        blocks = self.shader_blocks.get(shader.prog)
+        if blocks is None:
+            blocks = self.shader_blocks[shader.prog] = bind_blocks(shader)
+        return blocks
+
     def add_render_op(self, op):
         """Add a rendering operation to rendering queue.
 
@@ -158,39 +287,86 @@ class Renderer:
         """
         self.render_queue.append(op)
 
-    def present(self):
-        """Present updated buffers to screen."""
+    def add_render_list(self, ops):
+        """Add a list of persistent rendering operations to render.
 
-        def sort_key(op):
-            return (op.key, op.shader.prog)
+        The list is sorted in place, in rendering order: lists which change
+        little between frames are sorted in linear time.
 
-        polygon_mode = PolygonMode.fill
+        :param ops: Rendering operations to perform.
+        :type ops: list of :class:`renderer.renderer.RenderOp`
+        """
+        self.render_lists.append(ops)
 
-        current_shader = None
-        for op in sorted(self.render_queue, key=sort_key, reverse=True):
-            # perform actual rendering
-            with ExitStack() as stack:
-                for tex_unit, tex in enumerate(op.textures):
-                    stack.enter_context(tex.use(tex_unit))
+    def present(self):
+        """Present updated buffers to screen."""
+        lists = self.render_lists
+        lists.append(self.render_queue)
+        for ops in lists:
+            ops.sort(key=RENDER_ORDER, reverse=True)
 
-                if op.shader.prog != current_shader:
-                    op.shader.use()
-                    current_shader = op.shader.prog
+        polygon_mode = PolygonMode.fill
+        counters = self.uniform_counters
+        instances = self.instances_block
+        draw_calls = 0
 
-                for k, v in op.shader_params.items():
-                    # FIXME: rework this
-                    if isinstance(v, Texture):
-                        v = v.tex_unit
-                    op.shader[k] = v
+        def instanced(op):
+            return INSTANCES_BLOCK in self.uniform_blocks(op.shader)
 
-                # change the polygon mode, if requested by render op
-                if polygon_mode != op.polygon_mode:
-                    glPolygonMode(GL_FRONT_AND_BACK, op.polygon_mode)
-                    polygon_mode = op.polygon_mode
+        current_shader = None
+        current_camera = None
+        batches = batch_render_ops(
+            (op for op in merge(*lists, key=RENDER_ORDER, reverse=True)
+             if op.visible),
+            instanced)
+        for group, is_instanced in batches:
+            # the first operation provides the state shared by the group
+            op = group[0]
 
+            # perform actual rendering
+            for tex_unit, tex in enumerate(op.textures):
+                tex.bind(tex_unit)
+
+            if op.shader.prog != current_shader:
+                op.shader.use()
+                current_shader = op.shader.prog
+
+            # bind the camera block of the scene of the operation
+            if op.camera_block is not None and (
+                    op.camera_block is not current_camera):
+                op.camera_block.bind(CAMERA_BINDING)
+                current_camera = op.camera_block
+
+            exclude = INSTANCED_PARAMS if is_instanced else frozenset()
+            block = op.param_block
+            if block is None or not block.matches(
+                    op.shader, op.shader_params, exclude):
+                block = op.param_block = self.param_block(
+                    op.shader, op.shader_params, exclude)
+            block.upload(counters)
+
+            # change the polygon mode, if requested by render op
+            if polygon_mode != op.polygon_mode:
+                glPolygonMode(GL_FRONT_AND_BACK, op.polygon_mode)
+                polygon_mode = op.polygon_mode
+
+            if is_instanced:
+                for start in range(0, len(group), MAX_INSTANCES):
+                    chunk = group[start:start + MAX_INSTANCES]
+                    instances.update(chunk)
+                    op.mesh.render_instanced(len(chunk))
+                    draw_calls += 1
+            else:
                 op.mesh.render()
+                draw_calls += 1
+
+            for tex in op.textures:
+                tex.unbind()
 
+        lists.clear()
         self.render_queue.clear()
+        counters.end_frame()
+        self.draw_calls = draw_calls
 
         surrender.render()
 
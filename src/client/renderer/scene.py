@@ -1,10 +1,16 @@
 from matlib import Mat
+from matlib import Vec
+from renderer.frustum import frustum_planes
+from renderer.frustum import merge_spheres
+from renderer.frustum import sphere_visible
+from renderer.frustum import transform_sphere
+from renderer.uniform_buffer import CameraBlock
 
 
 class SceneRenderContext:
     """Rendering context which is active during the current rendering pass."""
 
-    def __init__(self, rndr, cam):
+    def __init__(self, rndr, cam, camera_block=None):
         """Constructor.
 
         :param rndr: Active renderer.
@@ -12,12 +18,25 @@ class SceneRenderContext:
 
         :param cam: Current camera.
         :type cam: :class:`renderer.Camera`
+
+        :param camera_block: Uniform block of the camera of the scene.
+        :type camera_block: :class:`renderer.uniform_buffer.CameraBlock`
         """
         self._renderer = rndr
         self._camera = cam
         self._modelview_t = cam.modelview
         self._projection_t = cam.projection
         self._view = cam.projection * cam.modelview
+        #: Whether the view changed since the last render of the scene
+        self.view_changed = True
+        #: Uniform block of the camera, shared by the nodes of the scene
+        self.camera_block = camera_block
+        self._frustum = None
+
+    def update_camera_block(self):
+        """Writes the camera matrices to the camera block."""
+        self.camera_block.update(
+            self._modelview_t, self._projection_t, self._camera.position)
 
     @property
     def renderer(self):
@@ -44,6 +63,53 @@ class SceneRenderContext:
         """Combined projection and model view matrix."""
         return self._view
 
+    @property
+    def frustum(self):
+        """Planes of the view frustum, computed from the view."""
+        if self._frustum is None:
+            self._frustum = frustum_planes(self._view)
+        return self._frustum
+
+
+class Billboard:
+    """Local transformation of a node which faces the camera.
+
+    The node is rotated around the x-axis by the billboard angle of the
+    camera, which is read when the scene is rendered: the owners of the node
+    do not need to be updated when the camera moves.
+    """
+
+    def __init__(self, translation, scale=None):
+        """Constructor.
+
+        :param translation: The translation of the node
+        :type translation: :class:`matlib.Vec`
+
+        :param scale: The scale of the node, if any
+        :type scale: :class:`matlib.Vec`
+        """
+        self.translation = translation
+        self.scale = scale
+        #: The angle currently applied to the transformation
+        self.angle = None
+
+    def face(self, transform, angle):
+        """Rebuilds a transformation, if the angle changed.
+
+        :param transform: The local transformation of the node
+        :type transform: :class:`matlib.Mat`
+
+        :param angle: The billboard angle of the camera (in radians)
+        :type angle: float
+        """
+        if angle != self.angle:
+            self.angle = angle
+            transform.identity()
+            transform.translate(self.translation)
+            transform.rotate(Vec(1, 0, 0), angle)
+            if self.scale is not None:
+                transform.scale(self.scale)
+
 
 class Scene:
     """Visual scene which represents the tree of renderable objects.
@@ -54,6 +120,10 @@ class Scene:
 
     def __init__(self):
         self.root = RootNode()
+        # The view of the last render
+        self._view = None
+        # The camera block, created at the first render
+        self._camera_block = None
 
     def render(self, rndr, cam):
         """Render the scene using the given renderer.
@@ -64,7 +134,13 @@ class Scene:
         :param cam: Camera to use.
         :type cam: :class:`renderer.Camera`
         """
-        ctx = SceneRenderContext(rndr, cam)
+        if self._camera_block is None:
+            self._camera_block = CameraBlock()
+        ctx = SceneRenderContext(rndr, cam, self._camera_block)
+        ctx.view_changed = ctx.view != self._view
+        self._view = ctx.view
+        if ctx.view_changed:
+            ctx.update_camera_block()
         self.root.render(ctx)
 
 
@@ -77,12 +153,50 @@ class SceneNode:
     Each node has a transformation associated to it, which is local to the node.
     During rendering, that transformation will be chained to those of parent
     nodes and in turn, will affect children nodes.
+
+    Drawable nodes own a persistent render operation, which is added to the
+    render list of the scene when the node is attached to it and removed when
+    the node is detached: rendering only updates it in place.
+
+    Each node has a bounding sphere enclosing its geometry and those of its
+    descendants, used to skip the subtrees out of the view: the nodes of a
+    culled subtree are not rendered and their render operations are hidden.
+    The bounding sphere of a subtree is updated when its nodes are rendered.
     """
 
     def __init__(self):
         self._children = []
         self.parent = None
         self.transform = Mat()
+        #: The world transformation, updated at each render
+        self.world = Mat()
+        #: Whether the world transformation changed in the last render
+        self.moved = True
+        #: Whether the local transformation changed in the last render
+        self.transformed = True
+        #: The render operation of the node, None if it does not draw
+        self.render_op = None
+        #: The bounding sphere of the geometry of the node, in local
+        #: coordinates, None if the node does not draw
+        self.own_bounds = None
+        #: The bounding sphere of the subtree, in local coordinates, None
+        #: until computed or if the subtree does not draw
+        self.bounds = None
+        #: Whether the subtree was culled in the last render
+        self.culled = False
+        #: The billboard the local transformation follows, if any
+        self.billboard = None
+        # Copy of the local transformation applied to the world one
+        self._applied = Mat()
+        # Whether the local transformation must be applied again, even if
+        # unchanged
+        self._reapply = True
+        # Whether the bounding sphere of the subtree must be recomputed
+        self._bounds_dirty = True
+        # The bounding sphere of the subtree in world coordinates, along with
+        # the local one it was computed from
+        self._world_bounds = None
+        self._world_bounds_of = None
 
     def render(self, ctx, transform):
         """Renders the node.
@@ -100,6 +214,96 @@ class SceneNode:
         """
         pass
 
+    def update_world(self, parent, moved):
+        """Updates the world transformation, if the node or its parent moved.
+
+        :param parent: The parent node, None for the root
+        :type parent: :class:`renderer.scene.SceneNode`
+
+        :param moved: Whether the parent moved
+        :type moved: bool
+
+        :returns: Whether the node moved
+        :rtype: bool
+        """
+        transformed = self._reapply or self.transform != self._applied
+        if moved or transformed:
+            self._reapply = False
+            applied = self._applied
+            applied.identity()
+            applied *= self.transform
+            world = self.world
+            world.identity()
+            if parent is not None:
+                world *= parent.world
+            world *= self.transform
+            moved = True
+        self.moved = moved
+        self.transformed = transformed
+        return moved
+
+    def set_own_bounds(self, sphere):
+        """Sets the bounding sphere of the geometry of the node.
+
+        :param sphere: The bounding sphere, in local coordinates, None if the
+            node does not draw
+        :type sphere: tuple
+        """
+        if sphere != self.own_bounds:
+            self.own_bounds = sphere
+            self._bounds_dirty = True
+
+    def update_bounds(self, changed):
+        """Recomputes the bounding sphere of the subtree, if needed.
+
+        :param changed: Whether the transformations or the bounding spheres of
+            the children changed
+        :type changed: bool
+
+        :returns: Whether the bounding sphere changed
+        :rtype: bool
+        """
+        if not (changed or self._bounds_dirty):
+            return False
+        self._bounds_dirty = False
+        bounds = self.own_bounds
+        for child in self._children:
+            if child.bounds is not None:
+                bounds = merge_spheres(
+                    bounds, transform_sphere(child.transform, child.bounds))
+        if bounds == self.bounds:
+            return False
+        self.bounds = bounds
+        return True
+
+    def world_bounds(self):
+        """Returns the bounding sphere of the subtree in world coordinates.
+
+        :returns: The bounding sphere, None if unknown
+        :rtype: tuple
+        """
+        bounds = self.bounds
+        if bounds is None:
+            return None
+        if self.moved or bounds is not self._world_bounds_of:
+            self._world_bounds = transform_sphere(self.world, bounds)
+            self._world_bounds_of = bounds
+        return self._world_bounds
+
+    def walk(self):
+        """Iterates over the node and all its descendants."""
+        yield self
+        for child in self._children:
+            yield from child.walk()
+
+    @property
+    def root(self):
+        """The root of the scene the node is attached to, if any."""
+        node = self
+        while node.parent:
+            node = node.parent
+        return node if isinstance(node, RootNode) else None
+
     @property
     def children(self):
         """List tof children nodes."""
@@ -116,6 +320,10 @@ class SceneNode:
         """
         node.parent = self
         self._children.append(node)
+        self._bounds_dirty = True
+        root = self.root
+        if root:
+            root.attach(node)
         return node
 
     def remove_child(self, node):
@@ -126,9 +334,13 @@ class SceneNode:
         """
         try:
             self._children.remove(node)
-            node.parent = None
         except ValueError:
-            pass
+            return
+        self._bounds_dirty = True
+        root = self.root
+        if root:
+            root.detach(node)
+        node.parent = None
 
     def to_world(self, pos):
         """Transform local coordinate to world.
@@ -152,20 +364,106 @@ class RootNode(SceneNode):
     """A special node used as root for the scene tree, which `render()` method
     renders the entire tree and performs the parent-child transformations
     chaining.
-    """
 
-    def render(self, ctx, transform=None):
-        self.t = Mat()
+    The root keeps the render list of the scene, that is the render operations
+    of the attached nodes, in rendering order as of the last frame. Operations
+    know their position in the list, so that they are removed in constant time
+    by moving the last one in their place.
+    """
 
-        def render_all(node, parent_transform):
-            self.t.identity()
-            self.t *= parent_transform
-            self.t *= node.transform
-            new_t = Mat(self.t)
-            node.render(ctx, new_t)
+    def __init__(self):
+        super().__init__()
+        #: The render operations of the nodes attached to the scene
+        self.render_ops = []
+        # Whether the operations know their position in the list, which is
+        # sorted by the renderer at each frame
+        self._indexed = True
+        #: Number of nodes visited in the last render
+        self.visited = 0
+        #: Number of subtrees culled in the last render
+        self.culled_count = 0
+
+    def attach(self, node):
+        """Adds the render operations of a subtree to the render list.
+
+        :param node: The root of the subtree
+        :type node: :class:`renderer.scene.SceneNode`
+        """
+        ops = self.render_ops
+        for n in node.walk():
+            op = n.render_op
+            if op is not None:
+                # NOTE: operations are shown when their node is rendered
+                op.visible = False
+                op.index = len(ops)
+                ops.append(op)
+
+    def detach(self, node):
+        """Removes the render operations of a subtree from the render list.
+
+        :param node: The root of the subtree
+        :type node: :class:`renderer.scene.SceneNode`
+        """
+        ops = self.render_ops
+        if not self._indexed:
+            for i, op in enumerate(ops):
+                op.index = i
+            self._indexed = True
+
+        for n in node.walk():
+            # NOTE: world transformations are recomputed on attach
+            n._reapply = True
+            op = n.render_op
+            if op is not None:
+                last = ops.pop()
+                if last is not op:
+                    ops[op.index] = last
+                    last.index = op.index
+                op.index = None
 
+    def render(self, ctx, transform=None):
+        frustum = ctx.frustum
+        visited = culled = 0
+
+        def render_all(node, parent, moved):
+            nonlocal visited, culled
+            visited += 1
+            if node.billboard is not None:
+                node.billboard.face(
+                    node.transform, ctx.camera.billboard_angle)
+            moved = node.update_world(parent, moved)
+
+            # skip the subtree if out of the view, hiding its operations
+            bounds = node.world_bounds()
+            if bounds is not None and not sphere_visible(frustum, bounds):
+                culled += 1
+                if not node.culled:
+                    node.culled = True
+                    for n in node.walk():
+                        if n.render_op is not None:
+                            n.render_op.visible = False
+                return node.transformed
+
+            # NOTE: the world transformations in a subtree are not updated
+            # while it is culled
+            if node.culled:
+                node.culled = False
+                moved = True
+
+            if node.render_op is not None:
+                node.render_op.visible = True
+            node.render(ctx, node.world)
+
+            changed = False
             for child in node.children:
-                render_all(child, new_t)
+                changed |= render_all(child, node, moved)
+            return node.update_bounds(changed) or node.transformed
 
+        moved = self.update_world(None, False)
         for child in self.children:
-            render_all(child, self.transform)
+            render_all(child, self, moved)
+        self.visited = visited
+        self.culled_count = culled
+
+        ctx.renderer.add_render_list(self.render_ops)
+        self._indexed = False
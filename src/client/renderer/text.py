@@ -1,7 +1,9 @@
 from matlib import Vec
+from renderer.frustum import mesh_sphere
 from renderer.renderer import RenderOp
 from renderer.mesh import Rect
 from renderer.scene import SceneNode
+from renderer.uniform_buffer import CAMERA_BLOCK
 
 
 class TextNode(SceneNode):
@@ -24,11 +26,13 @@ class TextNode(SceneNode):
         """
         super(TextNode, self).__init__()
         self.font = font
+        self.shader = shader
 
         # initialize shader parameters
+        self.params = {}
+        self.render_op = RenderOp(0, shader, self.params, None)
         self._text = None
         self.text = text
-        self.shader = shader
         self.color = color
 
     @property
@@ -51,6 +55,12 @@ class TextNode(SceneNode):
             self._text = text
             self._texture = self.font.render_to_texture(text)
             self._rect = Rect(self._texture.width, self._texture.height, False)
+            self.set_own_bounds(mesh_sphere(self._rect))
+            self.params['width'] = self.width
+            self.params['height'] = self.height
+            self.params['tex'] = self._texture
+            self.render_op.mesh = self._rect
+            self.render_op.textures = [self._texture]
 
     @property
     def width(self):
@@ -70,19 +80,18 @@ class TextNode(SceneNode):
     def color(self, color):
         """Color of the text node."""
         self._color = color
+        self.params['color'] = color
 
     def render(self, ctx, transform):
-        params = {
-            'color': self._color,
-            'width': self.width,
-            'height': self.height,
-            'tex': self._texture,
-            'transform': transform,
-            'modelview': ctx.modelview,
-            'projection': ctx.projection,
-        }
-
-        v = (ctx.view * transform) * Vec(0, 0, 0, 1)
-
-        ctx.renderer.add_render_op(RenderOp(
-            v.z, self.shader, params, self._rect, textures=[self._texture]))
+        params = self.params
+        params['transform'] = transform
+        if CAMERA_BLOCK not in ctx.renderer.uniform_blocks(self.shader):
+            params['modelview'] = ctx.modelview
+            params['projection'] = ctx.projection
+        self.render_op.camera_block = ctx.camera_block
+
+        # update the render operation in the render list, when the node or
+        # the view moved
+        if self.moved or ctx.view_changed:
+            v = (ctx.view * transform) * Vec(0, 0, 0, 1)
+            self.render_op.key = v.z
@@ -230,9 +230,9 @@ class Texture:
 
         return Texture(tex, w, h, GL_TEXTURE_2D)
 
-    @contextmanager
-    def use(self, tex_unit):
-        """Makes the given texture as active in the rendering pipeline.
+    def bind(self, tex_unit):
+        """Makes the given texture as active in the rendering pipeline, until
+        it is unbound.
 
         :param tex_unit: OpenGL texture image unit to make active.
         :type tex_unit: int
@@ -241,5 +241,18 @@ class Texture:
         glActiveTexture(GL_TEXTURE0 + self.tex_unit)
         glBindTexture(self.tex_type, self.tex_id)
         glBindSampler(self.tex_unit, self.sampler)
-        yield
+
+    def unbind(self):
+        """Unbinds the texture from the active texture image unit."""
         glBindTexture(self.tex_type, 0)
+
+    @contextmanager
+    def use(self, tex_unit):
+        """Makes the given texture as active in the rendering pipeline.
+
+        :param tex_unit: OpenGL texture image unit to make active.
+        :type tex_unit: int
+        """
+        self.bind(tex_unit)
+        yield
+        self.unbind()
@@ -0,0 +1,258 @@
+"""Uniform buffer objects.
+
+The state shared by all the render operations of a frame, the camera
+matrices and the light sources, is stored in std140 uniform blocks, written
+once per frame and read by all the shader programs which declare them:
+
+    layout(std140) uniform Camera {
+        mat4 modelview;
+        mat4 projection;
+        vec4 eye;
+    };
+
+    struct Light {
+        vec4 color;
+        vec4 position;
+        float shininess;
+    };
+
+    layout(std140) uniform Lights {
+        Light lights[MAX_LIGHT_SOURCES];
+    };
+
+Shader programs which declare the instances block draw many instances of a
+mesh at once, each reading its own data at `gl_InstanceID`:
+
+    struct Instance {
+        mat4 transform;
+        vec4 data;  // opacity, value
+    };
+
+    layout(std140) uniform Instances {
+        Instance instances[MAX_INSTANCES];
+    };
+
+Shader programs which do not declare the blocks keep receiving the same data
+as plain shader parameters.
+"""
+from OpenGL.GL import GL_DYNAMIC_DRAW
+from OpenGL.GL import GL_INVALID_INDEX
+from OpenGL.GL import GL_UNIFORM_BUFFER
+from OpenGL.GL import glBindBuffer
+from OpenGL.GL import glBindBufferBase
+from OpenGL.GL import glBufferData
+from OpenGL.GL import glBufferSubData
+from OpenGL.GL import glDeleteBuffers
+from OpenGL.GL import glGenBuffers
+from OpenGL.GL import glGetUniformBlockIndex
+from OpenGL.GL import glUniformBlockBinding
+import logging
+import numpy as np
+
+
+LOG = logging.getLogger(__name__)
+
+#: Name of the camera block
+CAMERA_BLOCK = 'Camera'
+
+#: Name of the lights block
+LIGHTS_BLOCK = 'Lights'
+
+#: Name of the instances block
+INSTANCES_BLOCK = 'Instances'
+
+#: Binding point of the camera block
+CAMERA_BINDING = 0
+
+#: Binding point of the lights block
+LIGHTS_BINDING = 1
+
+#: Binding point of the instances block
+INSTANCES_BINDING = 2
+
+#: Binding points of the uniform blocks, mapped by block name
+BLOCK_BINDINGS = {
+    CAMERA_BLOCK: CAMERA_BINDING,
+    LIGHTS_BLOCK: LIGHTS_BINDING,
+    INSTANCES_BLOCK: INSTANCES_BINDING,
+}
+
+#: Size of a light source in the lights block, in floats (std140 rounds the
+#: size of array elements up to a multiple of a vec4)
+LIGHT_SIZE = 12
+
+#: Maximum number of instances drawn at once (the instances block must fit
+#: in the 16KB guaranteed for uniform blocks)
+MAX_INSTANCES = 128
+
+#: Size of an instance in the instances block, in floats
+INSTANCE_SIZE = 20
+
+#: Shader parameters of the instances, stored in order in the data vector of
+#: the instances block
+INSTANCE_PARAMS = ('opacity', 'value')
+
+
+def column_major(mat):
+    """Returns the elements of a matrix in column-major order.
+
+    Matrices are stored in row-major order, while std140 matrices default to
+    column-major.
+
+    :param mat: The matrix
+    :type mat: :class:`matlib.Mat`
+
+    :returns: The 16 elements of the matrix
+    :rtype: :class:`numpy.ndarray`
+    """
+    return np.frombuffer(mat, np.float32).reshape(4, 4).T.ravel()
+
+
+def bind_blocks(shader):
+    """Binds the uniform blocks declared by a shader program to their binding
+    points.
+
+    :param shader: The shader
+    :type shader: :class:`surrender.Shader`
+
+    :returns: The names of the blocks declared by the program
+    :rtype: frozenset
+    """
+    blocks = set()
+    for name, binding in BLOCK_BINDINGS.items():
+        index = glGetUniformBlockIndex(shader.prog, name.encode('ascii'))
+        if index != GL_INVALID_INDEX:
+            glUniformBlockBinding(shader.prog, index, binding)
+            blocks.add(name)
+    if blocks:
+        LOG.debug('Program {} uses uniform blocks {}'.format(
+            shader.prog, sorted(blocks)))
+    return frozenset(blocks)
+
+
+class UniformBuffer:
+    """Uniform buffer object backing a uniform block.
+
+    The content of the buffer is staged in a float array, which is uploaded
+    as a whole when changed.
+
+    NOTE: it should be instantiated and used only when a valid OpenGL 3.1+
+    context is set up and active.
+    """
+
+    def __init__(self, size):
+        """Constructor.
+
+        :param size: The size of the block, in floats
+        :type size: int
+        """
+        self.data = np.zeros(size, np.float32)
+        self.ubo = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferData(
+            GL_UNIFORM_BUFFER, self.data.nbytes, self.data, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+
+    def __del__(self):
+        glDeleteBuffers(1, [self.ubo])
+
+    def upload(self, size=None):
+        """Uploads the staged content to the buffer.
+
+        :param size: The number of floats to upload, all of them by default
+        :type size: int
+        """
+        data = self.data if size is None else self.data[:size]
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, data.nbytes, data)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+
+    def bind(self, binding):
+        """Binds the buffer to a binding point.
+
+        :param binding: The binding point
+        :type binding: int
+        """
+        glBindBufferBase(GL_UNIFORM_BUFFER, binding, self.ubo)
+
+
+class CameraBlock(UniformBuffer):
+    """Camera matrices of a scene."""
+
+    def __init__(self):
+        super().__init__(36)
+
+    def update(self, modelview, projection, eye):
+        """Updates the camera data.
+
+        :param modelview: The model-view matrix
+        :type modelview: :class:`matlib.Mat`
+
+        :param projection: The projection matrix
+        :type projection: :class:`matlib.Mat`
+
+        :param eye: The camera position
+        :type eye: :class:`matlib.Vec`
+        """
+        data = self.data
+        data[0:16] = column_major(modelview)
+        data[16:32] = column_major(projection)
+        data[32:36] = eye.x, eye.y, eye.z, eye.w
+        self.upload()
+
+
+class LightsBlock(UniformBuffer):
+    """Light sources of the game."""
+
+    def __init__(self, count):
+        """Constructor.
+
+        :param count: The maximum number of light sources
+        :type count: int
+        """
+        super().__init__(count * LIGHT_SIZE)
+
+    def update(self, light_id, color, position, shininess):
+        """Updates the data of a light source.
+
+        :param light_id: The light source id
+        :type light_id: int
+
+        :param color: The light color
+        :type color: :class:`matlib.Vec`
+
+        :param position: The light position
+        :type position: :class:`matlib.Vec`
+
+        :param shininess: The light shininess
+        :type shininess: float
+        """
+        offset = light_id * LIGHT_SIZE
+        light = self.data[offset:offset + LIGHT_SIZE]
+        light[0:4] = color.x, color.y, color.z, color.w
+        light[4:8] = position.x, position.y, position.z, position.w
+        light[8] = shininess
+        self.upload()
+
+
+class InstancesBlock(UniformBuffer):
+    """Data of the instances of a mesh drawn at once."""
+
+    def __init__(self):
+        super().__init__(MAX_INSTANCES * INSTANCE_SIZE)
+
+    def update(self, ops):
+        """Writes the data of the instances drawn by render operations.
+
+        :param ops: The render operations, at most `MAX_INSTANCES`
+        :type ops: list of :class:`renderer.renderer.RenderOp`
+        """
+        data = self.data
+        offset = 0
+        for op in ops:
+            params = op.shader_params
+            data[offset:offset + 16] = column_major(params['transform'])
+            for i, name in enumerate(INSTANCE_PARAMS, offset + 16):
+                data[i] = params.get(name, 0)
+            offset += INSTANCE_SIZE
+        self.upload(offset)
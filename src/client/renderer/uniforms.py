@@ -0,0 +1,158 @@
+"""Shader parameter (uniform) bindings.
+
+The parameters of each shader program are resolved once by name, and the
+values uploaded to each program are shadowed: values equal to the ones the
+program already holds are not uploaded again. Render operations bind their
+shader parameters through a parameter block, which keeps the parameters of
+the program resolved for the names in the operation.
+"""
+from matlib import Mat
+from matlib import Vec
+from renderer.texture import Texture
+import logging
+
+
+LOG = logging.getLogger(__name__)
+
+
+def shadow_copy(value):
+    """Returns a copy of a parameter value, to compare it with later values.
+
+    :param value: The parameter value
+    :type value: :class:`matlib.Mat`, :class:`matlib.Vec`, int or float
+
+    :returns: The copy, None for values which can not be compared (arrays
+        whose content changes in place)
+    :rtype: :class:`matlib.Mat`, :class:`matlib.Vec`, int or float
+    """
+    if isinstance(value, (int, float)):
+        return value
+    elif isinstance(value, Mat):
+        return Mat(value)
+    elif isinstance(value, Vec):
+        return Vec(value.x, value.y, value.z, value.w)
+    return None
+
+
+class UniformCounters:
+    """Counters of the uploaded and skipped parameter values."""
+
+    def __init__(self):
+        #: Values uploaded in the current frame
+        self.uploaded = 0
+        #: Values skipped in the current frame
+        self.skipped = 0
+        #: Values uploaded and skipped in the last frame
+        self.last = (0, 0)
+        #: Values uploaded and skipped since the start, and number of frames
+        self.total = [0, 0, 0]
+
+    def end_frame(self):
+        """Stores the counters of the current frame and resets them."""
+        self.last = self.uploaded, self.skipped
+        total = self.total
+        total[0] += self.uploaded
+        total[1] += self.skipped
+        total[2] += 1
+        self.uploaded = self.skipped = 0
+
+
+class ShaderState:
+    """Parameters and uploaded values of a shader program."""
+
+    def __init__(self, shader):
+        """Constructor.
+
+        :param shader: The shader
+        :type shader: :class:`surrender.Shader`
+        """
+        self.shader = shader
+        #: The parameters of the program, mapped by name
+        self.params = {}
+        #: Copies of the values held by the program, mapped by name
+        self.values = {}
+
+    def param(self, name):
+        """Returns a parameter of the program, resolving it the first time.
+
+        :param name: The parameter name
+        :type name: str
+
+        :returns: The parameter
+        :rtype: :class:`surrender.ShaderParam`
+        """
+        param = self.params.get(name)
+        if param is None:
+            param = self.params[name] = self.shader[name]
+        return param
+
+
+class ParamBlock:
+    """Binding of a set of parameter values to a shader program."""
+
+    def __init__(self, state, params, exclude=frozenset()):
+        """Constructor.
+
+        :param state: The state of the shader program
+        :type state: :class:`renderer.uniforms.ShaderState`
+
+        :param params: The parameter values, mapped by name
+        :type params: dict
+
+        :param exclude: The names of the parameters not to bind
+        :type exclude: frozenset
+        """
+        self.state = state
+        self.params = params
+        self.exclude = exclude
+        self.size = len(params)
+        #: The names of the parameters, along with the program parameters
+        self.bindings = [
+            (name, state.param(name))
+            for name in params if name not in exclude]
+
+    def matches(self, shader, params, exclude=frozenset()):
+        """Whether the block binds the given parameters to the shader.
+
+        :param shader: The shader
+        :type shader: :class:`surrender.Shader`
+
+        :param params: The parameter values, mapped by name
+        :type params: dict
+
+        :param exclude: The names of the parameters not to bind
+        :type exclude: frozenset
+
+        :returns: Whether the block matches
+        :rtype: bool
+        """
+        return (
+            self.state.shader is shader and
+            self.params is params and
+            self.size == len(params) and
+            self.exclude == exclude)
+
+    def upload(self, counters):
+        """Uploads the parameter values which changed to the program.
+
+        NOTE: the program must be in use.
+
+        :param counters: The counters of uploaded and skipped values
+        :type counters: :class:`renderer.uniforms.UniformCounters`
+        """
+        params = self.params
+        values = self.state.values
+        for name, param in self.bindings:
+            value = params[name]
+            # FIXME: rework this
+            if isinstance(value, Texture):
+                value = value.tex_unit
+
+            current = values.get(name)
+            if current is not None and current == value:
+                counters.skipped += 1
+                continue
+
+            param.set(value)
+            values[name] = shadow_copy(value)
+            counters.uploaded += 1
@@ -0,0 +1,144 @@
+"""Entity update scheduler.
+
+Entities are updated every frame, at a fixed rate, or not at all while they
+sleep: entities which report to be idle after an update are put to sleep
+until something wakes them up (usually an event concerning them).
+"""
+from collections import defaultdict
+import time
+
+
+class UpdateScheduler:
+    """Scheduler of the entity updates.
+
+    Entities are identified by their local id. Fixed-rate entities are
+    updated with the time elapsed since their last update.
+    """
+
+    def __init__(self):
+        #: The entities updated every frame, mapped by local id
+        self.frame = {}
+        #: The fixed-rate entities as [entity, period, elapsed], by local id
+        self.fixed = {}
+        #: The sleeping entities, mapped by local id
+        self.sleeping = {}
+        # The update rate (in Hz) of each entity, None for every frame
+        self._rates = {}
+        # Number of updates and total update time, by entity type
+        self._timings = defaultdict(lambda: [0, 0.0])
+
+    def __len__(self):
+        return len(self._rates)
+
+    def add(self, entity, rate=None):
+        """Schedules the updates of an entity.
+
+        :param entity: The entity
+        :type entity: :class:`game.entities.entity.Entity`
+
+        :param rate: The update rate (in Hz), every frame if None
+        :type rate: float
+        """
+        self._rates[entity.e_id] = rate
+        self._schedule(entity)
+
+    def _schedule(self, entity):
+        rate = self._rates[entity.e_id]
+        if rate:
+            self.fixed[entity.e_id] = [entity, 1.0 / rate, 0.0]
+        else:
+            self.frame[entity.e_id] = entity
+
+    def _unschedule(self, e_id):
+        if e_id in self.frame:
+            return self.frame.pop(e_id)
+        elif e_id in self.fixed:
+            return self.fixed.pop(e_id)[0]
+        return self.sleeping.pop(e_id)
+
+    def remove(self, e_id):
+        """Stops the updates of an entity.
+
+        :param e_id: The local entity id
+        :type e_id: int
+        """
+        if e_id in self._rates:
+            del self._rates[e_id]
+            self._unschedule(e_id)
+
+    def set_rate(self, e_id, rate):
+        """Changes the update rate of an entity, if needed.
+
+        :param e_id: The local entity id
+        :type e_id: int
+
+        :param rate: The update rate (in Hz), every frame if None
+        :type rate: float
+        """
+        if e_id not in self._rates or self._rates[e_id] == rate:
+            return
+        self._rates[e_id] = rate
+        if e_id not in self.sleeping:
+            self._schedule(self._unschedule(e_id))
+
+    def sleep(self, e_id):
+        """Stops updating an entity until it is woken up.
+
+        :param e_id: The local entity id
+        :type e_id: int
+        """
+        if e_id in self._rates and e_id not in self.sleeping:
+            self.sleeping[e_id] = self._unschedule(e_id)
+
+    def wake(self, e_id):
+        """Wakes up a sleeping entity.
+
+        :param e_id: The local entity id
+        :type e_id: int
+        """
+        entity = self.sleeping.pop(e_id, None)
+        if entity is not None:
+            self._schedule(entity)
+
+    def update(self, dt):
+        """Updates the entities due.
+
+        Entities which are idle after the update are put to sleep.
+
+        :param dt: Time delta from last update.
+        :type dt: float
+        """
+        timings = self._timings
+        clock = time.perf_counter
+        idle = []
+
+        due = [(entity, dt) for entity in self.frame.values()]
+        for entry in self.fixed.values():
+            entry[2] += dt
+            if entry[2] >= entry[1]:
+                due.append((entry[0], entry[2]))
+                entry[2] = 0.0
+
+        for entity, elapsed in due:
+            start = clock()
+            entity.update(elapsed)
+            timing = timings[type(entity).__name__]
+            timing[0] += 1
+            timing[1] += clock() - start
+            if entity.is_idle():
+                idle.append(entity.e_id)
+
+        for e_id in idle:
+            self.sleep(e_id)
+
+    def timings(self):
+        """Returns the update timings, by entity type.
+
+        :returns: list of (name, calls, total) tuples, total time in seconds,
+            sorted by total time
+        :rtype: list
+        """
+        return sorted(
+            ((name, calls, total)
+             for name, (calls, total) in self._timings.items()),
+            key=lambda timing: timing[2], reverse=True)
@@ -0,0 +1,337 @@
+"""Spatial index of the entity bounding boxes.
+
+Bounding boxes are stored in a uniform grid of square cells on the ground
+(xz) plane of the scene: every box is referenced by all the cells it
+overlaps, so that queries only visit the cells around the queried area
+instead of every entity.
+
+Exact ray/box intersections are computed with NumPy, for many boxes at once.
+"""
+from math import floor
+from math import inf
+import numpy as np
+
+
+#: Default size of the cells of the grid (in scene units)
+CELL_SIZE = 4.0
+
+
+def ray_aabb(pos, ray, lo, hi):
+    """Intersects rays with axis aligned bounding boxes (slab method).
+
+    Tests one ray against N boxes, given `pos` and `ray` of shape (3,), or N
+    rays against N boxes, pairwise, given `pos` and `ray` of shape (N, 3).
+    Arguments are broadcasted, so that N rays can be tested against M boxes
+    with shapes (N, 1, 3) and (M, 3), obtaining (N, M) distances.
+
+    Distances are in units of the ray length: 0 when the origin is inside the
+    box and infinity when the ray misses it.
+
+    :param pos: The origins of the rays
+    :type pos: :class:`numpy.ndarray`
+
+    :param ray: The directions of the rays
+    :type ray: :class:`numpy.ndarray`
+
+    :param lo: The minimum corners of the boxes, shape (N, 3)
+    :type lo: :class:`numpy.ndarray`
+
+    :param hi: The maximum corners of the boxes, shape (N, 3)
+    :type hi: :class:`numpy.ndarray`
+
+    :returns: The hit distances
+    :rtype: :class:`numpy.ndarray`
+    """
+    pos = np.asarray(pos, dtype=np.float64)
+    ray = np.asarray(ray, dtype=np.float64)
+    parallel = ray == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1.0 / ray
+        t_lo = (lo - pos) * inv
+        t_hi = (hi - pos) * inv
+
+    # Rays parallel to a slab either always or never are within it
+    inside = (lo <= pos) & (pos <= hi)
+    t_near = np.where(
+        parallel, np.where(inside, -inf, inf), np.minimum(t_lo, t_hi))
+    t_far = np.where(
+        parallel, np.where(inside, inf, -inf), np.maximum(t_lo, t_hi))
+
+    enter = t_near.max(axis=-1)
+    leave = t_far.min(axis=-1)
+    hit = (enter <= leave) & (leave >= 0)
+    return np.where(hit, np.maximum(enter, 0.0), inf)
+
+
+class SpatialGrid:
+    """Uniform grid of axis aligned bounding boxes.
+
+    Boxes are identified by a key (usually the local entity id) and given as
+    pairs of minimum and maximum corners, in scene coordinates.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        """Constructor.
+
+        :param cell_size: The size of the cells
+        :type cell_size: float
+        """
+        self.cell_size = cell_size
+        #: The keys of the boxes overlapping each cell, mapped by cell
+        self.cells = {}
+        #: The boxes as (lx, ly, lz, mx, my, mz) tuples, mapped by key
+        self.boxes = {}
+        # The range of cells (cx0, cz0, cx1, cz1) of each box, mapped by key
+        self._spans = {}
+        # Conservative bounds of the indexed boxes, never shrinked on removal:
+        # lowest bottom, highest top and range of cells
+        self._bottom, self._top = inf, -inf
+        self._extent = None
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __contains__(self, key):
+        return key in self.boxes
+
+    def cell(self, x, z):
+        """Returns the cell containing the given point.
+
+        :param x: The x coordinate
+        :type x: float
+
+        :param z: The z coordinate
+        :type z: float
+
+        :returns: The cell coordinates
+        :rtype: tuple
+        """
+        return floor(x / self.cell_size), floor(z / self.cell_size)
+
+    def span(self, x0, z0, x1, z1):
+        """Returns the range of cells overlapping the given rectangle.
+
+        :returns: tuple (cx0, cz0, cx1, cz1), bounds included
+        :rtype: tuple
+        """
+        return self.cell(x0, z0) + self.cell(x1, z1)
+
+    def insert(self, key, bb):
+        """Inserts or updates a box.
+
+        Moving a box within the same cells does not touch the grid.
+
+        :param key: The key of the box
+        :type key: hashable
+
+        :param bb: The minimum and maximum corners of the box
+        :type bb: tuple
+        """
+        l, m = bb
+        box = l.x, l.y, l.z, m.x, m.y, m.z
+        self.boxes[key] = box
+        self._bottom = min(self._bottom, box[1])
+        self._top = max(self._top, box[4])
+
+        span = self.span(box[0], box[2], box[3], box[5])
+        old_span = self._spans.get(key)
+        if span == old_span:
+            return
+        if old_span:
+            self._unlink(key, old_span)
+        self._spans[key] = span
+        cx0, cz0, cx1, cz1 = span
+        if self._extent:
+            ex0, ez0, ex1, ez1 = self._extent
+            span = min(cx0, ex0), min(cz0, ez0), max(cx1, ex1), max(cz1, ez1)
+        self._extent = span
+        for cx in range(cx0, cx1 + 1):
+            for cz in range(cz0, cz1 + 1):
+                self.cells.setdefault((cx, cz), set()).add(key)
+
+    def remove(self, key):
+        """Removes a box, if indexed.
+
+        :param key: The key of the box
+        :type key: hashable
+        """
+        if self.boxes.pop(key, None) is not None:
+            self._unlink(key, self._spans.pop(key))
+
+    def _unlink(self, key, span):
+        cx0, cz0, cx1, cz1 = span
+        for cx in range(cx0, cx1 + 1):
+            for cz in range(cz0, cz1 + 1):
+                keys = self.cells[cx, cz]
+                keys.discard(key)
+                if not keys:
+                    del self.cells[cx, cz]
+
+    def _collect(self, span):
+        cx0, cz0, cx1, cz1 = span
+        found = set()
+        cells = self.cells
+        if (cx1 - cx0 + 1) * (cz1 - cz0 + 1) > len(cells):
+            # The area is bigger than the populated part of the grid
+            for (cx, cz), keys in cells.items():
+                if cx0 <= cx <= cx1 and cz0 <= cz <= cz1:
+                    found |= keys
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cz in range(cz0, cz1 + 1):
+                    keys = cells.get((cx, cz))
+                    if keys:
+                        found |= keys
+        return found
+
+    def rect(self, x0, z0, x1, z1):
+        """Finds the boxes overlapping the given rectangle on the ground.
+
+        :param x0: The minimum x coordinate
+        :type x0: float
+
+        :param z0: The minimum z coordinate
+        :type z0: float
+
+        :param x1: The maximum x coordinate
+        :type x1: float
+
+        :param z1: The maximum z coordinate
+        :type z1: float
+
+        :returns: The keys of the boxes
+        :rtype: set
+        """
+        boxes = self.boxes
+        return {
+            key for key in self._collect(self.span(x0, z0, x1, z1))
+            if (boxes[key][0] <= x1 and boxes[key][3] >= x0 and
+                boxes[key][2] <= z1 and boxes[key][5] >= z0)
+        }
+
+    def radius(self, x, z, r):
+        """Finds the boxes within the given distance from a ground point.
+
+        :param x: The x coordinate
+        :type x: float
+
+        :param z: The z coordinate
+        :type z: float
+
+        :param r: The distance
+        :type r: float
+
+        :returns: The keys of the boxes
+        :rtype: set
+        """
+        found = set()
+        r2 = r * r
+        for key in self._collect(self.span(x - r, z - r, x + r, z + r)):
+            lx, _, lz, mx, _, mz = self.boxes[key]
+            dx = max(lx - x, 0, x - mx)
+            dz = max(lz - z, 0, z - mz)
+            if dx * dx + dz * dz <= r2:
+                found.add(key)
+        return found
+
+    def cast(self, pos, ray):
+        """Finds the boxes hit by a ray, from the nearest to the farthest.
+
+        :param pos: The origin of the ray
+        :type pos: :class:`matlib.Vec`
+
+        :param ray: The direction of the ray
+        :type ray: :class:`matlib.Vec`
+
+        :returns: list of (key, distance) tuples, distances in units of the
+            ray length
+        :rtype: list
+        """
+        keys = list(self.ray(pos, ray))
+        if not keys:
+            return []
+
+        boxes = np.array([self.boxes[key] for key in keys])
+        distances = ray_aabb(
+            (pos.x, pos.y, pos.z), (ray.x, ray.y, ray.z),
+            boxes[:, :3], boxes[:, 3:])
+        return [
+            (keys[i], float(distances[i]))
+            for i in np.argsort(distances, kind='mergesort')
+            if distances[i] != inf
+        ]
+
+    def ray(self, pos, ray):
+        """Finds the boxes in the cells crossed by a ray.
+
+        Only the part of the ray between the lowest bottom and the highest
+        top of the indexed boxes is walked. The result is a superset of the
+        boxes hit by the ray: candidates are meant to be checked with an exact
+        intersection test.
+
+        :param pos: The origin of the ray
+        :type pos: :class:`matlib.Vec`
+
+        :param ray: The direction of the ray
+        :type ray: :class:`matlib.Vec`
+
+        :returns: The keys of the candidate boxes
+        :rtype: set
+        """
+        if not self.boxes:
+            return set()
+
+        # Clip the ray to the vertical extent of the boxes
+        t0, t1 = 0.0, inf
+        if ray.y:
+            ta = (self._bottom - pos.y) / ray.y
+            tb = (self._top - pos.y) / ray.y
+            t0, t1 = max(t0, min(ta, tb)), max(ta, tb)
+        elif not self._bottom <= pos.y <= self._top:
+            return set()
+
+        # Clip the ray to the extent of the grid
+        cells = self.cells
+        size = self.cell_size
+        cx0, cz0, cx1, cz1 = self._extent
+        for p, d, lo, hi in (
+                (pos.x, ray.x, cx0 * size, (cx1 + 1) * size),
+                (pos.z, ray.z, cz0 * size, (cz1 + 1) * size)):
+            if d:
+                ta, tb = (lo - p) / d, (hi - p) / d
+                t0, t1 = max(t0, min(ta, tb)), min(t1, max(ta, tb))
+            elif not lo <= p <= hi:
+                return set()
+        if t0 > t1 or t1 == inf:
+            return set()
+
+        # Walk the cells crossed by the projection of the ray on the ground
+        x, z = pos.x + ray.x * t0, pos.z + ray.z * t0
+        cx, cz = self.cell(x, z)
+        end = self.cell(pos.x + ray.x * t1, pos.z + ray.z * t1)
+
+        def steps(p, d, c):
+            if d > 0:
+                return 1, ((c + 1) * size - p) / d, size / d
+            elif d < 0:
+                return -1, (c * size - p) / d, -size / d
+            return 0, inf, inf
+
+        step_x, next_x, delta_x = steps(x, ray.x, cx)
+        step_z, next_z, delta_z = steps(z, ray.z, cz)
+
+        found = set()
+        # NOTE: bound the walk, in case of rounding errors near the end cell
+        for _ in range(abs(end[0] - cx) + abs(end[1] - cz) + 1):
+            keys = cells.get((cx, cz))
+            if keys:
+                found |= keys
+            if (cx, cz) == end:
+                break
+            if next_x < next_z:
+                cx += step_x
+                next_x += delta_x
+            else:
+                cz += step_z
+                next_z += delta_z
+        return found
@@ -0,0 +1,187 @@
+from client import Client
+from configparser import ConfigParser
+from network.aio import AsyncMessageProxy
+from network.connection import create_packet
+from network.message import Message
+from network.message import MessageType
+import asyncio
+import msgpack
+import pytest
+
+
+def pong(i):
+    return create_packet(MessageType.pong, msgpack.packb({b'Id': i}))
+
+
+async def serve(handler):
+    """Starts a local server and connects a message proxy to it."""
+    server = await asyncio.start_server(handler, '127.0.0.1', 0)
+    config = ConfigParser()
+    config['Network'] = {
+        'ServerIPAddress': '127.0.0.1',
+        'ServerPort': str(server.sockets[0].getsockname()[1]),
+    }
+    proxy = await AsyncMessageProxy.connect(config['Network'])
+    return server, proxy
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(asyncio.wait_for(coro, 5.0))
+    finally:
+        loop.close()
+
+
+def test_read():
+    async def handler(reader, writer):
+        writer.write(b''.join([
+            create_packet(MessageType.gamestate, msgpack.packb({b'Time': 1})),
+            pong(1),
+            pong(2),
+        ]))
+        await reader.read()
+        writer.close()
+
+    async def main():
+        server, proxy = await serve(handler)
+        first = await proxy.wait_for(MessageType.pong)
+        second = await proxy.wait_for(MessageType.pong)
+        await proxy.close()
+        server.close()
+        await server.wait_closed()
+        return first.data, second.data
+
+    assert run(main()) == ({b'Id': 1}, {b'Id': 2})
+
+
+def test_push():
+    async def main():
+        received = asyncio.Queue()
+
+        async def handler(reader, writer):
+            await received.put(await reader.read())
+            writer.close()
+
+        server, proxy = await serve(handler)
+        sent = []
+        for i in range(3):
+            msg = Message(MessageType.ping, {b'Id': i})
+            proxy.enqueue(msg, callback=lambda i=i: sent.append(i))
+        proxy.push()
+        await proxy.drain()
+        await proxy.close()
+        data = await received.get()
+        server.close()
+        await server.wait_closed()
+        return sent, data
+
+    sent, data = run(main())
+    assert sent == [0, 1, 2]
+    assert data == b''.join(
+        create_packet(MessageType.ping, msgpack.packb({b'Id': i}))
+        for i in range(3))
+
+
+def test_close():
+    async def handler(reader, writer):
+        await reader.read()
+        writer.close()
+
+    async def main():
+        server, proxy = await serve(handler)
+        await proxy.close()
+        server.close()
+        await server.wait_closed()
+        return proxy
+
+    proxy = run(main())
+    assert proxy.reader_task.cancelled()
+    assert proxy.conn.writer.is_closing()
+
+
+def test_closed_by_server():
+    async def handler(reader, writer):
+        writer.write(pong(1))
+        writer.close()
+
+    async def main():
+        server, proxy = await serve(handler)
+        first = await proxy.wait_for(MessageType.pong)
+        second = await proxy.wait_for(MessageType.pong)
+        connected = proxy.connected
+        await proxy.close()
+        server.close()
+        await server.wait_closed()
+        return first.data, second, connected
+
+    assert run(main()) == ({b'Id': 1}, None, False)
+
+
+def test_reply_before_close():
+    async def handler(reader, writer):
+        writer.write(pong(1))
+        writer.close()
+
+    async def main():
+        server, proxy = await serve(handler)
+        # let the reader task receive the message and the end of the stream
+        while proxy.connected:
+            await asyncio.sleep(0.001)
+        reply = await proxy.wait_for(MessageType.pong)
+        await proxy.close()
+        server.close()
+        await server.wait_closed()
+        return reply.data
+
+    assert run(main()) == {b'Id': 1}
+
+
+class Runner:
+    """Stand-in for the client, running `Client.start_async` without the
+    rendering."""
+
+    start_async = Client.start_async
+    resync = Client.resync
+
+    class Context:
+        character_name = 'player'
+        character_type = 'grunt'
+
+        def __init__(self, period):
+            self.conf = ConfigParser()
+            self.conf['Network'] = {'ResyncPeriod': str(period)}
+
+    class Proxy:
+        def __init__(self):
+            self.drained = 0
+
+        async def drain(self):
+            self.drained += 1
+
+    def __init__(self, steps, period):
+        self.context = self.Context(period)
+        self.proxy = self.Proxy()
+        self.steps = steps
+        self.calls = []
+        self.exit = False
+
+    def ping(self):
+        self.calls.append('ping')
+
+    def join(self, name, actor_type):
+        self.calls.append(('join', name, actor_type))
+
+    def step(self):
+        self.calls.append('step')
+        self.steps -= 1
+        self.exit = self.steps == 0
+
+
+@pytest.mark.parametrize('steps', [1, 3])
+def test_start_async(steps):
+    runner = Runner(steps, 60.0)
+    run(runner.start_async())
+    assert runner.calls == ['ping', ('join', 'player', 'grunt')] + \
+        ['step'] * steps
+    assert runner.proxy.drained == steps
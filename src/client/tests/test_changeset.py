@@ -0,0 +1,92 @@
+from game.changeset import Changeset
+from game.entities.actor import ActionType
+from game.snapshot import BuildingRecord
+from game.snapshot import EntityRecord
+from game.snapshot import Snapshot
+from game.vectorized import VectorizedChangeset
+import pytest
+
+
+def snapshot(entities, buildings=(), time=0):
+    return Snapshot(
+        0,
+        time,
+        {e.srv_id: e for e in entities},
+        {b.srv_id: b for b in buildings},
+        {})
+
+
+def entity(srv_id, action_type, x=0.0, hp=10):
+    return EntityRecord(srv_id, 0, x, 0.0, hp, action_type, None)
+
+
+@pytest.fixture(params=[Changeset, VectorizedChangeset])
+def changeset(request):
+    return request.param
+
+
+def test_first_gamestate(changeset):
+    new = snapshot([entity(1, ActionType.idle), entity(2, ActionType.build)])
+    changes = changeset.diff(new, None)
+    assert [e.srv_id for e in changes.spawned] == [1, 2]
+    assert [e.srv_id for e in changes.idle] == [1]
+    assert [e.srv_id for e in changes.build_started] == [2]
+    assert not changes.moved and not changes.disappeared
+    assert changes.time is None
+
+
+def test_changes(changeset):
+    old = snapshot([
+        entity(1, ActionType.move, x=1.0),
+        entity(2, ActionType.repair),
+        entity(3, ActionType.idle),
+    ], buildings=[
+        BuildingRecord(10, 0, 0.0, 0.0, 5, False),
+        BuildingRecord(11, 0, 0.0, 0.0, 5, False),
+    ], time=59)
+    new = snapshot([
+        entity(1, ActionType.build, x=2.0),
+        entity(2, ActionType.idle, hp=5),
+    ], buildings=[
+        BuildingRecord(10, 0, 0.0, 0.0, 5, False),
+        BuildingRecord(11, 0, 0.0, 0.0, 5, True),
+    ], time=60)
+
+    changes = changeset.diff(new, old)
+    assert not changes.spawned
+    assert [e.srv_id for e in changes.disappeared] == [3]
+    assert [(o.x, n.x) for o, n in changes.moved] == [(1.0, 2.0)]
+    assert [o.srv_id for o, n in changes.action_changed] == [1, 2]
+    assert [(o.cur_hp, n.cur_hp) for o, n in changes.hp_changed] == [(10, 5)]
+    assert [e.srv_id for e in changes.build_started] == [1]
+    assert [e.srv_id for e in changes.build_stopped] == [2]
+    assert [n.srv_id for o, n in changes.buildings_changed] == [11]
+    assert changes.time == (1, 0)
+
+
+def test_moved(changeset):
+    old = snapshot([
+        entity(1, ActionType.move, x=1.0),
+        entity(2, ActionType.move, x=1.0),
+        entity(3, ActionType.idle, x=1.0),
+    ])
+    new = snapshot([
+        entity(1, ActionType.move, x=2.0),
+        entity(2, ActionType.move, x=1.0),
+        entity(3, ActionType.move, x=2.0),
+    ])
+    changes = changeset.diff(new, old)
+    assert [n.srv_id for o, n in changes.moved] == [1]
+
+
+def test_cache():
+    cache = {}
+    first = snapshot([entity(1, ActionType.move, x=1.0)])
+    second = snapshot([entity(1, ActionType.move, x=2.0)])
+    VectorizedChangeset.diff(first, None, cache)
+    _, table = cache['entities']
+    assert table.x.tolist() == [1.0]
+
+    changes = VectorizedChangeset.diff(second, first, cache)
+    assert [(o.x, n.x) for o, n in changes.moved] == [(1.0, 2.0)]
+    assert cache['entities'][0] is second.entities
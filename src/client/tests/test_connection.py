@@ -0,0 +1,143 @@
+from configparser import ConfigParser
+from network.connection import Connection
+from network.connection import ReceiveBuffer
+from network.connection import create_packet
+import msgpack
+import pytest
+import socket
+
+
+@pytest.fixture
+def sockets():
+    reader, writer = socket.socketpair()
+    reader.setblocking(False)
+    yield reader, writer
+    reader.close()
+    writer.close()
+
+
+def frames(buf):
+    result = []
+    while True:
+        frame = buf.next_frame()
+        if frame is None:
+            return result
+        result.append((frame[0], bytes(frame[1])))
+
+
+def test_multiple_frames(sockets):
+    reader, writer = sockets
+    packets = [(t, bytes([t]) * t * 10) for t in range(1, 6)]
+    writer.sendall(b''.join(create_packet(t, p) for t, p in packets))
+
+    buf = ReceiveBuffer(1024)
+    buf.recv_from(reader)
+    assert frames(buf) == packets
+    assert len(buf) == 0
+
+
+def test_fragmented_frame(sockets):
+    reader, writer = sockets
+    packet = create_packet(6, b'payload')
+
+    buf = ReceiveBuffer(1024)
+    for i in range(len(packet)):
+        writer.sendall(packet[i:i + 1])
+        buf.recv_from(reader)
+        if i < len(packet) - 1:
+            assert buf.next_frame() is None
+
+    assert frames(buf) == [(6, b'payload')]
+
+
+def test_end_of_stream(sockets):
+    reader, writer = sockets
+    writer.sendall(create_packet(6, b'payload'))
+    writer.close()
+
+    buf = ReceiveBuffer(1024)
+    buf.recv_from(reader)
+    assert frames(buf) == [(6, b'payload')]
+    with pytest.raises(ConnectionError):
+        buf.recv_from(reader)
+
+
+@pytest.mark.parametrize("size,payload_size", [
+    (16, 100),  # the frame does not fit into the buffer
+    (64, 20),  # the tail of the buffer is moved back
+])
+def test_buffer_reclaim(sockets, size, payload_size):
+    reader, writer = sockets
+    packets = [(t, bytes([t]) * payload_size) for t in range(10)]
+
+    buf = ReceiveBuffer(size)
+    received = []
+    for t, p in packets:
+        writer.sendall(create_packet(t, p))
+        buf.recv_from(reader)
+        received.extend(frames(buf))
+
+    assert received == packets
+
+
+@pytest.fixture
+def connection():
+    with socket.socket() as srv:
+        srv.bind(('127.0.0.1', 0))
+        srv.listen(1)
+        config = ConfigParser()
+        config['Network'] = {}
+        conn = Connection(
+            config['Network'], sock=socket.create_connection(srv.getsockname()))
+        peer, _ = srv.accept()
+    yield conn, peer
+    conn.socket.close()
+    peer.close()
+
+
+def test_coalesced_write(connection):
+    conn, peer = connection
+    sent = []
+    packets = [(t, bytes([t]) * 10) for t in range(3)]
+    for t, p in packets:
+        conn.write(t, p, callback=lambda t=t: sent.append(t))
+    assert not sent
+
+    conn.flush()
+    assert sent == [0, 1, 2]
+    expected = b''.join(create_packet(t, p) for t, p in packets)
+    assert peer.recv(len(expected), socket.MSG_WAITALL) == expected
+
+
+def test_partial_write(connection):
+    conn, peer = connection
+    sent = []
+    payload = b'x' * (16 * 1024 * 1024)
+    conn.write(6, payload, callback=lambda: sent.append(6))
+
+    total = conn.flush()
+    assert 0 < total < len(payload)
+    assert not sent
+
+    while sent != [6]:
+        peer.recv(1024 * 1024)
+        total += conn.flush()
+    assert total == len(create_packet(6, payload))
+
+
+def test_messages(connection):
+    conn, peer = connection
+    gamestate = {b'Entities': {1: {b'Xpos': 1.5, b'Path': [1, 2]}}}
+    peer.sendall(b''.join([
+        create_packet(6, msgpack.packb(gamestate)),
+        create_packet(1, msgpack.packb({b'Id': 2})),
+        create_packet(6, msgpack.packb({b'Time': 10})),
+    ]))
+
+    received = []
+    while len(received) < 2:
+        received.extend(conn.messages(6))
+    assert received == [
+        (6, {b'Entities': {1: {b'Xpos': 1.5, b'Path': (1, 2)}}}),
+        (6, {b'Time': 10}),
+    ]
@@ -0,0 +1,86 @@
+from context import EntityKind
+from context import EntityRegistry
+from collections import namedtuple
+import pytest
+
+
+Point = namedtuple('Point', ['x', 'y', 'z'])
+
+
+class Dummy:
+    def __init__(self, e_id, x=None):
+        self.e_id = e_id
+        self.x = x
+
+    @property
+    def bounding_box(self):
+        if self.x is not None:
+            return Point(self.x, 0, 0), Point(self.x + 1, 2, 1)
+
+
+@pytest.fixture
+def registry():
+    registry = EntityRegistry()
+    registry.add(Dummy(0))
+    registry.add(Dummy(1, x=0), 10, EntityKind.actor)
+    registry.add(Dummy(2), 20, EntityKind.actor)
+    registry.add(Dummy(3), 30, EntityKind.building)
+    registry.add(Dummy(4), 40, EntityKind.map_object)
+    return registry
+
+
+def test_lookups(registry):
+    assert len(registry) == 5
+    assert registry.resolve(20).e_id == 2
+    assert registry.server_id(2) == 20
+    assert registry.get(0).e_id == 0
+    assert registry.server_id(0) is None
+    assert registry.resolve(50) is None
+
+
+def test_kinds(registry):
+    assert [e.e_id for e in registry.of_kind(EntityKind.actor)] == [1, 2]
+    assert [e.e_id for e in registry.of_kind(EntityKind.building)] == [3]
+    assert [e.e_id for e in registry.of_kind(EntityKind.other)] == [0]
+    assert sorted(e.e_id for e in registry.networked()) == [1, 2, 3, 4]
+
+
+def test_remove(registry):
+    assert registry.remove_server(10).e_id == 1
+    assert registry.remove_server(10) is None
+    assert registry.remove(3).e_id == 3
+    assert 1 not in registry and 3 not in registry
+    assert registry.resolve(30) is None
+    assert registry.server_id(1) is None
+    assert [e.e_id for e in registry.of_kind(EntityKind.actor)] == [2]
+
+
+def test_remove_all(registry):
+    removed = registry.remove_all(kind=EntityKind.actor)
+    assert [e.e_id for e in removed] == [1, 2]
+    assert not registry.local_ids.keys() & {10, 20}
+
+    removed = registry.remove_all([0, 3, 4], kind=EntityKind.building)
+    assert [e.e_id for e in removed] == [3]
+
+    removed = registry.remove_all()
+    assert sorted(e.e_id for e in removed) == [0, 4]
+    assert not len(registry)
+    assert not registry.local_ids and not registry.server_ids
+
+
+def test_index(registry):
+    assert set(registry.index.boxes) == {1}
+    actor = registry.get(1)
+    actor.x = 20
+    registry.move(actor)
+    assert registry.index.rect(20, 0, 21, 1) == {1}
+    assert registry.index.rect(0, 0, 1, 1) == set()
+
+    # Entities unknown to the server are not indexed
+    registry.add(Dummy(5, x=0))
+    registry.move(registry.get(5))
+    assert set(registry.index.boxes) == {1}
+
+    registry.remove_server(10)
+    assert not registry.index.boxes
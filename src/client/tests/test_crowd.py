@@ -0,0 +1,39 @@
+from collections import namedtuple
+from game import crowd
+from game.crowd import CrowdAnimation
+import pytest
+
+
+Clip = namedtuple('Clip', ['name', 'duration'])
+
+
+class Instance:
+    def __init__(self, clip):
+        self.clip = clip
+        self.time = 0.0
+
+    def play(self, dt):
+        self.time += dt
+
+
+@pytest.fixture
+def animation(monkeypatch):
+    monkeypatch.setattr(crowd, 'AnimationInstance', Instance)
+    return CrowdAnimation(4)
+
+
+def test_buckets(animation):
+    walk = Clip('walk', 2.0)
+    a = animation.instance(walk, 0.1)
+    assert animation.instance(walk, 0.2) is a
+    assert animation.instance(walk, 0.6) is not a
+    assert [i.time for i in animation.clips[walk]] == [0, 0.5, 1.0, 1.5]
+    assert animation.instance(Clip('idle', 1.0), 0.1) is not a
+
+
+def test_play(animation):
+    walk = Clip('walk', 2.0)
+    animation.instance(walk, 0)
+    animation.play(0.25)
+    assert [i.time for i in animation.clips[walk]] == [
+        0.25, 0.75, 1.25, 1.75]
@@ -0,0 +1,103 @@
+from events import BatchEvent
+from events import Event
+from events import flush_events
+from events import send_event
+from events import set_deferred
+from events import subscriber
+from events import subscriber_timings
+import pytest
+
+
+class Hit(Event):
+    def __init__(self, srv_id):
+        self.srv_id = srv_id
+
+
+class HitBatch(BatchEvent):
+    item_event = Hit
+
+    def __init__(self, srv_ids):
+        self.srv_ids = srv_ids
+
+    def items(self):
+        for srv_id in self.srv_ids:
+            yield Hit(srv_id)
+
+
+class CriticalHit(Hit):
+    pass
+
+
+class Chain(Event):
+    def __init__(self, n):
+        self.n = n
+
+
+received = []
+
+
+@subscriber(Hit)
+def on_hit(evt):
+    received.append(('single', evt.srv_id))
+
+
+@subscriber(CriticalHit)
+def on_critical_hit(evt):
+    received.append(('critical', evt.srv_id))
+
+
+@subscriber(Chain)
+def on_chain(evt):
+    received.append(('chain', evt.n))
+    if evt.n:
+        send_event(Chain(evt.n - 1))
+        received.append(('sent', evt.n - 1))
+
+
+@subscriber(HitBatch)
+def on_hit_batch(evt):
+    received.append(('batch', tuple(evt.srv_ids)))
+
+
+def test_batch_event():
+    received.clear()
+    send_event(HitBatch([1, 2]))
+    assert received == [('batch', (1, 2)), ('single', 1), ('single', 2)]
+
+    received.clear()
+    send_event(Hit(3))
+    assert received == [('single', 3)]
+
+
+def test_batch_event_items():
+    class Incomplete(BatchEvent):
+        item_event = Hit
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_subclass_subscribers():
+    received.clear()
+    send_event(CriticalHit(1))
+    assert received == [('critical', 1), ('single', 1)]
+
+
+def test_deferred():
+    received.clear()
+    set_deferred(True)
+    try:
+        send_event(Chain(2))
+        assert received == []
+        assert flush_events() == 3
+        # Events sent by subscribers are dispatched after them
+        assert received == [
+            ('chain', 2), ('sent', 1), ('chain', 1), ('sent', 0), ('chain', 0)]
+    finally:
+        set_deferred(False)
+
+
+def test_timings():
+    send_event(Hit(1))
+    calls = [c for name, c, _ in subscriber_timings() if name.endswith('on_hit')]
+    assert calls and calls[0] >= 1
@@ -0,0 +1,43 @@
+from math import inf
+from renderer.frustum import UNBOUNDED
+from renderer.frustum import frustum_planes
+from renderer.frustum import merge_spheres
+from renderer.frustum import sphere_visible
+from renderer.frustum import transform_sphere
+import numpy as np
+
+
+def ortho(l, r, t, b, n, f):
+    return np.array([
+        [2 / (r - l), 0, 0, -(r + l) / (r - l)],
+        [0, 2 / (t - b), 0, -(t + b) / (t - b)],
+        [0, 0, -2 / (f - n), -(f + n) / (f - n)],
+        [0, 0, 0, 1],
+    ])
+
+
+def test_sphere_visible():
+    planes = frustum_planes(ortho(-10, 10, 10, -10, 0, 100))
+    assert sphere_visible(planes, (0, 0, -50, 1))
+    assert sphere_visible(planes, (10.5, 0, -50, 1))
+    assert not sphere_visible(planes, (12, 0, -50, 1))
+    assert not sphere_visible(planes, (0, -12, -50, 1))
+    assert not sphere_visible(planes, (0, 0, 5, 1))
+    assert not sphere_visible(planes, (0, 0, -105, 1))
+    assert sphere_visible(planes, (1000, 0, -50, inf))
+
+
+def test_transform_sphere():
+    m = np.identity(4)
+    m[:3, :3] *= [2, 3, 1]
+    m[:3, 3] = [1, 2, 3]
+    assert transform_sphere(m, (1, 1, 1, 1)) == (3, 5, 4, 3)
+
+
+def test_merge_spheres():
+    a = (0, 0, 0, 1)
+    assert merge_spheres(None, a) is a
+    assert merge_spheres(a, None) is a
+    assert merge_spheres(a, (0.5, 0, 0, 0.5)) is a
+    assert merge_spheres(a, (4, 0, 0, 1)) == (2, 0, 0, 3)
+    assert merge_spheres(a, UNBOUNDED) is UNBOUNDED
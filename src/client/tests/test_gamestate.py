@@ -0,0 +1,42 @@
+from game.entities.actor import ActionType
+from game.gamestate import GameStateManager
+from game.snapshot import EntityRecord
+from game.snapshot import Snapshot
+import pytest
+
+
+def snapshot(tstamp, positions):
+    return Snapshot(tstamp, 0, {
+        srv_id: EntityRecord(srv_id, 0, x, y, 10, ActionType.move, None)
+        for srv_id, (x, y) in positions.items()
+    }, {}, {})
+
+
+@pytest.fixture
+def gs_mgr():
+    gs_mgr = GameStateManager(4, max_extrapolation=50)
+    gs_mgr.push(snapshot(1000, {1: (0.0, 0.0)}))
+    gs_mgr.push(snapshot(1100, {1: (1.0, 0.0)}))
+    gs_mgr.push(snapshot(1200, {1: (3.0, 2.0), 2: (5.0, 5.0)}))
+    return gs_mgr
+
+
+@pytest.mark.parametrize("t,positions", [
+    (900, {1: (0.0, 0.0)}),  # before the buffer
+    (1050, {1: (0.5, 0.0)}),
+    (1150, {1: (2.0, 1.0), 2: (5.0, 5.0)}),
+    (1200, {1: (3.0, 2.0), 2: (5.0, 5.0)}),
+    (1225, {1: (3.5, 2.5), 2: (5.0, 5.0)}),  # extrapolated
+    (1400, {1: (4.0, 3.0), 2: (5.0, 5.0)}),  # extrapolation is bounded
+])
+def test_positions(gs_mgr, t, positions):
+    assert gs_mgr.positions(t) == positions
+
+
+def test_buffer_size():
+    gs_mgr = GameStateManager(2)
+    assert gs_mgr.positions(0) == {}
+    for t in range(3):
+        gs_mgr.push(snapshot(t * 100, {1: (float(t), 0.0)}))
+    assert gs_mgr.count == 2
+    assert gs_mgr.positions(0) == {1: (1.0, 0.0)}
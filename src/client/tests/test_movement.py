@@ -0,0 +1,81 @@
+from game.components.movable import Movable
+from game.movement import MovementSystem
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def system():
+    return MovementSystem(capacity=2, path_capacity=2)
+
+
+def close(a, b):
+    return np.allclose(a, b)
+
+
+def test_allocate(system):
+    slots = [system.allocate((i, i)) for i in range(5)]
+    assert slots == [0, 1, 2, 3, 4]
+    assert system.capacity == 8 and len(system) == 5
+    assert close(system.position[4], (4, 4))
+
+    system.release(1)
+    assert system.allocate((9, 9)) == 1
+    assert close(system.position[1], (9, 9))
+
+
+def test_step(system):
+    a = system.allocate((0, 0))
+    b = system.allocate((0, 0))
+    system.move(a, (0, 0), [(10, 0)], 2.0)
+
+    system.step(1.0)
+    assert close(system.position[a], (2, 0))
+    assert close(system.direction[a], (1, 0)) and system.oriented[a]
+    # Not moving
+    assert close(system.position[b], (0, 0)) and not system.oriented[b]
+
+    # Arrival
+    system.step(10.0)
+    assert close(system.position[a], (10, 0))
+    assert not system.moving[a] and not system.oriented[a]
+    assert system.speed[a] == 0
+
+
+def test_step_overshoot(system):
+    a = system.allocate((0, 0))
+    # Longer than the path capacity
+    system.move(a, (0, 0), [(1, 0), (1, 1), (1, 5), (1, 10)], 1.0)
+    assert system.paths.shape[1] == 4
+
+    # Goes past two waypoints within a single step
+    system.step(3.0)
+    assert close(system.position[a], (1, 2))
+    assert close(system.direction[a], (0, 1))
+    assert system.waypoint[a] == 2
+
+    system.step(100.0)
+    assert close(system.position[a], (1, 10))
+    assert not system.moving[a]
+
+
+def test_stop(system):
+    a = system.allocate((0, 0))
+    system.move(a, (0, 0), [(10, 0)], 1.0)
+    system.stop(a, (5, 5))
+    system.step(1.0)
+    assert close(system.position[a], (5, 5))
+    assert not system.moving[a]
+
+
+def test_interpolate_stop(system):
+    movable = Movable((0.0, 0.0), system)
+    assert movable.interpolate((1.0, 0.0))
+    assert movable.interpolate((2.0, 0.0))
+    assert movable.direction is not None
+
+    # the interpolated position stops changing
+    assert not movable.interpolate((2.0, 0.0))
+    assert movable.direction is None
+    assert not movable.speed
+    assert movable.position == (2.0, 0.0)
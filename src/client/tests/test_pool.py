@@ -0,0 +1,41 @@
+from game.pool import EntityPool
+from itertools import count
+
+
+class Dummy:
+    ids = count()
+
+    def __init__(self, value):
+        self.e_id = next(self.ids)
+        self.value = value
+        self.attached = True
+
+    def retire(self):
+        self.attached = False
+
+    def reuse(self, value):
+        self.value = value
+        self.attached = True
+
+
+def test_prewarm():
+    pool = EntityPool(Dummy)
+    pool.prewarm(3, 0)
+    assert len(pool) == 3
+    assert not any(entity.attached for entity in pool.free)
+    pool.prewarm(2, 0)
+    assert len(pool) == 3
+
+
+def test_acquire_release():
+    pool = EntityPool(Dummy)
+    a = pool.acquire(1)
+    assert a.attached and not len(pool)
+
+    pool.release(a)
+    assert not a.attached and len(pool) == 1
+
+    b = pool.acquire(2)
+    assert b is a
+    assert b.attached and b.value == 2
+    assert pool.acquire(3) is not a
@@ -0,0 +1,46 @@
+from renderer.renderer import batch_render_ops
+
+
+class Shader:
+    def __init__(self, prog):
+        self.prog = prog
+
+
+class Op:
+    def __init__(self, mesh, shader, textures=(), batch=None, camera=None):
+        self.mesh = mesh
+        self.shader = shader
+        self.textures = list(textures)
+        self.batch = batch
+        self.camera_block = camera
+
+
+def test_batch_render_ops():
+    instanced, plain = Shader(1), Shader(2)
+    a = Op('zombie', instanced)
+    b = Op('zombie', instanced)
+    c = Op('barricade', instanced)
+    d = Op('zombie', plain)
+    e = Op('zombie', instanced)
+    f = Op('zombie', instanced, ['skin'])
+    g = Op('zombie', instanced, ['skin'], batch='pose')
+    h = Op('zombie', instanced, ['skin'], batch='pose', camera='ui')
+
+    batches = batch_render_ops(
+        [a, b, c, d, e, f, g, h], lambda op: op.shader is instanced)
+    assert batches == [
+        ([a, b], True),
+        ([c], True),
+        ([d], False),
+        ([e], True),
+        ([f], True),
+        ([g], True),
+        ([h], True),
+    ]
+
+
+def test_batch_keeps_order():
+    instanced = Shader(1)
+    ops = [Op('zombie', instanced), Op('bar', instanced)] * 2
+    batches = batch_render_ops(ops, lambda op: True)
+    assert [group for group, _ in batches] == [[op] for op in ops]
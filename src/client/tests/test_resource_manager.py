@@ -0,0 +1,31 @@
+from loaders.resource_manager import Package
+from loaders.resource_manager import Resource
+from loaders.resource_manager import ResourceManager
+from renderer.texture import Texture
+import pytest
+
+
+@pytest.fixture
+def manager(monkeypatch, tmpdir):
+    monkeypatch.setattr(Texture, 'from_image', classmethod(
+        lambda cls, image: object()))
+    manager = ResourceManager({'ResourceLocation': str(tmpdir)})
+    manager.cache['/a/skin.png'] = Resource('/a/skin.png', 'image')
+    return manager
+
+
+def test_texture_sharing(manager):
+    a = Package('/a', {'resources': {'texture': 'skin.png'}})
+    b = Package('/a', {'resources': {'floor': 'skin.png'}})
+    texture = manager.get_texture(a, 'texture')
+    assert manager.get_texture(b, 'floor') is texture
+    assert manager.textures['/a/skin.png'] == [texture, 2]
+
+    manager.release_texture(texture)
+    assert manager.textures['/a/skin.png'] == [texture, 1]
+    manager.release_texture(texture)
+    assert not manager.textures
+    assert not manager.texture_paths
+
+    # Released textures are created anew
+    assert manager.get_texture(a, 'texture') is not texture
@@ -0,0 +1,148 @@
+from renderer.scene import Billboard
+from renderer.scene import RootNode
+from renderer.scene import SceneNode
+import numpy as np
+
+
+class Transform:
+    def __init__(self):
+        self.calls = []
+
+    def identity(self):
+        self.calls.append('identity')
+
+    def translate(self, v):
+        self.calls.append('translate')
+
+    def rotate(self, axis, angle):
+        self.calls.append(angle)
+
+    def scale(self, v):
+        self.calls.append('scale')
+
+
+def test_billboard_faces_camera_once_per_angle():
+    billboard = Billboard((1, 2, 0))
+    t = Transform()
+    billboard.face(t, 0.5)
+    billboard.face(t, 0.5)
+    assert t.calls == ['identity', 'translate', 0.5]
+    billboard.scale = (2, 2, 2)
+    billboard.face(t, 0.25)
+    assert t.calls[3:] == ['identity', 'translate', 0.25, 'scale']
+
+
+class Matrix:
+    """Row-major 4x4 matrix, standing for `matlib.Mat`."""
+
+    def __init__(self, x=0.0):
+        self.m = np.identity(4)
+        self.m[0, 3] = x
+
+    def identity(self):
+        self.m[:] = np.identity(4)
+
+    def __imul__(self, other):
+        self.m[:] = self.m @ other.m
+        return self
+
+    def __eq__(self, other):
+        return np.array_equal(self.m, other.m)
+
+    def __getitem__(self, key):
+        return self.m[key]
+
+
+class Op:
+    visible = True
+    index = None
+
+
+class Node(SceneNode):
+    def __init__(self, x=0.0, draws=True):
+        super().__init__()
+        self.transform = Matrix(x)
+        self.world = Matrix()
+        self._applied = Matrix()
+        self.render_op = Op() if draws else None
+
+
+class Root(RootNode):
+    def __init__(self):
+        super().__init__()
+        self.transform = Matrix()
+        self.world = Matrix()
+        self._applied = Matrix()
+
+
+class Context:
+    """Render context of a frame, with a renderer which sorts the render list
+    in place."""
+
+    frustum = []
+
+    class camera:
+        billboard_angle = 0.0
+
+    class renderer:
+        @staticmethod
+        def add_render_list(ops):
+            ops.reverse()
+
+
+def check_render_ops(root, nodes):
+    ops = root.render_ops
+    assert sorted(map(id, ops)) == sorted(id(n.render_op) for n in nodes)
+    for i, op in enumerate(ops):
+        assert op.index in (i, None)
+
+
+def test_attach_detach():
+    root = Root()
+    a, b, c, d = Node(), Node(), Node(draws=False), Node()
+    a.add_child(b)
+    b.add_child(c)
+    root.add_child(a)
+    root.add_child(d)
+    check_render_ops(root, [a, b, d])
+
+    root.render(Context())
+    root.remove_child(a)
+    check_render_ops(root, [d])
+    assert a.render_op.index is None and b.render_op.index is None
+
+    e = Node()
+    b.add_child(e)
+    root.add_child(b)
+    check_render_ops(root, [d, b, e])
+    root.render(Context())
+    assert all(n.render_op.visible for n in root.walk() if n.render_op)
+
+    b.remove_child(e)
+    root.remove_child(d)
+    check_render_ops(root, [b])
+
+
+def test_world_transform():
+    root = Root()
+    a, b = Node(1.0), Node(2.0)
+    a.add_child(b)
+    root.add_child(a)
+
+    root.render(Context())
+    assert b.world[0, 3] == 3.0
+
+    a.transform = Matrix(5.0)
+    root.render(Context())
+    assert a.transformed and b.moved
+    assert b.world[0, 3] == 7.0
+
+    root.render(Context())
+    assert not a.moved and not b.moved
+
+    root.remove_child(a)
+    a.remove_child(b)
+    root.add_child(b)
+    root.render(Context())
+    assert b.moved
+    assert b.world[0, 3] == 2.0
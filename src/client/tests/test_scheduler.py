@@ -0,0 +1,82 @@
+from scheduler import UpdateScheduler
+import pytest
+
+
+class Dummy:
+    def __init__(self, e_id, idle=False):
+        self.e_id = e_id
+        self.idle = idle
+        self.updates = []
+
+    def update(self, dt):
+        self.updates.append(dt)
+
+    def is_idle(self):
+        return self.idle
+
+
+class Other(Dummy):
+    pass
+
+
+@pytest.fixture
+def scheduler():
+    return UpdateScheduler()
+
+
+def test_rates(scheduler):
+    frame, fixed = Dummy(0), Dummy(1)
+    scheduler.add(frame)
+    scheduler.add(fixed, rate=4)
+    for _ in range(6):
+        scheduler.update(0.1)
+    assert len(frame.updates) == 6
+    assert len(fixed.updates) == 2
+    assert abs(fixed.updates[0] - 0.3) < 1e-9
+
+    scheduler.set_rate(1, None)
+    scheduler.set_rate(0, 4)
+    scheduler.update(0.1)
+    assert len(frame.updates) == 6 and len(fixed.updates) == 3
+
+    scheduler.remove(0)
+    scheduler.remove(1)
+    scheduler.update(0.1)
+    assert len(scheduler) == 0
+    assert len(frame.updates) == 6 and len(fixed.updates) == 3
+
+
+def test_sleep(scheduler):
+    static, active = Dummy(0, idle=True), Dummy(1)
+    scheduler.add(static)
+    scheduler.add(active, rate=10)
+    scheduler.update(0.1)
+    scheduler.update(0.1)
+    assert len(static.updates) == 1
+    assert list(scheduler.sleeping) == [0]
+
+    scheduler.wake(0)
+    scheduler.update(0.1)
+    assert len(static.updates) == 2
+
+    # Rate changes while sleeping are applied on wake up
+    scheduler.sleep(1)
+    scheduler.set_rate(1, None)
+    scheduler.update(0.01)
+    assert len(active.updates) == 3
+    scheduler.wake(1)
+    scheduler.update(0.01)
+    assert len(active.updates) == 4
+
+    scheduler.remove(0)
+    assert not scheduler.sleeping
+
+
+def test_timings(scheduler):
+    scheduler.add(Dummy(0))
+    scheduler.add(Dummy(1))
+    scheduler.add(Other(2))
+    scheduler.update(0.1)
+    scheduler.update(0.1)
+    timings = {name: calls for name, calls, _ in scheduler.timings()}
+    assert timings == {'Dummy': 4, 'Other': 2}
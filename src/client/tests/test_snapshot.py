@@ -0,0 +1,47 @@
+from game.snapshot import Snapshot
+from network import MessageField as MF
+
+
+def test_snapshot():
+    snapshot = Snapshot.from_data({
+        MF.timestamp: 1000,
+        MF.time: 60,
+        MF.entities: {
+            1: {
+                MF.entity_type: 3,
+                MF.x_pos: 1.0,
+                MF.y_pos: 2.0,
+                MF.cur_hp: 10,
+                MF.action_type: 1,
+                MF.action: {MF.speed: 2.0},
+            },
+            2: {
+                MF.entity_type: 0,
+                MF.x_pos: 3.0,
+                MF.y_pos: 4.0,
+                MF.cur_hp: 5,
+            },
+        },
+        MF.buildings: {
+            3: {
+                MF.building_type: 0,
+                MF.x_pos: 5.0,
+                MF.y_pos: 6.0,
+                MF.cur_hp: 50,
+                MF.completed: False,
+            },
+        },
+    })
+
+    assert (snapshot.tstamp, snapshot.time) == (1000, 60)
+    assert set(snapshot.entities) == {1, 2}
+    zombie = snapshot.entities[1]
+    assert zombie.position == (1.0, 2.0)
+    assert (zombie.cur_hp, zombie.action_type) == (10, 1)
+    assert zombie.action[MF.speed] == 2.0
+    assert snapshot.entities[2].action_type == 0
+
+    building = snapshot.buildings[3]
+    assert (building.srv_id, building.position) == (3, (5.0, 6.0))
+    assert not building.completed
+    assert snapshot.objects == {}
@@ -0,0 +1,97 @@
+from collections import namedtuple
+from spatial import SpatialGrid
+from spatial import ray_aabb
+import numpy as np
+import pytest
+
+
+Point = namedtuple('Point', ['x', 'y', 'z'])
+
+
+def box(x, z, size=1.0):
+    return Point(x, 0, z), Point(x + size, 2, z + size)
+
+
+@pytest.fixture
+def grid():
+    grid = SpatialGrid(cell_size=4.0)
+    grid.insert('a', box(0, 0))
+    grid.insert('b', box(10, 10))
+    grid.insert('c', box(-9, 3, size=6))
+    return grid
+
+
+def test_insert_remove(grid):
+    assert len(grid) == 3
+    assert grid.cells[-3, 0] == {'c'} and grid.cells[-2, 1] == {'c'}
+
+    grid.insert('b', box(10.5, 10.5))
+    assert grid.cells[2, 2] == {'b'}
+    grid.insert('b', box(20, 20))
+    assert (2, 2) not in grid.cells and grid.cells[5, 5] == {'b'}
+
+    grid.remove('c')
+    grid.remove('missing')
+    assert 'c' not in grid
+    assert not any('c' in keys for keys in grid.cells.values())
+
+
+def test_rect(grid):
+    assert grid.rect(-1, -1, 2, 2) == {'a'}
+    assert grid.rect(0.5, 0.5, 10.5, 10.5) == {'a', 'b'}
+    assert grid.rect(-5, 5, -4, 6) == {'c'}
+    assert grid.rect(2, 2, 9, 9) == set()
+    assert grid.rect(-100, -100, 100, 100) == {'a', 'b', 'c'}
+
+
+def test_radius(grid):
+    assert grid.radius(0.5, 0.5, 0.1) == {'a'}
+    assert grid.radius(2, 2, 1.5) == {'a'}
+    assert grid.radius(2, 2, 1.3) == set()
+    assert grid.radius(5, 5, 8.1) == {'a', 'b', 'c'}
+
+
+def test_ray(grid):
+    # Straight down on a box
+    assert grid.ray(Point(10.5, 20, 10.5), Point(0, -1, 0)) == {'b'}
+    # Diagonal, grazing a and b
+    assert {'a', 'b'} <= grid.ray(Point(-2, 2, -2), Point(1, -0.01, 1))
+    # Parallel to the ground, above every box
+    assert grid.ray(Point(-10, 3, 0.5), Point(1, 0, 0)) == set()
+    # Parallel to the ground, at the height of the boxes
+    assert grid.ray(Point(-20, 1, 0.5), Point(1, 0, 0)) >= {'a'}
+    # Pointing away from the boxes
+    assert grid.ray(Point(0.5, 20, 0.5), Point(0, 1, 0)) == set()
+
+
+def test_ray_aabb():
+    lo = np.array([[0, 0, 0], [5, 0, 0], [0, 5, 5]], dtype=float)
+    hi = lo + 1
+
+    # One ray against all the boxes
+    distances = ray_aabb((-1, 0.5, 0.5), (1, 0, 0), lo, hi)
+    assert distances.tolist() == [1, 6, np.inf]
+
+    # Ray origin inside a box
+    assert ray_aabb((0.5, 0.5, 0.5), (0, 0, 1), lo, hi)[0] == 0
+    # Box behind the ray
+    assert ray_aabb((2, 0.5, 0.5), (1, 0, 0), lo, hi)[0] == np.inf
+
+    # Pairwise rays and boxes
+    pos = np.array([[-1, 0.5, 0.5], [5.5, 10, 0.5], [0.5, 5.5, 0]])
+    ray = np.array([[2, 0, 0], [0, -1, 0], [0, 0, 1]])
+    assert ray_aabb(pos, ray, lo, hi).tolist() == [0.5, 9, 5]
+
+    # Every ray against every box
+    distances = ray_aabb(pos[:, None], ray[:, None], lo, hi)
+    assert distances.shape == (3, 3)
+    assert distances.diagonal().tolist() == [0.5, 9, 5]
+    assert distances[0].tolist() == [0.5, 3, np.inf]
+
+
+def test_cast(grid):
+    hits = grid.cast(Point(-5, 1, 0.5), Point(1, 0, 0))
+    assert hits == [('a', 5.0)]
+    hits = grid.cast(Point(-2, 1, -2), Point(1, 0, 1))
+    assert [key for key, _ in hits] == ['a', 'b']
+    assert grid.cast(Point(50, 1, 50), Point(1, 0, 0)) == []
@@ -0,0 +1,127 @@
+from configparser import ConfigParser
+from network.connection import Connection
+from network.connection import create_packet
+from network.message import Message
+from network.message import MessageType
+from network.threaded import ThreadedMessageProxy
+import msgpack
+import pytest
+import socket
+import time
+
+
+def pong(i):
+    return create_packet(MessageType.pong, msgpack.packb({b'Id': i}))
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def proxy(request):
+    with socket.socket() as srv:
+        srv.bind(('127.0.0.1', 0))
+        srv.listen(1)
+        config = ConfigParser()
+        config['Network'] = getattr(request, 'param', {})
+        conn = Connection(
+            config['Network'], sock=socket.create_connection(srv.getsockname()))
+        peer, _ = srv.accept()
+    proxy = ThreadedMessageProxy(conn, config['Network'])
+    yield proxy, peer
+    if proxy.thread.is_alive():
+        proxy.close()
+    peer.close()
+
+
+def test_ordered_delivery(proxy):
+    proxy, peer = proxy
+    peer.sendall(b''.join(pong(i) for i in range(100)))
+
+    received = []
+    while len(received) < 100:
+        proxy.received.wait(5.0)
+        received.extend(msg.data[b'Id'] for msg in proxy.poll())
+    assert received == list(range(100))
+
+
+def test_push(proxy):
+    proxy, peer = proxy
+    sent = []
+    for i in range(3):
+        msg = Message(MessageType.ping, {b'Id': i})
+        proxy.enqueue(msg, callback=lambda i=i: sent.append(i))
+    proxy.push()
+    assert proxy.outbound_depth <= 3
+
+    expected = b''.join(
+        create_packet(MessageType.ping, msgpack.packb({b'Id': i}))
+        for i in range(3))
+    assert peer.recv(len(expected), socket.MSG_WAITALL) == expected
+    wait_until(lambda: sent == [0, 1, 2])
+
+
+def test_wait_for(proxy):
+    proxy, peer = proxy
+    peer.sendall(b''.join([
+        create_packet(MessageType.gamestate, msgpack.packb({b'Time': 1})),
+        pong(1),
+        pong(2),
+    ]))
+
+    assert proxy.wait_for(MessageType.pong).data == {b'Id': 1}
+    # The second message was decoded along with the first one
+    assert proxy.wait_for(MessageType.pong).data == {b'Id': 2}
+
+
+@pytest.mark.parametrize('proxy', [{'QueueSize': '4'}], indirect=True)
+def test_back_pressure(proxy):
+    proxy, peer = proxy
+    peer.sendall(b''.join(pong(i) for i in range(10)))
+
+    wait_until(lambda: proxy.inbound_depth == 4)
+    time.sleep(0.05)
+    assert proxy.inbound_depth == 4
+
+    received = []
+    while len(received) < 10:
+        received.extend(msg.data[b'Id'] for msg in proxy.poll())
+        assert proxy.inbound_depth <= 4
+        time.sleep(0.001)
+    assert received == list(range(10))
+    assert proxy.stats.max_inbound == 4
+
+
+def test_close(proxy):
+    proxy, peer = proxy
+    proxy.close()
+    assert not proxy.thread.is_alive()
+    assert proxy.conn.socket.fileno() == -1
+    assert proxy.wakeup_r.fileno() == -1
+    assert peer.recv(1) == b''
+
+
+def test_closed_by_peer(proxy):
+    proxy, peer = proxy
+    peer.sendall(pong(1))
+    peer.close()
+
+    assert proxy.wait_for(MessageType.pong).data == {b'Id': 1}
+    with pytest.raises(ConnectionError):
+        proxy.wait_for(MessageType.pong)
+    proxy.thread.join(5.0)
+    assert not proxy.thread.is_alive()
+
+
+def test_error(proxy):
+    proxy, peer = proxy
+    proxy.conn.decoder.decode = None
+    peer.sendall(pong(1))
+
+    with pytest.raises(TypeError):
+        proxy.wait_for(MessageType.pong)
+    assert not proxy.thread.is_alive()
@@ -0,0 +1,61 @@
+from renderer.uniforms import ParamBlock
+from renderer.uniforms import ShaderState
+from renderer.uniforms import UniformCounters
+
+
+class Param:
+    def __init__(self):
+        self.values = []
+
+    def set(self, value):
+        self.values.append(value)
+
+
+class Shader(dict):
+    def __init__(self, *names):
+        super().__init__((name, Param()) for name in names)
+        self.lookups = 0
+
+    def __getitem__(self, name):
+        self.lookups += 1
+        return super().__getitem__(name)
+
+
+def test_redundant_uploads_skipped():
+    shader = Shader('opacity', 'animate')
+    state = ShaderState(shader)
+    counters = UniformCounters()
+    a = ParamBlock(state, {'opacity': 1.0, 'animate': 0})
+    b = ParamBlock(state, {'opacity': 0.5, 'animate': 0})
+    assert shader.lookups == 2
+
+    a.upload(counters)
+    b.upload(counters)
+    a.upload(counters)
+    assert shader['opacity'].values == [1.0, 0.5, 1.0]
+    assert shader['animate'].values == [0]
+    assert (counters.uploaded, counters.skipped) == (4, 2)
+
+    counters.end_frame()
+    assert counters.last == (4, 2)
+    assert counters.total == [4, 2, 1]
+    assert (counters.uploaded, counters.skipped) == (0, 0)
+
+
+def test_matches():
+    shader = Shader('opacity', 'animate')
+    params = {'opacity': 1.0}
+    block = ParamBlock(ShaderState(shader), params)
+    assert block.matches(shader, params)
+    assert not block.matches(shader, {'opacity': 1.0})
+    assert not block.matches(Shader('opacity'), params)
+    params['animate'] = 1
+    assert not block.matches(shader, params)
+
+
+def test_param_resolved_once():
+    shader = Shader('opacity')
+    state = ShaderState(shader)
+    param = state.param('opacity')
+    assert state.param('opacity') is param
+    assert shader.lookups == 1
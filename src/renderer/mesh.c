@@ -362,6 +362,22 @@ mesh_new(struct MeshData *md)
 
 	m->index_count = md->index_count;
 
+	// compute the bounding box of vertex positions, starting from the first
+	// vertex (or from the origin, for meshes without vertices)
+	Vec origin = {{ 0, 0, 0, 1 }};
+	m->bounds_min = m->bounds_max = origin;
+	for (size_t v = 0; v < md->vertex_count; v++) {
+		const float *pos = (const float*)(
+			(const char*)md->vertex_data + v * md->vertex_size
+		);
+		for (int c = 0; c < 3; c++) {
+			if (v == 0 || pos[c] < m->bounds_min.data[c])
+				m->bounds_min.data[c] = pos[c];
+			if (v == 0 || pos[c] > m->bounds_max.data[c])
+				m->bounds_max.data[c] = pos[c];
+		}
+	}
+
 cleanup:
 	// reset the context
 	glBindVertexArray(0);
@@ -405,3 +421,26 @@ mesh_render(struct Mesh *m)
 
 	return 1;
 }
+
+int
+mesh_render_instanced(struct Mesh *m, GLsizei count)
+{
+	glBindVertexArray(m->vao);
+	glDrawElementsInstanced(
+		GL_TRIANGLES,
+		m->index_count,
+		GL_UNSIGNED_INT,
+		(void*)(0),
+		count
+	);
+
+#ifdef DEBUG
+	GLenum gl_err = glGetError();
+	if (gl_err != GL_NO_ERROR) {
+		errf("instanced mesh rendering failed (OpenGL error %d)", gl_err);
+		return 0;
+	}
+#endif
+
+	return 1;
+}
@@ -32,6 +32,8 @@ struct Mesh {
 	GLuint vbo;
 	GLuint ibo;
 	GLuint index_count;
+	Vec bounds_min;
+	Vec bounds_max;
 };
 
 struct MeshData*
@@ -54,3 +56,6 @@ mesh_attrib_index(struct Mesh *m, enum VertexAttrib a);
 
 int
 mesh_render(struct Mesh *m);
+
+int
+mesh_render_instanced(struct Mesh *m, GLsizei count);
@@ -7,6 +7,15 @@ static PyMethodDef py_animation_methods[] = {
 	{ NULL }
 };
 
+static PyObject*
+py_animation_get_duration(PyObject *self, void *closure);
+
+static PyGetSetDef py_animation_attrs[] = {
+	{ "duration", py_animation_get_duration, NULL, .doc =
+	  "Duration of the animation in seconds." },
+	{ NULL }
+};
+
 PyTypeObject py_animation_type = {
 	{ PyObject_HEAD_INIT(NULL) },
 	.tp_name = "surrender.Animation",
@@ -33,9 +42,18 @@ PyTypeObject py_animation_type = {
 	.tp_setattro = NULL,
 	.tp_flags = Py_TPFLAGS_DEFAULT,
 	.tp_methods = py_animation_methods,
-	.tp_getset = NULL
+	.tp_getset = py_animation_attrs
 };
 
+static PyObject*
+py_animation_get_duration(PyObject *self, void *closure)
+{
+	struct Animation *anim = ((PyAnimationObject*)self)->anim;
+	// animations are played at 25 ticks per second by default
+	float speed = anim->speed != 0 ? anim->speed : 25.0f;
+	return PyFloat_FromDouble(anim->duration / speed);
+}
+
 static void
 py_animation_free(PyObject *self)
 {
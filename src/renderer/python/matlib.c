@@ -59,6 +59,9 @@ py_vec_setter(PyObject *self, PyObject *arg, void *offset);
 static int
 py_vec_getbuffer(PyObject *self, Py_buffer *view, int flags);
 
+static PyObject*
+py_vec_cmp(PyObject *self, PyObject *other, int op);
+
 /**
  * Vec class methods.
  */
@@ -127,12 +130,14 @@ PyTypeObject py_vec_type = {
 	.tp_getattr = NULL,
 	.tp_setattr = NULL,
 	.tp_repr = py_vec_repr,
+	.tp_richcompare = py_vec_cmp,
 	.tp_as_number = &vec_num_methods,
 	.tp_as_sequence = NULL,
 	.tp_as_mapping = NULL,
 	.tp_as_buffer = &vec_buf_methods,
 	.tp_as_async = NULL,
-	.tp_hash = NULL,
+	// mutable and compared by value: not hashable
+	.tp_hash = PyObject_HashNotImplemented,
 	.tp_call = NULL,
 	.tp_str = NULL,
 	.tp_getattro = NULL,
@@ -328,6 +333,23 @@ py_vec_getbuffer(PyObject *self, Py_buffer *view, int flags)
 	);
 }
 
+static PyObject*
+py_vec_cmp(PyObject *self, PyObject *other, int op)
+{
+	// vectors are only compared for equality, let Python handle the other
+	// comparisons (and report them as unsupported)
+	if ((op != Py_EQ && op != Py_NE) ||
+	    !PyObject_TypeCheck(other, &py_vec_type))
+		Py_RETURN_NOTIMPLEMENTED;
+	Vec *v_self = to_vec_ptr(self);
+	Vec *v_other = to_vec_ptr(other);
+	int equal = memcmp(v_self->data, v_other->data, sizeof(float) * 4) == 0;
+	int retval = op == Py_EQ ? equal : !equal;
+	if (retval)
+		Py_RETURN_TRUE;
+	Py_RETURN_FALSE;
+}
+
 #define to_mat(pyobj) (((PyMatObject*)pyobj)->mat)
 #define to_mat_ptr(pyobj) (&((PyMatObject*)pyobj)->mat)
 
@@ -10,9 +10,24 @@ py_mesh_free(PyObject *self);
 static PyObject*
 py_mesh_render(PyObject *self);
 
+static PyObject*
+py_mesh_render_instanced(PyObject *self, PyObject *args);
+
+static PyObject*
+py_mesh_get_bounding_box(PyObject *self, void *closure);
+
+static PyGetSetDef py_mesh_attrs[] = {
+	{ "bounding_box", py_mesh_get_bounding_box, NULL, .doc =
+	  "Minimum and maximum corners of the box enclosing the vertices." },
+	{ NULL }
+};
+
 static PyMethodDef py_mesh_methods[] = {
 	{ "render", (PyCFunction)py_mesh_render, METH_NOARGS,
 	  "Render the mesh." },
+	{ "render_instanced", (PyCFunction)py_mesh_render_instanced,
+	  METH_VARARGS,
+	  "Render the given number of instances of the mesh." },
 	{ NULL }
 };
 
@@ -42,7 +57,7 @@ PyTypeObject py_mesh_type = {
 	.tp_setattro = NULL,
 	.tp_flags = Py_TPFLAGS_DEFAULT,
 	.tp_methods = py_mesh_methods,
-	.tp_getset = NULL
+	.tp_getset = py_mesh_attrs
 };
 
 static int
@@ -94,6 +109,42 @@ py_mesh_render(PyObject *self)
 	Py_RETURN_NONE;
 }
 
+static PyObject*
+py_mesh_render_instanced(PyObject *self, PyObject *args)
+{
+	int count;
+	if (!PyArg_ParseTuple(args, "i", &count))
+		return NULL;
+
+	if (!mesh_render_instanced(((PyMeshObject*)self)->mesh, count)) {
+		error_print_tb();
+		error_clear();
+		PyErr_SetString(
+			PyExc_ValueError,
+			"mesh object rendering failed"
+		);
+		return NULL;
+	}
+	Py_RETURN_NONE;
+}
+
+static PyObject*
+py_mesh_get_bounding_box(PyObject *self, void *closure)
+{
+	struct Mesh *mesh = ((PyMeshObject*)self)->mesh;
+	PyVecObject *lo = PyObject_New(PyVecObject, &py_vec_type);
+	if (!lo)
+		return NULL;
+	PyVecObject *hi = PyObject_New(PyVecObject, &py_vec_type);
+	if (!hi) {
+		Py_DECREF(lo);
+		return NULL;
+	}
+	memcpy(&lo->vec, &mesh->bounds_min, sizeof(Vec));
+	memcpy(&hi->vec, &mesh->bounds_max, sizeof(Vec));
+	return Py_BuildValue("(NN)", lo, hi);
+}
+
 int
 register_mesh(PyObject *module)
 {
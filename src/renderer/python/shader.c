@@ -139,7 +139,10 @@ get_shader_param(PyObject *self, PyObject *key)
 static PyObject*
 py_shader_get_item(PyObject *self, PyObject *key)
 {
-	return (PyObject*)get_shader_param(self, key);
+	// the parameter is borrowed from the params dict
+	PyObject *sp = (PyObject*)get_shader_param(self, key);
+	Py_XINCREF(sp);
+	return sp;
 }
 
 static int
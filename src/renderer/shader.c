@@ -120,9 +120,16 @@ init_shader_params(struct Shader *s)
 	memset(s->params, 0, count * sizeof(struct ShaderParam));
 
 	// query information about each uniform
+	GLuint p = 0;
 	for (GLuint u = 0; u < count; u++) {
+		// skip members of uniform blocks, which are backed by buffers
+		GLint block = -1;
+		glGetActiveUniformsiv(s->prog, 1, &u, GL_UNIFORM_BLOCK_INDEX, &block);
+		if (block != -1)
+			continue;
+
 		GLsizei actual_len = 0;
-		struct ShaderParam *sp = s->params + u;
+		struct ShaderParam *sp = s->params + p;
 		glGetActiveUniform(
 			s->prog,
 			u,
@@ -144,7 +151,9 @@ init_shader_params(struct Shader *s)
 		name_copy[name_len]= 0;
 		strncpy(name_copy, name, name_len);
 		sp->name = name_copy;
+		p++;
 	}
+	s->param_count = p;
 
 	return 1;
 